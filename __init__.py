@@ -23,16 +23,38 @@ bl_info = {
 }
 
 import bpy
-from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty, FloatProperty
 from bpy.types import Operator, Panel, AddonPreferences
 import os
+import re
 import json
+import math
 import sys
+import shutil
+import functools
+import hashlib
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import check_renders
+from . import render_tiles
+from . import render_queue
 
 # Global variables to store user preferences
 output_folder_path = ""
 filename_pattern = "(FileName)_(Camera)_frame_(Frame)"
 
+# Scene custom property with the average seconds per render of the last batch
+AVERAGE_RENDER_SECONDS_PROPERTY = "frh_average_render_seconds"
+
+# Scene custom property with the average seconds per stepped simulation frame of the last batch
+SIMULATION_STEP_SECONDS_PROPERTY = "frh_simulation_step_seconds"
+
 
 def get_active_3d_view():
     """Get the currently active 3D viewport space"""
@@ -362,6 +384,55 @@ def on_file_load(dummy):
             pass
     else:  # USER_PREFS
         load_filename_pattern_from_user_prefs()
+    
+    # Rebuild the keyframe index for the new file, warm-starting from stored entries
+    invalidate_keyframe_index()
+    for scene in bpy.data.scenes:
+        load_keyframe_index_from_scene(scene)
+
+
+def parse_frame_entry(frame_str):
+    """Parse one frame list entry ("5" or "10-15") into a range of frames, raises ValueError"""
+    # Check if it's a range (contains hyphen)
+    if '-' in frame_str:
+        # Handle range like "1-5" or "10-20"
+        range_parts = frame_str.split('-')
+        if len(range_parts) != 2:
+            raise ValueError(f"Invalid range format: {frame_str}")
+        try:
+            start_frame = int(range_parts[0].strip())
+            end_frame = int(range_parts[1].strip())
+        except ValueError:
+            raise ValueError(f"Invalid frame number or range: {frame_str}")
+        if start_frame > end_frame:
+            raise ValueError(f"Invalid range: {frame_str} (start must be <= end)")
+        # All frames in range (inclusive)
+        return range(start_frame, end_frame + 1)
+
+    # Single frame number
+    try:
+        return range(int(frame_str), int(frame_str) + 1)
+    except ValueError:
+        raise ValueError(f"Invalid frame number or range: {frame_str}")
+
+
+def parse_frame_list(frame_string, strict=True):
+    """
+    Parse a frame list like "1,5,10-15,30" into a sorted list of unique frame numbers
+    With strict=True invalid entries raise ValueError, otherwise they are skipped
+    """
+    frame_numbers = []
+    for frame_str in frame_string.split(','):
+        frame_str = frame_str.strip()
+        if not frame_str:
+            continue
+        try:
+            frame_numbers.extend(parse_frame_entry(frame_str))
+        except ValueError:
+            if strict:
+                raise
+    # Remove duplicates and sort
+    return sorted(set(frame_numbers))
 
 
 def validate_channel_pattern(pattern, has_multiple_channels):
@@ -377,13 +448,12 @@ def validate_channel_pattern(pattern, has_multiple_channels):
     return True, ""
 
 
-def get_selected_channels(scene):
-    """Get list of enabled render channels/passes from Blender's view layer settings"""
+def get_selected_channels(scene, view_layer=None):
+    """Get list of enabled render channels/passes from Blender's view layer settings (first view layer by default)"""
     channels = []
     
     # Get the first view layer (most common case)
-    view_layer = None
-    if scene.view_layers:
+    if view_layer is None and scene.view_layers:
         view_layer = scene.view_layers[0]
     
     # If no view layer found, return Combined as fallback
@@ -437,6 +507,55 @@ def get_selected_channels(scene):
     return channels
 
 
+# Map channel names to Render Layers node socket names
+PASS_SOCKET_NAMES = {
+    'Depth': 'Depth', 'Mist': 'Mist', 'Normal': 'Normal',
+    'DiffuseDir': 'DiffDir', 'GlossyDir': 'GlossDir',
+    'Emit': 'Emit', 'DiffuseCol': 'DiffCol',
+    'GlossyCol': 'GlossCol', 'TransDir': 'TransDir',
+    'TransCol': 'TransCol', 'AO': 'AO',
+    'Shadow': 'Shadow', 'Environment': 'Env'
+}
+
+
+# Cameras and view layers of a batch
+CAMERA_MODES = [
+    ('SCENE', "Scene Camera", "Render through the scene camera (camera markers keep working)"),
+    ('SELECTED', "Selected Cameras", "Render every frame through each selected camera"),
+    ('ALL', "All Cameras", "Render every frame through each camera in the scene"),
+]
+
+VIEW_LAYER_MODES = [
+    ('FIRST', "First View Layer", "Render the first view layer and its passes"),
+    ('ENABLED', "Enabled View Layers", "Render each view layer enabled for rendering, with its own passes"),
+]
+
+
+def get_render_targets(scene, camera_mode='SCENE', view_layer_mode='FIRST', selected_objects=()):
+    """
+    (camera name, view layer name, channels) for every camera/view layer combination of a batch
+    A camera name of None means the scene camera of each frame
+    """
+    if camera_mode == 'SELECTED':
+        cameras = sorted(obj.name for obj in selected_objects if obj.type == 'CAMERA')
+    elif camera_mode == 'ALL':
+        cameras = sorted(obj.name for obj in scene.objects if obj.type == 'CAMERA')
+    else:
+        cameras = [None]
+
+    if view_layer_mode == 'ENABLED':
+        view_layers = [view_layer for view_layer in scene.view_layers if view_layer.use]
+    else:
+        view_layers = list(scene.view_layers[:1])
+
+    return [
+        (camera_name, view_layer.name, get_selected_channels(scene, view_layer))
+        for camera_name in cameras
+        for view_layer in view_layers
+    ]
+
+
+
 def save_render_pass(scene, channel_name, pass_name, filepath):
     """Save a specific render pass to file from the render result"""
     try:
@@ -472,17 +591,7 @@ def save_render_pass(scene, channel_name, pass_name, filepath):
             composite.name = '_FRH_TempComp'
             temp_nodes_created.append(composite)
             
-            # Map channel names to Blender socket names
-            socket_map = {
-                'Depth': 'Depth', 'Mist': 'Mist', 'Normal': 'Normal',
-                'DiffuseDir': 'DiffDir', 'GlossyDir': 'GlossDir',
-                'Emit': 'Emit', 'DiffuseCol': 'DiffCol',
-                'GlossyCol': 'GlossCol', 'TransDir': 'TransDir',
-                'TransCol': 'TransCol', 'AO': 'AO',
-                'Shadow': 'Shadow', 'Environment': 'Env'
-            }
-            
-            socket_name = socket_map.get(channel_name, channel_name)
+            socket_name = PASS_SOCKET_NAMES.get(channel_name, channel_name)
             
             # Connect the pass to composite
             if socket_name in render_layers.outputs:
@@ -529,8 +638,8 @@ def save_render_pass(scene, channel_name, pass_name, filepath):
         return False
 
 
-def setup_compositor_for_pass(scene, channel_name, pass_name):
-    """Set up compositor to output specific render pass"""
+def setup_compositor_for_pass(scene, channel_name, pass_name, view_layer_name=None):
+    """Set up compositor to output specific render pass (of a view layer, the first one by default)"""
     # Store original state
     original_state = {
         'use_nodes': scene.use_nodes,
@@ -550,6 +659,8 @@ def setup_compositor_for_pass(scene, channel_name, pass_name):
         render_layers_node.name = 'FRH_TempRenderLayers'
         render_layers_node.location = (-300, 0)
         original_state['created_nodes'].append(render_layers_node.name)
+        if view_layer_name:
+            render_layers_node.layer = view_layer_name
         
         # Create composite output node with unique name
         composite_node = scene.node_tree.nodes.new('CompositorNodeComposite')
@@ -558,23 +669,7 @@ def setup_compositor_for_pass(scene, channel_name, pass_name):
         original_state['created_nodes'].append(composite_node.name)
         
         # Map channel names to socket names in Blender's compositor
-        socket_mapping = {
-            'Depth': 'Depth',
-            'Mist': 'Mist',
-            'Normal': 'Normal',
-            'DiffuseDir': 'DiffDir',
-            'GlossyDir': 'GlossDir',
-            'Emit': 'Emit',
-            'DiffuseCol': 'DiffCol',
-            'GlossyCol': 'GlossCol',
-            'TransDir': 'TransDir',
-            'TransCol': 'TransCol',
-            'AO': 'AO',
-            'Shadow': 'Shadow',
-            'Environment': 'Env'
-        }
-        
-        socket_name = socket_mapping.get(channel_name, channel_name)
+        socket_name = PASS_SOCKET_NAMES.get(channel_name, channel_name)
         
         # Find and connect the appropriate output
         output_socket = None
@@ -639,7 +734,410 @@ def save_render_result(scene, filepath):
         return False
 
 
-def generate_filename_from_pattern(pattern, blend_name, camera_name, frame_num, start_time=None, end_time=None, channel_name=None, view_layer_name=None, batch_start_time=None, render_duration_seconds=None):
+# Renders are written under this prefix and renamed once the final filename is known
+STAGING_PREFIX = ".frh_partial_"
+
+# Job folders of tiled renders in the output folder
+TILE_JOB_PREFIX = ".frh_tiles_"
+
+
+def get_staging_path(output_folder, frame_num, channel_name, camera_name="", view_layer_name=""):
+    """
+    Temporary render path (without extension) in the output folder
+    Same folder means same volume, so the final rename is atomic
+    Camera and view layer keep the renders of several targets of one frame apart while they wait
+    for their transfer
+    """
+    target = f"{camera_name}_{view_layer_name}".translate(INVALID_FILENAME_CHARS)
+    return os.path.join(output_folder, f"{STAGING_PREFIX}{os.getpid()}_{frame_num:04d}_{target}_{channel_name}")
+
+
+def find_written_file(filepath_without_ext, extension, frame_num):
+    """Find the file Blender wrote for a render filepath (it may append the frame number)"""
+    possible_paths = [
+        filepath_without_ext + extension,  # Expected path
+        filepath_without_ext + f"_{frame_num:04d}{extension}",  # With frame number
+        filepath_without_ext + f"{frame_num:04d}{extension}",  # Frame without underscore
+    ]
+    
+    # Also check uppercase extension variants
+    if extension.upper() != extension:
+        possible_paths.extend([path[:-len(extension)] + extension.upper() for path in possible_paths])
+    
+    for check_path in possible_paths:
+        if os.path.exists(check_path):
+            return check_path
+    return None
+
+
+def commit_staged_file(staged_path, final_path):
+    """
+    Atomically move a finished render to its final name (replaces an existing file)
+    Returns True on success, the staged file is removed on failure
+    """
+    try:
+        os.replace(staged_path, final_path)
+        return True
+    except OSError as e:
+        print(f"❌ Could not rename {os.path.basename(staged_path)} to {os.path.basename(final_path)}: {e}")
+        try:
+            os.remove(staged_path)
+        except OSError:
+            pass
+        return False
+
+
+def remove_staged_files(output_folder, pid=None):
+    """Remove leftover temporary renders of this Blender process, or of the given one (cancelled or failed renders)"""
+    prefix = f"{STAGING_PREFIX}{os.getpid() if pid is None else pid}_"
+    removed = 0
+    try:
+        for entry in os.scandir(output_folder):
+            if entry.name.startswith(prefix) and entry.is_file():
+                os.remove(entry.path)
+                removed += 1
+    except OSError as e:
+        print(f"⚠️ Could not clean up temporary renders: {e}")
+    return removed
+
+
+# Local scratch folder used when "Render to Local Scratch" has no folder set
+DEFAULT_SCRATCH_FOLDER = os.path.join(tempfile.gettempdir(), "furion_render_scratch")
+
+
+def get_scratch_folder(scene):
+    """Resolve the local scratch folder for a scene and make sure it exists"""
+    scratch_folder = scene.frh_scratch_folder.strip()
+    scratch_folder = bpy.path.abspath(scratch_folder) if scratch_folder else DEFAULT_SCRATCH_FOLDER
+    os.makedirs(scratch_folder, exist_ok=True)
+    return scratch_folder
+
+
+def get_file_checksum(filepath, chunk_size=1024 * 1024):
+    """BLAKE2 checksum of a file, read in chunks"""
+    digest = hashlib.blake2b()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputTransferQueue:
+    """
+    Move finished renders from local scratch to the output folder in background threads
+    Each file is copied under a staging name, verified by checksum, then renamed into place
+    """
+
+    def __init__(self, max_workers=2, retries=3, retry_delay=2.0):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="frh_transfer")
+        self._lock = threading.Lock()
+        self._futures = []
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.transferred = []  # Final paths
+        self.failed = []  # (local path kept for recovery, final path, error)
+
+    def submit(self, local_path, final_path):
+        """Queue a local file to be moved to final_path"""
+        future = self._executor.submit(self._transfer, local_path, final_path)
+        with self._lock:
+            self._futures.append(future)
+
+    @property
+    def pending_count(self):
+        with self._lock:
+            self._futures = [future for future in self._futures if not future.done()]
+            return len(self._futures)
+
+    def drain(self):
+        """Block until every queued transfer has finished, then stop the worker threads"""
+        self._executor.shutdown(wait=True)
+
+    def _transfer(self, local_path, final_path):
+        staged_path = os.path.join(os.path.dirname(final_path), f"{STAGING_PREFIX}{os.getpid()}_{os.path.basename(final_path)}")
+        last_error = None
+        for attempt in range(1, self.retries + 1):
+            try:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                local_checksum = get_file_checksum(local_path)
+                shutil.copyfile(local_path, staged_path)
+                if get_file_checksum(staged_path) != local_checksum:
+                    raise OSError("checksum mismatch after copy")
+                os.replace(staged_path, final_path)
+                os.remove(local_path)
+                with self._lock:
+                    self.transferred.append(final_path)
+                print(f"✓ Transferred {os.path.basename(final_path)}")
+                return
+            except OSError as e:
+                last_error = e
+                print(f"⚠️ Transfer of {os.path.basename(final_path)} failed (attempt {attempt}/{self.retries}): {e}")
+                try:
+                    if os.path.exists(staged_path):
+                        os.remove(staged_path)
+                except OSError:
+                    pass
+                if attempt < self.retries:
+                    time.sleep(self.retry_delay * attempt)
+
+        # Keep the render in scratch under its final name so it isn't cleaned up with staging files
+        kept_path = os.path.join(os.path.dirname(local_path), os.path.basename(final_path))
+        try:
+            os.replace(local_path, kept_path)
+        except OSError:
+            kept_path = local_path
+        with self._lock:
+            self.failed.append((kept_path, final_path, str(last_error)))
+        print(f"❌ Could not transfer {os.path.basename(final_path)}, kept at: {kept_path}")
+
+
+# Characters not allowed in filenames, replaced with "_" in a single translate() pass
+INVALID_FILENAME_CHARS = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+# Simple tokens and their fallback values
+FILENAME_TOKENS = {
+    "FileName": "untitled",
+    "Camera": "NoCamera",
+    "ViewLayer": "ViewLayer",
+    "Frame": None,
+    "Channel": "Combined",
+    "RenderDurationSeconds": "0.00",
+}
+
+# Tokens only known once the render has finished
+POST_RENDER_TOKENS = {"RenderDurationSeconds", "End"}
+
+# Tokens that can differ between the renders of one batch (render start and post-render values)
+PER_RENDER_TOKENS = POST_RENDER_TOKENS | {"Start"}
+
+FILENAME_TOKEN_PATTERN = re.compile(
+    r'\((' + '|'.join(FILENAME_TOKENS) + r')\)'
+    r'|\((Start|End|BatchStart):([^)]+)\)'
+)
+
+# Regex per token for parsing filenames back (see FilenameTemplate.parse)
+FILENAME_TOKEN_REGEX = {
+    "Frame": r"-\d{3,}|\d{4,}",
+    "RenderDurationSeconds": r"\d+\.\d{2}",
+}
+
+# Regex per strftime field produced by convert_datetime_format
+DATETIME_FIELD_PATTERNS = {
+    "Y": r"\d{4}",
+    "m": r"\d{2}",
+    "d": r"\d{2}",
+    "H": r"\d{2}",
+    "M": r"\d{2}",
+    "S": r"\d{2}",
+}
+
+
+@functools.lru_cache(maxsize=64)
+def convert_datetime_format(datetime_format):
+    """Convert a custom date/time format (yyyyMMdd_HHmmss) to a Python strftime format"""
+    py_format = datetime_format
+    # Replace common patterns
+    py_format = py_format.replace("yyyy", "%Y")
+    py_format = py_format.replace("MM", "%m")
+    py_format = py_format.replace("dd", "%d")
+    py_format = py_format.replace("HH", "%H")
+    py_format = py_format.replace("mm", "%M")
+    py_format = py_format.replace("ss", "%S")
+    return py_format
+
+
+class FilenameTemplate:
+    """A filename pattern compiled once into literal text and token parts"""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        # List of ('TEXT', text), ('TOKEN', name) or ('DATETIME', (source, strftime format, original format))
+        self.parts = []
+        self.tokens = set()
+        self._regex = None  # Built on first parse()
+
+        position = 0
+        for match in FILENAME_TOKEN_PATTERN.finditer(pattern):
+            if match.start() > position:
+                self.parts.append(('TEXT', pattern[position:match.start()].translate(INVALID_FILENAME_CHARS)))
+            if match.group(1):
+                self.parts.append(('TOKEN', match.group(1)))
+                self.tokens.add(match.group(1))
+            else:
+                source, datetime_format = match.group(2), match.group(3)
+                self.parts.append(('DATETIME', (source, convert_datetime_format(datetime_format), datetime_format)))
+                self.tokens.add(source)
+            position = match.end()
+        if position < len(pattern):
+            self.parts.append(('TEXT', pattern[position:].translate(INVALID_FILENAME_CHARS)))
+
+    @property
+    def has_post_render_tokens(self):
+        """True if the filename depends on values only known after rendering"""
+        return bool(self.tokens & POST_RENDER_TOKENS)
+
+    @property
+    def has_per_render_tokens(self):
+        """True if renders of one batch can get different filenames without (Frame)/(Channel) tokens"""
+        return bool(self.tokens & PER_RENDER_TOKENS)
+
+    def validate(self):
+        """Check the pattern up front, returns a list of warning messages"""
+        warnings = []
+        if not self.pattern.strip():
+            warnings.append("Pattern is empty")
+        # Anything still looking like a token was not recognised
+        for part_type, value in self.parts:
+            if part_type == 'TEXT':
+                for unknown in re.findall(r'\(([A-Za-z]+(?::[^)]*)?)\)', value):
+                    warnings.append(f"Unknown token ({unknown}) will be kept as text")
+            elif part_type == 'DATETIME' and '%' not in value[1]:
+                warnings.append(f"Date/time format '{value[2]}' has no yyyy/MM/dd/HH/mm/ss fields")
+        return warnings
+
+    def format_datetime(self, dt, py_format, datetime_format):
+        try:
+            return dt.strftime(py_format)
+        except Exception as e:
+            print(f"Warning: Invalid datetime format '{datetime_format}': {e}")
+            return dt.strftime("%Y%m%d_%H%M%S")  # Fallback format
+
+    def resolve_values(self, blend_name=None, camera_name=None, view_layer_name=None, start_time=None, end_time=None, batch_start_time=None, render_duration_seconds=None):
+        """Resolve every token except (Frame) and (Channel) to its filename-safe text"""
+        from datetime import datetime
+
+        values = {
+            "FileName": blend_name or FILENAME_TOKENS["FileName"],
+            "Camera": camera_name or FILENAME_TOKENS["Camera"],
+            "ViewLayer": view_layer_name or FILENAME_TOKENS["ViewLayer"],
+            "RenderDurationSeconds": f"{render_duration_seconds:.2f}" if render_duration_seconds is not None else FILENAME_TOKENS["RenderDurationSeconds"],
+        }
+        # Use current time as fallback for missing times
+        now = None
+        times = {"Start": start_time, "End": end_time, "BatchStart": batch_start_time}
+        for part_type, value in self.parts:
+            if part_type == 'DATETIME':
+                source, py_format, datetime_format = value
+                dt = times[source]
+                if dt is None:
+                    now = now or datetime.now()
+                    dt = now
+                values[value] = self.format_datetime(dt, py_format, datetime_format)
+        return {key: text.translate(INVALID_FILENAME_CHARS) for key, text in values.items()}
+
+    def build_format(self, values):
+        """Build a str.format() string with {0} = frame and {1} = channel from resolved values"""
+        pieces = []
+        for part_type, value in self.parts:
+            if part_type == 'TEXT':
+                pieces.append(value.replace("{", "{{").replace("}", "}}"))
+            elif value == "Frame":
+                pieces.append("{0:04d}")
+            elif value == "Channel":
+                pieces.append("{1}")
+            else:
+                pieces.append(values[value].replace("{", "{{").replace("}", "}}"))
+        return "".join(pieces)
+
+    def render(self, frame_num, channel_name=None, **values):
+        """Generate one filename (without extension)"""
+        return self.build_format(self.resolve_values(**values)).format(
+            frame_num, (channel_name or FILENAME_TOKENS["Channel"]).translate(INVALID_FILENAME_CHARS))
+
+    def render_many(self, frame_numbers, channel_names=(None,), **values):
+        """
+        Generate filenames for every frame x channel combination in one call
+        Returns a list of (frame, channel, filename) tuples
+        """
+        filename_format = self.build_format(self.resolve_values(**values))
+        channels = [(channel, (channel or FILENAME_TOKENS["Channel"]).translate(INVALID_FILENAME_CHARS)) for channel in channel_names]
+        return [
+            (frame, channel, filename_format.format(frame, safe_channel))
+            for frame in frame_numbers
+            for channel, safe_channel in channels
+        ]
+
+    def compile_regex(self, known_values=None):
+        """
+        Compile the inverse of the pattern: a regex that pulls token values back out of a filename
+        Repeated tokens must repeat the same text, date/time fields match their digit count
+        known_values ({token: text or collection of texts}, e.g. the current blend name) are tried
+        first, which resolves names like "My_Project_Cam_0001" where free text tokens are split by
+        "_" themselves
+        """
+        if self._regex is not None and not known_values:
+            return self._regex
+        pieces = []
+        seen = set()
+        for index, (part_type, value) in enumerate(self.parts):
+            if part_type == 'TEXT':
+                pieces.append(re.escape(value))
+                continue
+            name = value if part_type == 'TOKEN' else f"{value[0]}_{index}"
+            if part_type == 'TOKEN' and name in seen:
+                pieces.append(f"(?P={name})")
+                continue
+            seen.add(name)
+            if part_type == 'DATETIME':
+                field_pattern = re.sub(
+                    r'%([YmdHMS])|([^%]+)',
+                    lambda m: DATETIME_FIELD_PATTERNS[m.group(1)] if m.group(1) else re.escape(m.group(2).translate(INVALID_FILENAME_CHARS)),
+                    value[1],
+                )
+                pieces.append(f"(?P<{name}>{field_pattern})")
+            elif known_values and known_values.get(name):
+                texts = known_values[name]
+                # Longest first, so "Cam_2" isn't read as "Cam" plus text
+                texts = [texts] if isinstance(texts, str) else sorted(texts, key=len, reverse=True)
+                known = "|".join(re.escape(text.translate(INVALID_FILENAME_CHARS)) for text in texts)
+                pieces.append(f"(?P<{name}>{known}|.+?)")
+            else:
+                pieces.append(f"(?P<{name}>{FILENAME_TOKEN_REGEX.get(name, '.+?')})")
+        regex = re.compile("^" + "".join(pieces) + "$")
+        if not known_values:
+            self._regex = regex
+        return regex
+
+    def parse(self, filename, regex=None):
+        """
+        Parse a filename (without extension) generated by this pattern
+        Returns a dict with frame, channel, camera, view_layer, blend, duration and
+        start/end/batch_start datetimes for the tokens present, or None if it doesn't match
+        regex can be a compile_regex(known_values) result
+        """
+        from datetime import datetime
+
+        match = (regex or self.compile_regex()).match(filename)
+        if not match:
+            return None
+        groups = match.groupdict()
+        result = {}
+        for token, key in (("FileName", "blend"), ("Camera", "camera"), ("ViewLayer", "view_layer"), ("Channel", "channel")):
+            if groups.get(token) is not None:
+                result[key] = groups[token]
+        if groups.get("Frame") is not None:
+            result["frame"] = int(groups["Frame"])
+        if groups.get("RenderDurationSeconds") is not None:
+            result["duration"] = float(groups["RenderDurationSeconds"])
+        for index, (part_type, value) in enumerate(self.parts):
+            if part_type == 'DATETIME':
+                source, py_format, _ = value
+                key = {"Start": "start", "End": "end", "BatchStart": "batch_start"}[source]
+                try:
+                    # Separators were made filename-safe when the name was generated
+                    result.setdefault(key, datetime.strptime(groups[f"{source}_{index}"], py_format.translate(INVALID_FILENAME_CHARS)))
+                except ValueError:
+                    pass
+        return result
+
+
+@functools.lru_cache(maxsize=32)
+def compile_filename_pattern(pattern):
+    """Compile a filename pattern into a FilenameTemplate (cached per pattern)"""
+    return FilenameTemplate(pattern)
+
+
+def generate_filename_from_pattern(pattern, blend_name, camera_name, frame_num, start_time=None, end_time=None, channel_name=None, view_layer_name=None, batch_start_time=None, render_duration_seconds=None, sharding=None):
     """
     Generate filename from pattern with token replacement
     
@@ -660,187 +1158,1702 @@ def generate_filename_from_pattern(pattern, blend_name, camera_name, frame_num,
     yyyyMMddHHmmss = 20251018172118
     yyyy-MM-dd = 2025-10-18
     yyyyMMdd_HH:mm:ss = 20251018_17:21:18
-    """
-    import re
-    from datetime import datetime
-    
-    result = pattern
-    
-    # Replace basic tokens
-    result = result.replace("(Camera)", camera_name or "NoCamera")
-    result = result.replace("(Frame)", f"{frame_num:04d}")
-    result = result.replace("(FileName)", blend_name or "untitled")
-    result = result.replace("(ViewLayer)", view_layer_name or "ViewLayer")
-    
-    # Only replace (Channel) token if it exists in the pattern
-    if "(Channel)" in result:
-        result = result.replace("(Channel)", channel_name or "Combined")
     
-    # Replace render duration token
-    if "(RenderDurationSeconds)" in result:
-        if render_duration_seconds is not None:
-            result = result.replace("(RenderDurationSeconds)", f"{render_duration_seconds:.2f}")
-        else:
-            result = result.replace("(RenderDurationSeconds)", "0.00")
-    
-    # Replace datetime tokens with regex to handle custom formats
-    def replace_datetime_token(match):
-        token_type = match.group(1)  # "Start", "End", or "BatchStart"
-        datetime_format = match.group(2)  # Custom format string
-        
-        # Select the appropriate datetime
-        if token_type == "Start" and start_time:
-            dt = start_time
-        elif token_type == "End" and end_time:
-            dt = end_time
-        elif token_type == "BatchStart" and batch_start_time:
-            dt = batch_start_time
-        else:
-            # Use current time as fallback
-            dt = datetime.now()
-        
-        # Convert custom format to Python strftime format
-        py_format = datetime_format
-        # Replace common patterns
-        py_format = py_format.replace("yyyy", "%Y")
-        py_format = py_format.replace("MM", "%m") 
-        py_format = py_format.replace("dd", "%d")
-        py_format = py_format.replace("HH", "%H")
-        py_format = py_format.replace("mm", "%M")
-        py_format = py_format.replace("ss", "%S")
-        
+    Patterns are compiled once (see compile_filename_pattern), this only fills in the values.
+    With sharding (OutputSharding) the result is prefixed with its relative shard subfolder.
+    """
+    filename = compile_filename_pattern(pattern).render(
+        frame_num,
+        channel_name,
+        blend_name=blend_name,
+        camera_name=camera_name,
+        view_layer_name=view_layer_name,
+        start_time=start_time,
+        end_time=end_time,
+        batch_start_time=batch_start_time,
+        render_duration_seconds=render_duration_seconds,
+    )
+    if sharding and sharding.enabled:
+        return os.path.join(sharding.get_subfolder(frame_num, channel_name, batch_start_time), filename)
+    return filename
+
+
+# Subfolder name prefix for per-batch shards (followed by the batch start time)
+BATCH_SHARD_PREFIX = "batch_"
+
+
+class OutputSharding:
+    """Subfolder layout that keeps output folder sizes bounded: batch / channel / frame block"""
+
+    __slots__ = ("by_batch", "by_channel", "frame_block")
+
+    def __init__(self, by_batch=False, by_channel=False, frame_block=0):
+        self.by_batch = by_batch
+        self.by_channel = by_channel
+        self.frame_block = frame_block  # Frames per subfolder, 0 = off
+
+    @classmethod
+    def from_scene(cls, scene):
+        return cls(scene.frh_shard_by_batch, scene.frh_shard_by_channel, scene.frh_shard_frame_block)
+
+    @property
+    def enabled(self):
+        return self.by_batch or self.by_channel or self.frame_block > 0
+
+    def get_subfolder(self, frame_num, channel_name=None, batch_start_time=None):
+        """Relative subfolder for one output ("" when sharding is off)"""
+        parts = []
+        if self.by_batch:
+            from datetime import datetime
+            batch_start_time = batch_start_time or datetime.now()
+            parts.append(f"{BATCH_SHARD_PREFIX}{batch_start_time:%Y%m%d_%H%M%S}")
+        if self.by_channel:
+            parts.append((channel_name or FILENAME_TOKENS["Channel"]).translate(INVALID_FILENAME_CHARS))
+        if self.frame_block > 0:
+            block_start = (frame_num // self.frame_block) * self.frame_block
+            parts.append(f"{block_start:04d}-{block_start + self.frame_block - 1:04d}")
+        return os.path.join(*parts) if parts else ""
+
+
+def resolve_output_path(output_folder, filename, extension, sharding=None, frame_num=0, channel_name=None, batch_start_time=None, create=False):
+    """Full output path for a generated filename, inside its shard subfolder"""
+    folder = output_folder
+    if sharding and sharding.enabled:
+        folder = os.path.join(output_folder, sharding.get_subfolder(frame_num, channel_name, batch_start_time))
+        if create:
+            os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, filename + extension)
+
+
+def find_output_file(output_folder, filename, extensions, sharding=None, frame_num=0, channel_name=None):
+    """
+    Find an existing output by filename, trying each extension
+    With per-batch shards the newest batch folder containing the file wins
+    """
+    folders = [output_folder]
+    if sharding and sharding.by_batch:
         try:
-            return dt.strftime(py_format)
-        except Exception as e:
-            print(f"Warning: Invalid datetime format '{datetime_format}': {e}")
-            return dt.strftime("%Y%m%d_%H%M%S")  # Fallback format
-    
-    # Replace Start, End, and BatchStart tokens with format
-    result = re.sub(r'\((Start|End|BatchStart):([^)]+)\)', replace_datetime_token, result)
-    
-    # Clean up any remaining tokens or invalid characters for filenames
-    # Remove invalid filename characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        result = result.replace(char, '_')
-    
-    return result
+            batch_folders = [entry.name for entry in os.scandir(output_folder) if entry.is_dir() and entry.name.startswith(BATCH_SHARD_PREFIX)]
+        except OSError:
+            batch_folders = []
+        # Batch folder names sort by start time
+        folders = [os.path.join(output_folder, name) for name in sorted(batch_folders, reverse=True)] + folders
+    if sharding and sharding.enabled:
+        inner = OutputSharding(False, sharding.by_channel, sharding.frame_block).get_subfolder(frame_num, channel_name)
+        folders = [os.path.join(folder, inner) if inner else folder for folder in folders]
+
+    for folder in folders:
+        for extension in extensions:
+            path = os.path.join(folder, filename + extension)
+            if os.path.exists(path):
+                return path
+    return None
 
 
-class RENDER_OT_set_output_folder(Operator):
-    """Set output folder for rendering specific frames"""
-    bl_idname = "render.set_output_folder"
-    bl_label = "Set Output Folder"
-    bl_description = "Choose the folder where rendered frames will be saved"
-    bl_options = {'REGISTER', 'UNDO'}
-    
-    # Property to store output folder path
-    folder_path: StringProperty(
-        name="Output Folder",
-        description="Choose the folder where rendered frames will be saved",
-        default="",
-        subtype='DIR_PATH'
-    )
-    
-    def execute(self, context):
-        global output_folder_path
-        if self.folder_path.strip():
-            output_folder_path = bpy.path.abspath(self.folder_path.strip())
+# Image file extensions recognised when scanning output folders
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.exr', '.bmp', '.tga', '.webp', '.jp2')
+
+
+class OutputFolderIndex:
+    """
+    In-memory index of the renders in an output folder, built from one directory walk
+    Filenames are parsed back with the filename pattern, so folders rendered by older
+    versions or other machines are indexed without knowing the exact names up front
+    """
+
+    def __init__(self, output_folder, pattern, sharding=None, known_values=None):
+        self.output_folder = output_folder
+        self.entries = []  # Parsed filename dicts plus path, size and mtime
+        self.unmatched = []  # Image files that don't match the pattern
+        self._by_frame_channel = {}
+
+        template = compile_filename_pattern(pattern)
+        regex = template.compile_regex(known_values)
+        channel_depth = 1 if sharding and sharding.by_batch else 0
+        for root, folders, files in os.walk(output_folder):
+            # Heatmap thumbnails and tile job folders are the add-on's own files, not renders
+            folders[:] = [folder for folder in folders if folder != CHANGE_REPORT_FOLDER and not folder.startswith(TILE_JOB_PREFIX)]
+            relative_parts = os.path.relpath(root, output_folder).split(os.sep)
+            for name in files:
+                base, extension = os.path.splitext(name)
+                if extension.lower() not in IMAGE_EXTENSIONS or name.startswith(STAGING_PREFIX):
+                    continue
+                path = os.path.join(root, name)
+                parsed = template.parse(base, regex)
+                if parsed is None:
+                    self.unmatched.append(path)
+                    continue
+                # Without a (Channel) token the channel comes from a per-channel shard folder
+                if "channel" not in parsed:
+                    if sharding and sharding.by_channel and len(relative_parts) > channel_depth and relative_parts[0] != ".":
+                        parsed["channel"] = relative_parts[channel_depth]
+                    else:
+                        parsed["channel"] = FILENAME_TOKENS["Channel"]
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                parsed.update(path=path, size=stat.st_size, mtime=stat.st_mtime)
+                self.entries.append(parsed)
+                if "frame" in parsed:
+                    self._by_frame_channel.setdefault((parsed["frame"], parsed["channel"]), []).append(parsed)
+
+        # Newest file first for each frame/channel
+        for entries in self._by_frame_channel.values():
+            entries.sort(key=lambda entry: entry["mtime"], reverse=True)
+
+    def find(self, frame, channel="Combined"):
+        """Path of the newest render of a frame/channel, or None"""
+        entries = self._by_frame_channel.get((frame, channel))
+        return entries[0]["path"] if entries else None
+
+    def get_entries(self, frame, channel="Combined"):
+        """All renders of a frame/channel, newest first"""
+        return self._by_frame_channel.get((frame, channel), [])
+
+    def frames(self, channel="Combined"):
+        """Set of frames with at least one render for the channel"""
+        return {frame for frame, entry_channel in self._by_frame_channel if entry_channel == channel}
+
+    def channels(self):
+        return sorted({channel for _, channel in self._by_frame_channel})
+
+    def missing_frames(self, frames, channel="Combined"):
+        """Frames from the list without a render for the channel"""
+        rendered = self.frames(channel)
+        return [frame for frame in frames if frame not in rendered]
+
+
+# Render output formats that can't hold still images (switched to PNG for batches)
+DISALLOWED_STILL_FORMATS = {"FFMPEG", "AVI_JPEG", "AVI_RAW", "FRAMESERVER"}
+
+# File extension per render file format
+FILE_FORMAT_EXTENSIONS = {
+    'png': '.png',
+    'jpeg': '.jpg',
+    'tiff': '.tif',
+    'exr': '.exr',
+}
+
+# Rough compressed size relative to raw pixel data, used for disk space estimates
+FORMAT_COMPRESSION_RATIOS = {
+    'PNG': 0.5,
+    'JPEG': 0.1,
+    'JPEG2000': 0.15,
+    'OPEN_EXR': 0.6,
+    'OPEN_EXR_MULTILAYER': 0.6,
+    'TIFF': 1.0,
+    'BMP': 1.0,
+    'TARGA': 0.8,
+    'TARGA_RAW': 1.0,
+    'WEBP': 0.1,
+}
+
+
+def get_file_extension(file_format):
+    """Get the output file extension for a render file format (defaults to .png)"""
+    return FILE_FORMAT_EXTENSIONS.get(file_format.lower(), '.png')
+
+
+def get_output_folder(create=False, folder=None):
+    """Resolve the output folder: given or configured folder, blend file directory, or current directory"""
+    global output_folder_path
+    blend_filepath = bpy.data.filepath
+    folder = output_folder_path if folder is None else folder
+    if folder.strip():
+        output_folder = bpy.path.abspath(folder.strip())
+        if create:
             # Ensure the folder exists
-            try:
-                os.makedirs(output_folder_path, exist_ok=True)
-                # Save as default preference
-                save_default_output_folder()
-                self.report({'INFO'}, f"Output folder set to: {output_folder_path}")
-            except Exception as e:
-                self.report({'ERROR'}, f"Failed to create/access folder: {str(e)}")
-                return {'CANCELLED'}
-        else:
-            # Clear the output folder (use default)
-            output_folder_path = ""
-            # Save empty preference
-            save_default_output_folder()
-            self.report({'INFO'}, "Output folder cleared (will use blend file directory)")
-        
-        return {'FINISHED'}
-    
-    def invoke(self, context, event):
-        global output_folder_path
-        self.folder_path = output_folder_path
-        return context.window_manager.invoke_props_dialog(self, width=400)
-    
-    def draw(self, context):
-        layout = self.layout
-        layout.prop(self, "folder_path")
-        layout.separator()
-        
-        # Show information about storage location
-        source = get_output_path_source()
-        info_box = layout.box()
-        if source == 'SCENE_PROPS':
-            info_box.label(text="Storage: Scene Properties (per-project)", icon='SCENE_DATA')
-            info_box.label(text="This folder will be saved in the blend file")
-        else:  # USER_PREFS
-            info_box.label(text="Storage: User Preferences (global)", icon='PREFERENCES')
-            info_box.label(text="This folder will be saved as your default")
-        
-        layout.separator()
-        layout.label(text="Leave empty to use blend file directory")
-        layout.label(text="Change storage location in Add-on Preferences", icon='INFO')
+            os.makedirs(output_folder, exist_ok=True)
+        return output_folder
+    # Use default blend file directory or current directory
+    if blend_filepath:
+        return os.path.dirname(bpy.path.abspath(blend_filepath))
+    return os.getcwd()
+
+
+def get_blend_name():
+    """Get the blend file name without extension ("untitled" for unsaved files)"""
+    if bpy.data.filepath:
+        return os.path.splitext(os.path.basename(bpy.data.filepath))[0]
+    return "untitled"
+
+
+def estimate_image_bytes(scene):
+    """Estimate the file size of one rendered image from resolution, format and bit depth"""
+    render = scene.render
+    image_settings = render.image_settings
+    width = render.resolution_x * render.resolution_percentage // 100
+    height = render.resolution_y * render.resolution_percentage // 100
+    channels = {'BW': 1, 'RGB': 3, 'RGBA': 4}.get(image_settings.color_mode, 4)
+    try:
+        bytes_per_channel = int(image_settings.color_depth) / 8
+    except (TypeError, ValueError):
+        bytes_per_channel = 1
+    file_format = image_settings.file_format
+    if file_format in DISALLOWED_STILL_FORMATS:
+        file_format = 'PNG'
+    ratio = FORMAT_COMPRESSION_RATIOS.get(file_format, 1.0)
+    return int(width * height * channels * bytes_per_channel * ratio)
+
+
+def format_bytes(size):
+    """Format a byte count for display (e.g. 1.5 GB)"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def format_duration(seconds):
+    """Format seconds for display (e.g. 1h 05m)"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {(seconds % 3600) // 60:02d}m"
+
+
+# SQLite catalog of saved renders, one per output folder
+CATALOG_FILENAME = ".frh_render_catalog.sqlite"
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS renders (
+    path TEXT PRIMARY KEY,
+    frame INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    camera TEXT,
+    view_layer TEXT,
+    blend TEXT,
+    size INTEGER,
+    duration REAL,
+    started TEXT,
+    finished TEXT,
+    batch_started TEXT,
+    fingerprint TEXT
+);
+CREATE INDEX IF NOT EXISTS renders_frame_channel ON renders (frame, channel, finished);
+CREATE INDEX IF NOT EXISTS renders_duration ON renders (duration);
+CREATE TABLE IF NOT EXISTS signatures (
+    frame INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    updated TEXT,
+    PRIMARY KEY (frame, channel)
+);
+CREATE TABLE IF NOT EXISTS probes (
+    frame INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    updated TEXT,
+    PRIMARY KEY (frame, fingerprint, mode)
+);
+CREATE TABLE IF NOT EXISTS object_states (
+    frame INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    states TEXT NOT NULL,
+    updated TEXT,
+    PRIMARY KEY (frame, fingerprint)
+);
+"""
 
 
-class RENDER_OT_set_filename_pattern(Operator):
-    """Set filename pattern for rendered frames"""
-    bl_idname = "render.set_filename_pattern"
-    bl_label = "Set Filename Pattern"
-    bl_description = "Customize the filename pattern for rendered frames using tokens"
-    bl_options = {'REGISTER', 'UNDO'}
-    
-    # Property to store filename pattern
-    pattern: StringProperty(
-        name="Filename Pattern",
-        description="Filename pattern using tokens like (FileName), (Camera), (ViewLayer), (Frame), (Channel), (Start:yyyyMMdd), (End:HHmmss)",
-        default="(FileName)_(Camera)_frame_(Frame)",
-        maxlen=200
-    )
-    
-    def execute(self, context):
-        global filename_pattern
-        if self.pattern.strip():
-            filename_pattern = self.pattern.strip()
-            # Save as default preference
-            save_user_preferences()
-            self.report({'INFO'}, f"Filename pattern set to: {filename_pattern}")
-        else:
-            # Reset to default
-            filename_pattern = "(FileName)_(Camera)_frame_(Frame)"
-            save_user_preferences()
-            self.report({'INFO'}, "Filename pattern reset to default")
-        
-        return {'FINISHED'}
-    
-    def invoke(self, context, event):
-        global filename_pattern
-        # Load current pattern from the correct source before displaying
-        source = get_output_path_source()
-        if source == 'SCENE_PROPS':
-            try:
-                load_filename_pattern_from_scene(context.scene)
-            except:
-                pass
-        else:
-            load_filename_pattern_from_user_prefs()
-        
-        self.pattern = filename_pattern
-        return context.window_manager.invoke_props_dialog(self, width=500)
-    
-    def draw(self, context):
-        layout = self.layout
-        layout.prop(self, "pattern")
-        layout.separator()
-        
-        # Show information about storage location
-        source = get_output_path_source()
+def get_settings_fingerprint(scene):
+    """Short hash of the render settings that change the image (to tell stale renders apart)"""
+    render = scene.render
+    settings = {
+        "engine": render.engine,
+        "resolution": [render.resolution_x, render.resolution_y, render.resolution_percentage],
+        "format": [render.image_settings.file_format, render.image_settings.color_mode, render.image_settings.color_depth],
+        "camera": scene.camera.name if scene.camera else None,
+        "samples": getattr(getattr(scene, "cycles", None), "samples", None),
+        "eevee_samples": getattr(getattr(scene, "eevee", None), "taa_render_samples", None),
+    }
+    return hashlib.blake2b(json.dumps(settings, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+
+class RenderCatalog:
+    """Indexed record of every render saved to an output folder"""
+
+    def __init__(self, output_folder):
+        self.output_folder = output_folder
+        self.path = os.path.join(output_folder, CATALOG_FILENAME)
+        self._connection = sqlite3.connect(self.path, timeout=10)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(CATALOG_SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, path, frame, channel, camera=None, view_layer=None, blend=None, size=None,
+               duration=None, started=None, finished=None, batch_started=None, fingerprint=None):
+        """Add or replace the record for an output path (paths are stored relative to the folder)"""
+        if size is None and os.path.exists(path):
+            size = os.path.getsize(path)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO renders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    os.path.relpath(path, self.output_folder), frame, channel, camera, view_layer, blend, size, duration,
+                    started.isoformat(timespec="seconds") if started else None,
+                    finished.isoformat(timespec="seconds") if finished else None,
+                    batch_started.isoformat(timespec="seconds") if batch_started else None,
+                    fingerprint,
+                ),
+            )
+
+    def _full_path(self, relative_path):
+        return os.path.join(self.output_folder, relative_path)
+
+    def latest(self, frame, channel="Combined", fingerprint=None, camera=None, view_layer=None):
+        """Path of the most recent render of a frame/channel that still exists (optionally same settings, camera or view layer only), or None"""
+        query = "SELECT path FROM renders WHERE frame = ? AND channel = ?"
+        parameters = [frame, channel]
+        for column, value in (("fingerprint", fingerprint), ("camera", camera), ("view_layer", view_layer)):
+            if value:
+                query += f" AND {column} = ?"
+                parameters.append(value)
+        rows = self._connection.execute(query + " ORDER BY finished DESC", parameters)
+        for row in rows:
+            path = self._full_path(row["path"])
+            if os.path.exists(path):
+                return path
+        return None
+
+    def latest_by_channel(self, frame):
+        """{channel: path} of the most recent render per channel for a frame"""
+        rows = self._connection.execute(
+            "SELECT channel, path, MAX(finished) FROM renders WHERE frame = ? GROUP BY channel ORDER BY channel",
+            (frame,),
+        )
+        return {row["channel"]: self._full_path(row["path"]) for row in rows}
+
+    def rendered_frames(self, channel="Combined", fingerprint=None):
+        """Set of frames with at least one recorded render for a channel (optionally same settings only)"""
+        query = "SELECT DISTINCT frame FROM renders WHERE channel = ?"
+        parameters = [channel]
+        if fingerprint:
+            query += " AND fingerprint = ?"
+            parameters.append(fingerprint)
+        return {row["frame"] for row in self._connection.execute(query, parameters)}
+
+    def missing_frames(self, frames, channel="Combined", fingerprint=None):
+        """Frames from the list without a recorded render for the channel"""
+        rendered = self.rendered_frames(channel, fingerprint)
+        return [frame for frame in frames if frame not in rendered]
+
+    def slowest(self, limit=5):
+        """(frame, channel, duration) of the slowest recorded renders"""
+        rows = self._connection.execute(
+            "SELECT frame, channel, duration FROM renders WHERE duration IS NOT NULL ORDER BY duration DESC LIMIT ?",
+            (limit,),
+        )
+        return [(row["frame"], row["channel"], row["duration"]) for row in rows]
+
+    def count(self):
+        return self._connection.execute("SELECT COUNT(*) FROM renders").fetchone()[0]
+
+    @staticmethod
+    def _decode_signature(row):
+        if not row:
+            return None
+        return np.frombuffer(row["signature"], dtype=np.float16).reshape(row["height"], row["width"], 3)
+
+    def get_signature(self, frame, channel):
+        """Downsampled image signature of the last render of a frame/channel (see compute_image_signature)"""
+        return self._decode_signature(self._connection.execute(
+            "SELECT height, width, signature FROM signatures WHERE frame = ? AND channel = ?",
+            (frame, channel),
+        ).fetchone())
+
+    def store_signature(self, frame, channel, signature):
+        from datetime import datetime
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO signatures VALUES (?, ?, ?, ?, ?, ?)",
+                (frame, channel, signature.shape[0], signature.shape[1], signature.tobytes(), datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def get_probe_signature(self, frame, fingerprint, mode):
+        """Signature of the low-res probe stored after the last full render with these settings"""
+        return self._decode_signature(self._connection.execute(
+            "SELECT height, width, signature FROM probes WHERE frame = ? AND fingerprint = ? AND mode = ?",
+            (frame, fingerprint, mode),
+        ).fetchone())
+
+    def store_probe_signature(self, frame, fingerprint, mode, signature):
+        from datetime import datetime
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (frame, fingerprint, mode, signature.shape[0], signature.shape[1], signature.tobytes(), datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def get_object_states(self, frame, fingerprint):
+        """Object states (see get_object_states()) stored after the last render of a frame with these settings"""
+        row = self._connection.execute(
+            "SELECT states FROM object_states WHERE frame = ? AND fingerprint = ?", (frame, fingerprint)
+        ).fetchone()
+        return json.loads(row["states"]) if row else None
+
+    def store_object_states(self, frame, fingerprint, states):
+        from datetime import datetime
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO object_states VALUES (?, ?, ?, ?)",
+                (frame, fingerprint, json.dumps(states), datetime.now().isoformat(timespec="seconds")),
+            )
+
+
+def open_render_catalog(output_folder, create=True):
+    """Open the catalog of an output folder, None if it doesn't exist (create=False) or can't be opened"""
+    if not create and not os.path.exists(os.path.join(output_folder, CATALOG_FILENAME)):
+        return None
+    try:
+        return RenderCatalog(output_folder)
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️ Could not open render catalog in {output_folder}: {e}")
+        return None
+
+
+# Long side of the downsampled image used for change detection signatures and heatmaps
+CHANGE_SIGNATURE_SIZE = 128
+
+# Subfolder of the output folder for change reports and heatmap thumbnails
+CHANGE_REPORT_FOLDER = "frh_changes"
+
+
+def load_image_array(filepath):
+    """Load an image file into a (height, width, channels) float32 array, rows from the bottom"""
+    image = bpy.data.images.load(filepath, check_existing=False)
+    try:
+        width, height = image.size
+        channels = image.channels
+        pixels = np.empty(width * height * channels, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return pixels.reshape(height, width, channels)
+
+
+def load_image_pixels(filepath):
+    """Load an image file into a (height, width, 3) float32 array"""
+    pixels = load_image_array(filepath)
+    channels = pixels.shape[2]
+    if channels == 1:
+        return np.repeat(pixels, 3, axis=2)
+    return pixels[:, :, :3]
+
+
+def images_identical(path, other_path):
+    """Exact check: same size and the same pixels at full resolution (file bytes differ by metadata)"""
+    pixels, other_pixels = load_image_array(path), load_image_array(other_path)
+    return pixels.shape == other_pixels.shape and np.array_equal(pixels, other_pixels)
+
+
+def compute_image_signature(pixels):
+    """Downsample pixels by block averaging so the long side is at most CHANGE_SIGNATURE_SIZE"""
+    height, width = pixels.shape[:2]
+    factor = max(1, math.ceil(max(height, width) / CHANGE_SIGNATURE_SIZE))
+    height, width = height // factor * factor, width // factor * factor
+    blocks = pixels[:height, :width].reshape(height // factor, factor, width // factor, factor, 3)
+    # Clip so HDR highlights don't dominate the difference
+    return np.clip(blocks.mean(axis=(1, 3)), 0.0, 1.0).astype(np.float16)
+
+
+def compare_signatures(signature, previous_signature):
+    """
+    Per-cell difference of two signatures
+    Returns (max cell difference, mean difference, (h, w) difference map), or None if the sizes differ
+    """
+    if previous_signature is None or signature.shape != previous_signature.shape:
+        return None
+    difference_map = np.abs(signature.astype(np.float32) - previous_signature.astype(np.float32)).mean(axis=2)
+    return float(difference_map.max()), float(difference_map.mean()), difference_map
+
+
+def save_heatmap(difference_map, filepath, scale=0.1):
+    """Save a difference map as a black-to-red PNG thumbnail (scale = difference shown as full red)"""
+    height, width = difference_map.shape
+    intensity = np.clip(difference_map / scale, 0.0, 1.0)
+    pixels = np.zeros((height, width, 4), dtype=np.float32)
+    pixels[:, :, 0] = intensity
+    pixels[:, :, 1] = intensity * intensity * 0.5
+    pixels[:, :, 3] = 1.0
+
+    image = bpy.data.images.new("frh_heatmap", width, height, alpha=True)
+    try:
+        image.pixels.foreach_set(pixels.ravel())
+        image.filepath_raw = filepath
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+
+
+# Low-res probe renders: width in pixels and samples
+PROBE_WIDTH = 160
+PROBE_SAMPLES = 8
+
+PROBE_MODES = [
+    ('OFF', "Off", "Always render every frame in full"),
+    ('LOW_RES', "Low Resolution", "Probe with the scene render engine at a tiny resolution and a few samples"),
+    ('WORKBENCH', "Workbench", "Probe with Workbench (solid shading) at a tiny resolution"),
+]
+
+
+def setup_probe_render(scene, mode):
+    """Switch the render settings to a cheap probe render, returns the original state for restore_probe_render()"""
+    render = scene.render
+    original_state = {
+        "resolution_percentage": render.resolution_percentage,
+        "engine": render.engine,
+    }
+    render.resolution_percentage = max(1, min(100, round(100 * PROBE_WIDTH / max(1, render.resolution_x))))
+    if mode == 'WORKBENCH':
+        render.engine = 'BLENDER_WORKBENCH'
+    elif render.engine == 'CYCLES' and hasattr(scene, "cycles"):
+        original_state["cycles_samples"] = scene.cycles.samples
+        scene.cycles.samples = min(scene.cycles.samples, PROBE_SAMPLES)
+    elif hasattr(scene, "eevee"):
+        original_state["eevee_samples"] = scene.eevee.taa_render_samples
+        scene.eevee.taa_render_samples = min(scene.eevee.taa_render_samples, PROBE_SAMPLES)
+    return original_state
+
+
+def restore_probe_render(scene, original_state):
+    """Restore the render settings changed by setup_probe_render()"""
+    render = scene.render
+    render.engine = original_state["engine"]
+    render.resolution_percentage = original_state["resolution_percentage"]
+    if "cycles_samples" in original_state:
+        scene.cycles.samples = original_state["cycles_samples"]
+    if "eevee_samples" in original_state:
+        scene.eevee.taa_render_samples = original_state["eevee_samples"]
+
+
+# Region re-render: object types watched for changes, and the largest region worth re-rendering
+ROI_OBJECT_TYPES = {'MESH', 'CURVE', 'CURVES', 'SURFACE', 'META', 'FONT', 'POINTCLOUD', 'VOLUME', 'GPENCIL', 'GREASEPENCIL', 'LIGHT', 'EMPTY'}
+ROI_MAX_AREA = 0.5
+
+# State kinds whose change can affect the whole frame (lighting, shading, projection)
+ROI_FULL_FRAME_KINDS = {'CAMERA', 'LIGHT', 'EMPTY', 'SHADING'}
+
+# Edits of these ID types show up in the object states (transforms, geometry, hashed node
+# trees and settings). An edit of any other ID type (images, textures, collections, light
+# probes, ...) can change a frame in ways the states don't see: the next batch renders in full
+ROI_COVERED_ID_TYPES = {
+    'OBJECT', 'SCENE', 'ACTION', 'MATERIAL', 'WORLD', 'NODETREE', 'LIGHT', 'CAMERA', 'KEY', 'PARTICLE',
+    'MESH', 'CURVE', 'CURVES', 'FONT', 'META', 'LATTICE', 'ARMATURE', 'POINTCLOUD', 'VOLUME',
+    'GREASEPENCIL', 'GREASEPENCIL_V3', 'SPEAKER', 'TEXT', 'BRUSH', 'PALETTE', 'PAINTCURVE',
+    'WINDOWMANAGER', 'WORKSPACE', 'SCREEN',
+}
+
+# Node and datablock properties that only change the editor, not the render
+ROI_IGNORED_PROPERTIES = {
+    'rna_type', 'name', 'name_full', 'label', 'location', 'width', 'height', 'dimensions', 'select',
+    'hide', 'show_options', 'show_preview', 'show_texture', 'color', 'use_custom_color', 'parent',
+    'width_hidden', 'use_fake_user', 'tag', 'is_runtime_data', 'is_evaluated', 'original',
+    'session_uid', 'users', 'preview', 'id_data', 'internal_links', 'inputs', 'outputs',
+}
+
+
+def hash_values(*values):
+    """Short hash of numbers, strings and NumPy arrays"""
+    digest = hashlib.blake2b(digest_size=8)
+    for value in values:
+        digest.update(value.tobytes() if hasattr(value, "tobytes") else repr(value).encode())
+    return digest.hexdigest()
+
+
+def get_rna_values(struct):
+    """(name, value) of the editable plain properties of an RNA struct, datablocks by name"""
+    values = []
+    for prop in struct.bl_rna.properties:
+        if prop.identifier in ROI_IGNORED_PROPERTIES:
+            continue
+        try:
+            value = getattr(struct, prop.identifier)
+        except AttributeError:
+            continue
+        if prop.type == 'POINTER':
+            if isinstance(value, bpy.types.ID):
+                values.append((prop.identifier, value.name_full))
+        elif prop.type in ('BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM') and not prop.is_readonly:
+            if prop.type == 'ENUM' and prop.is_enum_flag:
+                value = tuple(sorted(value))
+            elif prop.type != 'STRING' and getattr(prop, "array_length", 0):
+                value = tuple(tuple(item) if hasattr(item, "__len__") else item for item in value)
+            values.append((prop.identifier, value))
+    return values
+
+
+def get_socket_value(socket):
+    value = getattr(socket, "default_value", None)
+    if isinstance(value, bpy.types.ID):
+        return value.name_full
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return tuple(value)
+    return value
+
+
+def get_node_tree_hash(node_tree, cache):
+    """Hash of the settings, socket values and links of a node tree and its node groups"""
+    if node_tree is None:
+        return ""
+    key = node_tree.name_full
+    if key not in cache:
+        cache[key] = ""  # Guards against recursive groups
+        values = []
+        for node in node_tree.nodes:
+            values.append((node.bl_idname, node.name, node.mute, get_rna_values(node)))
+            values.extend((socket.identifier, get_socket_value(socket)) for socket in node.inputs)
+            if getattr(node, "node_tree", None):
+                values.append(get_node_tree_hash(node.node_tree, cache))
+        values.extend(
+            (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier, link.is_muted)
+            for link in node_tree.links
+        )
+        cache[key] = hash_values(values)
+    return cache[key]
+
+
+def get_id_hash(id_block, cache):
+    """Hash of a material, world or light: its settings plus its node tree"""
+    if id_block is None:
+        return ""
+    key = ("ID", id_block.name_full, type(id_block).__name__)
+    if key not in cache:
+        node_tree = id_block.node_tree if getattr(id_block, "use_nodes", False) else None
+        cache[key] = hash_values(get_rna_values(id_block), get_node_tree_hash(node_tree, cache))
+    return cache[key]
+
+
+class SceneEditTracker:
+    """
+    Edits made in this session, recorded from depsgraph updates in generations (one per batch)
+    Object states store the session and generation of their batch: objects without a geometry
+    edit since then reuse the stored geometry hash instead of evaluating their mesh again, and
+    any edit of an ID type the states don't cover means the frame has to be rendered in full.
+    Updates are not recorded while a batch runs (the batch changes scene settings itself).
+    """
+
+    def __init__(self):
+        import uuid
+        self.session = uuid.uuid4().hex
+        self.generation = 0
+        self.geometry_edits = {}  # Object name -> generation of its last geometry edit
+        self.uncovered_edit = -1  # Generation of the last edit the object states can't see
+        self.paused = False
+
+    def record(self, depsgraph):
+        if self.paused:
+            return
+        for update in depsgraph.updates:
+            id_block = update.id.original
+            id_type = getattr(id_block, "id_type", None)
+            if isinstance(id_block, bpy.types.Object):
+                if update.is_updated_geometry:
+                    self.geometry_edits[id_block.name] = self.generation
+            elif id_type not in ROI_COVERED_ID_TYPES:
+                self.uncovered_edit = self.generation
+
+    def start_batch(self):
+        """New generation for a batch, returns its (session, generation) stored with the states"""
+        self.generation += 1
+        self.paused = True
+        return [self.session, self.generation]
+
+    def end_batch(self):
+        self.paused = False
+
+    def get_edit_history(self, previous_states):
+        """
+        (full render needed, set of objects with a geometry edit) since the batch of the previous states
+        The history is unknown for states of another session (or stored before it was tracked)
+        """
+        stored = (previous_states or {}).get("__edits__")
+        if not stored or stored[0] != self.session:
+            return True, None
+        generation = stored[1]
+        if self.uncovered_edit >= generation:
+            return True, None
+        return False, {name for name, edit in self.geometry_edits.items() if edit >= generation}
+
+
+_scene_edits = SceneEditTracker()
+
+
+def get_object_screen_rect(scene, camera, obj):
+    """Bounding box of an evaluated object projected through the camera as (x0, y0, x1, y1) in 0-1, None when off-screen"""
+    from bpy_extras.object_utils import world_to_camera_view
+    from mathutils import Vector
+
+    points = [world_to_camera_view(scene, camera, obj.matrix_world @ Vector(corner)) for corner in obj.bound_box]
+    if any(point.z <= 0 for point in points):
+        # Partly behind the camera: the projection isn't bounded
+        return [0.0, 0.0, 1.0, 1.0]
+    x0, x1 = max(0.0, min(point.x for point in points)), min(1.0, max(point.x for point in points))
+    y0, y1 = max(0.0, min(point.y for point in points)), min(1.0, max(point.y for point in points))
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return [x0, y0, x1, y1]
+
+
+def get_mesh_hash(obj_eval):
+    """Hash of the evaluated geometry (deformation, modifiers, geometry nodes) of an object"""
+    coordinates = np.array(obj_eval.bound_box, dtype=np.float32)
+    if obj_eval.type != 'VOLUME' and obj_eval.type != 'EMPTY':
+        try:
+            mesh = obj_eval.to_mesh()
+        except RuntimeError:
+            mesh = None
+        if mesh is not None:
+            coordinates = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", coordinates)
+            obj_eval.to_mesh_clear()
+    return hash_values(coordinates)
+
+
+def get_instance_hashes(depsgraph):
+    """{instancer name: hash of its instances (object, transform)} from one pass over the depsgraph"""
+    instances = {}
+    for instance in depsgraph.object_instances:
+        if instance.is_instance and instance.parent:
+            instances.setdefault(instance.parent.original.name, []).append(
+                (instance.object.original.name, np.array(instance.matrix_world, dtype=np.float32).tobytes())
+            )
+    return {name: hash_values(sorted(entries)) for name, entries in instances.items()}
+
+
+def get_object_states(scene, depsgraph, reusable_geometry=None):
+    """
+    {name: [signature, kind, screen rect, geometry hash]} of the camera, world/compositor and every object that renders
+    The signature hashes the transform, the evaluated geometry, the materials (settings and node
+    trees), light settings and the instances of each object at the current frame. Geometry is
+    only evaluated for objects not in reusable_geometry ({name: hash} known to be unchanged).
+    """
+    states = {}
+    camera = scene.camera
+    if not camera:
+        return states
+    reusable_geometry = reusable_geometry or {}
+    cache = {}
+    camera_eval = camera.evaluated_get(depsgraph)
+    lens = camera_eval.data
+    states["__camera__"] = [
+        hash_values(np.array(camera_eval.matrix_world, dtype=np.float32), lens.type, lens.lens, lens.ortho_scale, lens.shift_x, lens.shift_y, lens.sensor_width),
+        'CAMERA', None, "",
+    ]
+    # World and compositor change the whole frame
+    compositor = scene.node_tree if scene.use_nodes else None
+    states["__shading__"] = [hash_values(get_id_hash(scene.world, cache), get_node_tree_hash(compositor, cache)), 'SHADING', None, ""]
+
+    instance_hashes = get_instance_hashes(depsgraph)
+    for obj in scene.objects:
+        if obj.hide_render or obj.type not in ROI_OBJECT_TYPES:
+            continue
+        obj_eval = obj.evaluated_get(depsgraph)
+        matrix = np.array(obj_eval.matrix_world, dtype=np.float32)
+        instances = instance_hashes.get(obj.name, "")
+        geometry = ""
+        if obj.type == 'LIGHT':
+            kind, rect = 'LIGHT', None
+            signature = hash_values(matrix, get_id_hash(obj_eval.data, cache))
+        elif obj.type == 'EMPTY':
+            # Empties drive modifiers, constraints and texture coordinates: any change renders in full
+            kind, rect = 'EMPTY', None
+            signature = hash_values(matrix, obj.empty_display_size, instances)
+        else:
+            kind = obj.type
+            geometry = reusable_geometry.get(obj.name) or get_mesh_hash(obj_eval)
+            materials = [get_id_hash(slot.material, cache) for slot in obj_eval.material_slots]
+            signature = hash_values(matrix, geometry, materials, instances)
+            rect = get_object_screen_rect(scene, camera_eval, obj_eval)
+            if instances:
+                # Instances can be anywhere in the frame
+                rect = [0.0, 0.0, 1.0, 1.0]
+        states[obj.name] = [signature, kind, rect, geometry]
+    return states
+
+
+def plan_render_region(previous_states, states, width, height, margin=0):
+    """
+    Pixel region (x0, y0, x1, y1) covering every changed object before and after the change
+    Returns () when nothing changed and None when the whole frame has to be rendered
+    (camera, lights, empties, world or compositor changed, or the region is too large to be worth it)
+    """
+    changed = [
+        name for name in set(previous_states) | set(states)
+        if name != "__edits__"
+        and (previous_states.get(name) or [None])[0] != (states.get(name) or [None])[0]
+    ]
+    if not changed:
+        return ()
+    rects = []
+    for name in changed:
+        for state in (previous_states.get(name), states.get(name)):
+            if not state:
+                continue
+            if state[1] in ROI_FULL_FRAME_KINDS:
+                return None
+            if state[2]:
+                rects.append(state[2])
+    if not rects:
+        # Only objects outside the frame changed
+        return ()
+    x0 = max(0, math.floor(min(rect[0] for rect in rects) * width) - margin)
+    y0 = max(0, math.floor(min(rect[1] for rect in rects) * height) - margin)
+    x1 = min(width, math.ceil(max(rect[2] for rect in rects) * width) + margin)
+    y1 = min(height, math.ceil(max(rect[3] for rect in rects) * height) + margin)
+    if (x1 - x0) * (y1 - y0) > ROI_MAX_AREA * width * height:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def setup_region_render(scene, region):
+    """Crop the render to a pixel region, returns the original border for restore_region_render()"""
+    render = scene.render
+    original_state = (render.use_border, render.use_crop_to_border, render.border_min_x, render.border_max_x, render.border_min_y, render.border_max_y)
+    width = render.resolution_x * render.resolution_percentage // 100
+    height = render.resolution_y * render.resolution_percentage // 100
+    x0, y0, x1, y1 = region
+    render.use_border = True
+    render.use_crop_to_border = True
+    # A quarter pixel inside the region: Blender rounds or truncates the border to whole pixels
+    render.border_min_x, render.border_max_x = (x0 + 0.25) / width, (x1 + 0.25) / width
+    render.border_min_y, render.border_max_y = (y0 + 0.25) / height, (y1 + 0.25) / height
+    return original_state
+
+
+def restore_region_render(scene, original_state):
+    render = scene.render
+    render.use_border, render.use_crop_to_border, render.border_min_x, render.border_max_x, render.border_min_y, render.border_max_y = original_state
+
+
+def composite_region(base_path, region_path, region, output_path):
+    """Paste a cropped region render over a previous output, saved in the previous file's format"""
+    region_pixels = load_image_array(region_path)
+    base = bpy.data.images.load(base_path, check_existing=False)
+    try:
+        width, height = base.size
+        channels = base.channels
+        pixels = np.empty(width * height * channels, dtype=np.float32)
+        base.pixels.foreach_get(pixels)
+        pixels = pixels.reshape(height, width, channels)
+        x0, y0 = region[0], region[1]
+        region_height, region_width = min(region_pixels.shape[0], height - y0), min(region_pixels.shape[1], width - x0)
+        shared_channels = min(channels, region_pixels.shape[2])
+        pixels[y0:y0 + region_height, x0:x0 + region_width, :shared_channels] = region_pixels[:region_height, :region_width, :shared_channels]
+        base.pixels.foreach_set(pixels.ravel())
+        base.filepath_raw = output_path
+        base.save()
+    finally:
+        bpy.data.images.remove(base)
+
+
+# Seconds of simulation stepping per timer tick, so the batch stays cancellable
+SIMULATION_STEP_SECONDS = 0.5
+
+
+def has_simulation_zone(node_tree, visited=None):
+    """True when a geometry node tree (or a node group inside it) has a simulation zone"""
+    visited = set() if visited is None else visited
+    if node_tree is None or node_tree.name in visited:
+        return False
+    visited.add(node_tree.name)
+    for node in node_tree.nodes:
+        if node.bl_idname == 'GeometryNodeSimulationOutput':
+            return True
+        if node.type == 'GROUP' and has_simulation_zone(node.node_tree, visited):
+            return True
+    return False
+
+
+def is_fluid_domain_baked(domain_settings):
+    """True when a fluid domain reads baked data (Replay caches are filled while playing, never baked)"""
+    if domain_settings.cache_type == 'REPLAY':
+        return False
+    return bool(getattr(domain_settings, "has_cache_baking_any", False) or getattr(domain_settings, "has_cache_baking_data", False))
+
+
+def is_simulation_zone_baked(modifier):
+    """
+    True when every simulation zone bake of a Geometry Nodes modifier has baked frames on disk
+    Bakes packed into the .blend file can't be seen from Python and count as not baked
+    """
+    bakes = [bake for bake in getattr(modifier, "bakes", ()) if getattr(bake.node, "bl_idname", "") == 'GeometryNodeSimulationOutput']
+    if not bakes:
+        return False
+    for bake in bakes:
+        target = getattr(bake, "bake_target", 'INHERIT')
+        if target == 'INHERIT':
+            target = getattr(modifier, "bake_target", 'DISK')
+        if target == 'PACKED':
+            return False
+        # Default location: <modifier bake directory>/<bake id>/meta/<frame>.json
+        directory = bake.directory if bake.use_custom_path else os.path.join(modifier.bake_directory, str(bake.bake_id))
+        meta_folder = os.path.join(bpy.path.abspath(directory), "meta")
+        try:
+            if not any(name.endswith(".json") for name in os.listdir(meta_folder)):
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def find_simulations(scene):
+    """
+    (name, start frame) of every simulation in the scene that isn't baked
+    These depend on the previous frame, so jumping to a frame re-simulates or reads a stale cache
+    Point caches and fluid domains report their bake state. Simulation zones count as baked when
+    their bakes are on disk; packed bakes can't be detected and are stepped like unbaked ones.
+    """
+    simulations = []
+
+    def add_point_cache(name, point_cache):
+        if point_cache and not point_cache.is_baked:
+            simulations.append((name, point_cache.frame_start))
+
+    if scene.rigidbody_world and scene.rigidbody_world.enabled:
+        add_point_cache("Rigid Body World", scene.rigidbody_world.point_cache)
+
+    for obj in scene.objects:
+        for modifier in obj.modifiers:
+            name = f"{obj.name} / {modifier.name}"
+            if modifier.type in ('CLOTH', 'SOFT_BODY'):
+                add_point_cache(name, modifier.point_cache)
+            elif modifier.type == 'DYNAMIC_PAINT' and modifier.ui_type == 'CANVAS' and modifier.canvas_settings:
+                for surface in modifier.canvas_settings.canvas_surfaces:
+                    add_point_cache(f"{name} / {surface.name}", surface.point_cache)
+            elif modifier.type == 'FLUID' and modifier.fluid_type == 'DOMAIN':
+                if not is_fluid_domain_baked(modifier.domain_settings):
+                    simulations.append((name, modifier.domain_settings.cache_frame_start))
+            elif modifier.type == 'NODES' and has_simulation_zone(modifier.node_group) and not is_simulation_zone_baked(modifier):
+                simulations.append((name, scene.frame_start))
+        for particle_system in obj.particle_systems:
+            settings = particle_system.settings
+            if settings.type == 'EMITTER' or particle_system.use_hair_dynamics:
+                add_point_cache(f"{obj.name} / {particle_system.name}", particle_system.point_cache)
+    return simulations
+
+
+def get_simulation_frames(simulations, frame_numbers):
+    """Frames to step through before a batch, empty when the batch itself plays the frames in order"""
+    if not simulations or not frame_numbers:
+        return []
+    start_frame = min(start for _, start in simulations)
+    first_frame, last_frame = frame_numbers[0], frame_numbers[-1]
+    # Consecutive frames from the start of the simulations: rendering them is the stepping
+    if first_frame <= start_frame and last_frame - first_frame + 1 == len(frame_numbers):
+        return []
+    return list(range(min(start_frame, first_frame), last_frame + 1))
+
+
+# Render backends of the batch operator
+RENDER_BACKENDS = [
+    ('RENDER', "Render Engine", "Full render with the scene render engine"),
+    ('EEVEE', "EEVEE", "Full render with EEVEE swapped in for the batch"),
+    ('WORKBENCH', "Workbench", "Full render with Workbench swapped in for the batch"),
+    ('VIEWPORT', "Viewport", "Viewport (OpenGL) render through the scene camera, Combined only"),
+]
+
+
+def get_average_seconds_property(backend):
+    """Scene custom property with the average render time of the last batch for a backend"""
+    return AVERAGE_RENDER_SECONDS_PROPERTY if backend == 'RENDER' else f"{AVERAGE_RENDER_SECONDS_PROPERTY}_{backend.lower()}"
+
+
+def set_backend_render_engine(scene, backend):
+    """Swap in the render engine for a backend, returns the original engine (None when unchanged)"""
+    original_engine = scene.render.engine
+    if backend == 'WORKBENCH':
+        scene.render.engine = 'BLENDER_WORKBENCH'
+    elif backend == 'EEVEE':
+        # EEVEE Next is BLENDER_EEVEE_NEXT in Blender 4.2-4.4
+        for engine in ('BLENDER_EEVEE_NEXT', 'BLENDER_EEVEE'):
+            try:
+                scene.render.engine = engine
+                break
+            except TypeError:
+                continue
+    else:
+        return None
+    return original_engine
+
+
+def find_view3d_override(context):
+    """Window, area and region of an open 3D viewport, for operators that need one"""
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                region = next((region for region in area.regions if region.type == 'WINDOW'), None)
+                if region:
+                    return {"window": window, "area": area, "region": region}
+    return None
+
+
+def render_still(context, backend, view_layer_name=""):
+    """Render the current frame to scene.render.filepath with a render backend (one view layer if named)"""
+    if backend != 'VIEWPORT':
+        bpy.ops.render.render(write_still=True, layer=view_layer_name)
+        return
+    override = find_view3d_override(context)
+    if not override:
+        raise RuntimeError("Viewport render needs an open 3D viewport")
+    # view_context=False renders through the scene camera with the scene display settings
+    with context.temp_override(**override):
+        bpy.ops.render.opengl(write_still=True, view_context=False)
+
+
+# Time budget modes of the batch operator
+TIME_BUDGET_MODES = [
+    ('OFF', "Off", "Render every frame with the scene samples"),
+    ('PER_FRAME', "Per Frame", "Adjust samples so each frame renders in about the given time"),
+    ('DEADLINE', "Deadline", "Adjust samples so the whole batch finishes by the given time of day"),
+]
+
+# Largest sample change from one frame to the next
+SAMPLE_BUDGET_MAX_STEP = 2.0
+# Frames kept for the samples -> seconds fit
+SAMPLE_BUDGET_HISTORY = 6
+
+
+def parse_deadline(deadline_text, now):
+    """Next occurrence of a "HH:MM" time of day after now, None if the text isn't a time"""
+    from datetime import datetime, timedelta
+    try:
+        time_of_day = datetime.strptime(deadline_text.strip(), "%H:%M").time()
+    except ValueError:
+        return None
+    deadline = datetime.combine(now.date(), time_of_day)
+    if deadline <= now:
+        deadline += timedelta(days=1)
+    return deadline
+
+
+class SampleBudget:
+    """
+    Adjusts render samples between frames so a batch keeps to a time budget
+    Frame time is fitted as overhead + seconds per sample from the last frames (proportional
+    until two sample counts were measured). Samples never go above the scene samples, and
+    the Cycles adaptive threshold is loosened with the noise level of the lower sample count.
+    """
+
+    def __init__(self, scene, mode, seconds_per_frame=0.0, deadline=None, min_samples=16):
+        self.scene = scene
+        self.mode = mode
+        self.seconds_per_frame = seconds_per_frame
+        self.deadline = deadline
+        self.history = []  # (samples, seconds) of the last frames
+        self.used_samples = []
+
+        if scene.render.engine == 'CYCLES':
+            self.settings, self.samples_attribute = scene.cycles, "samples"
+        elif scene.render.engine in ('BLENDER_EEVEE', 'BLENDER_EEVEE_NEXT'):
+            self.settings, self.samples_attribute = scene.eevee, "taa_render_samples"
+        else:
+            self.settings, self.samples_attribute = None, None
+
+        self.base_samples = getattr(self.settings, self.samples_attribute) if self.settings else 0
+        self.min_samples = max(1, min(min_samples, self.base_samples))
+        self.samples = self.base_samples
+        self.base_threshold = None
+        if scene.render.engine == 'CYCLES' and scene.cycles.use_adaptive_sampling:
+            self.base_threshold = scene.cycles.adaptive_threshold
+
+    @property
+    def enabled(self):
+        return self.settings is not None and self.mode != 'OFF'
+
+    def get_target_seconds(self, remaining_frames):
+        """Time the next frame may take"""
+        if self.mode == 'PER_FRAME':
+            return self.seconds_per_frame
+        from datetime import datetime
+        return (self.deadline - datetime.now()).total_seconds() / max(1, remaining_frames)
+
+    def estimate_samples(self, target_seconds):
+        """Samples expected to render in target_seconds, from the measured frames"""
+        samples, seconds = self.history[-1]
+        points = {sample_count: frame_seconds for sample_count, frame_seconds in self.history}
+        if len(points) >= 2:
+            # Least squares fit of seconds = overhead + per_sample * samples
+            count = len(self.history)
+            mean_samples = sum(point[0] for point in self.history) / count
+            mean_seconds = sum(point[1] for point in self.history) / count
+            variance = sum((point[0] - mean_samples) ** 2 for point in self.history)
+            per_sample = sum((point[0] - mean_samples) * (point[1] - mean_seconds) for point in self.history) / variance
+            overhead = mean_seconds - per_sample * mean_samples
+            if per_sample > 0 and target_seconds > overhead:
+                return (target_seconds - overhead) / per_sample
+        return samples * target_seconds / seconds
+
+    def update(self, frame_seconds, remaining_frames):
+        """Record the last frame's render time and set the samples for the next frame"""
+        if not self.enabled or frame_seconds <= 0:
+            return
+        self.history = (self.history + [(self.samples, frame_seconds)])[-SAMPLE_BUDGET_HISTORY:]
+        if not remaining_frames:
+            return
+        target_seconds = self.get_target_seconds(remaining_frames)
+        if target_seconds <= 0:
+            # Deadline already passed: render the rest as fast as allowed
+            samples = self.min_samples
+        else:
+            estimate = self.estimate_samples(target_seconds)
+            estimate = max(self.samples / SAMPLE_BUDGET_MAX_STEP, min(self.samples * SAMPLE_BUDGET_MAX_STEP, estimate))
+            samples = int(max(self.min_samples, min(self.base_samples, round(estimate))))
+        if samples != self.samples:
+            print(f"⏱️  Time budget: {frame_seconds:.1f}s for the last frame, target {max(0.0, target_seconds):.1f}s -> {samples} samples")
+        self.apply(samples)
+
+    def apply(self, samples):
+        self.samples = samples
+        self.used_samples.append(samples)
+        setattr(self.settings, self.samples_attribute, samples)
+        if self.base_threshold:
+            # Noise goes with 1/sqrt(samples): stop adaptive sampling at the matching noise level
+            self.scene.cycles.adaptive_threshold = min(0.5, self.base_threshold * (self.base_samples / samples) ** 0.5)
+
+    def restore(self):
+        if not self.enabled:
+            return
+        setattr(self.settings, self.samples_attribute, self.base_samples)
+        if self.base_threshold:
+            self.scene.cycles.adaptive_threshold = self.base_threshold
+
+    def summary(self):
+        if not self.used_samples:
+            return f"Time budget: all frames rendered with {self.base_samples} samples"
+        return f"Time budget: samples {min(self.used_samples)}-{max(self.used_samples)} (scene: {self.base_samples})"
+
+
+def get_process_memory():
+    """Resident memory (RSS) of this Blender process in bytes, None where it can't be read"""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_current_process.restype = wintypes.HANDLE
+        if ctypes.windll.psapi.GetProcessMemoryInfo(get_current_process(), ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    # macOS: no current RSS without extra modules, the peak (in bytes there) is the closest
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (ImportError, OSError):
+        return None
+
+
+def purge_render_memory(kept_images=frozenset()):
+    """
+    Free the Render Result and Viewer buffers and remove orphan images, returns the images removed
+    kept_images holds the as_pointer() of images that are never removed (the user's own orphans)
+    """
+    removed = 0
+    for image in list(bpy.data.images):
+        if image.type in ('RENDER_RESULT', 'COMPOSITING'):
+            image.buffers_free()
+        elif image.users == 0 and not image.use_fake_user and not image.is_dirty and image.as_pointer() not in kept_images:
+            bpy.data.images.remove(image)
+            removed += 1
+    return removed
+
+
+class MemoryGovernor:
+    """
+    Keeps the memory of a batch in check between frames
+    After every frame the render buffers and the orphan images created during the batch are
+    freed and the process memory is sampled. Over the budget, persistent data is turned off: the scene data it keeps
+    between frames is the largest thing the batch can let go of.
+    """
+
+    def __init__(self, scene, budget_bytes=0):
+        self.scene = scene
+        self.budget_bytes = budget_bytes
+        self.start_bytes = get_process_memory()
+        self.peak_bytes = self.start_bytes or 0
+        self.samples = []  # (frame, bytes after the render, bytes after the purge)
+        self.purged_images = 0
+        self.persistent_data_off_frame = None
+        # Images from before the batch belong to the user, orphan or not
+        self.existing_images = {image.as_pointer() for image in bpy.data.images}
+
+    def update(self, frame_num):
+        """Purge after a fully rendered frame and apply the budget to the next frame"""
+        rendered_bytes = get_process_memory()
+        self.purged_images += purge_render_memory(self.existing_images)
+        purged_bytes = get_process_memory()
+        if rendered_bytes is None or purged_bytes is None:
+            return
+        self.peak_bytes = max(self.peak_bytes, rendered_bytes)
+        self.samples.append((frame_num, rendered_bytes, purged_bytes))
+        print(f"🧠 Memory after frame {frame_num}: {format_bytes(rendered_bytes)} ({format_bytes(purged_bytes)} after purge)")
+        if self.budget_bytes and purged_bytes > self.budget_bytes and self.scene.render.use_persistent_data:
+            self.scene.render.use_persistent_data = False
+            self.persistent_data_off_frame = frame_num
+            print(f"🧠 Memory budget: {format_bytes(purged_bytes)} is over {format_bytes(self.budget_bytes)}, persistent data turned off")
+
+    def summary(self):
+        if not self.samples:
+            return f"Memory: {self.purged_images} orphan image(s) purged (process memory not available)"
+        text = (
+            f"Memory: {format_bytes(self.start_bytes)} at start, {format_bytes(self.samples[-1][2])} at the end, "
+            f"peak {format_bytes(self.peak_bytes)} between frames, {self.purged_images} orphan image(s) purged"
+        )
+        if self.persistent_data_off_frame is not None:
+            text += f", persistent data off from frame {self.persistent_data_off_frame}"
+        return text
+
+
+class BatchPlan:
+    """Dry run of a batch: every output path plus collisions, disk space and time estimates"""
+
+    def __init__(self):
+        self.outputs = []  # (frame, channel, full output path)
+        self.errors = []  # Problems that stop the batch from starting
+        self.warnings = []
+        self.existing_count = 0  # Outputs that will overwrite files already on disk
+        self.estimated_bytes = 0
+        self.free_bytes = None
+        self.estimated_seconds = None
+        self.simulation_frame_count = 0  # Frames stepped through before the first render
+        self.simulation_seconds = None
+
+    @property
+    def render_count(self):
+        return len(self.outputs)
+
+    def summary_lines(self):
+        """Human readable summary of the plan"""
+        lines = [f"{self.render_count} output file(s)"]
+        space = f"Estimated size: {format_bytes(self.estimated_bytes)}"
+        if self.free_bytes is not None:
+            space += f" (free: {format_bytes(self.free_bytes)})"
+        lines.append(space)
+        if self.estimated_seconds is not None:
+            lines.append(f"Estimated time: {format_duration(self.estimated_seconds)}")
+        else:
+            lines.append("Estimated time: unknown (no previous batch)")
+        if self.simulation_frame_count:
+            duration = format_duration(self.simulation_seconds) if self.simulation_seconds is not None else "time unknown"
+            lines.append(f"Simulation stepping first: {self.simulation_frame_count} frame(s) ({duration})")
+        if self.existing_count:
+            lines.append(f"{self.existing_count} file(s) already exist and will be overwritten")
+        return lines
+
+
+def build_batch_plan(scene, frame_numbers, channels, pattern, output_folder, sharding=None, targets=None):
+    """
+    Expand frames x channels x pattern into the full set of output paths and check them
+    channels is a list of (channel name, pass name) as returned by get_selected_channels(),
+    targets a list of (camera name, view layer name, channels) as returned by get_render_targets()
+    """
+    from datetime import datetime
+
+    plan = BatchPlan()
+    template = compile_filename_pattern(pattern)
+    file_format = scene.render.image_settings.file_format
+    extension = get_file_extension('PNG' if file_format in DISALLOWED_STILL_FORMATS else file_format)
+    if targets is None:
+        targets = [(None, scene.view_layers[0].name if scene.view_layers else "ViewLayer", channels)]
+
+    # Missing tokens make every frame/channel write to the same file, unless time-based or
+    # post-render tokens still tell the renders apart (then it is only a warning)
+    missing_token = False
+    if template.has_per_render_tokens:
+        missing_token_messages, missing_token_suffix = plan.warnings, "may overwrite each other (names only differ by render time)"
+    else:
+        missing_token_messages, missing_token_suffix = plan.errors, "would overwrite each other"
+    if len(frame_numbers) > 1 and "Frame" not in template.tokens:
+        missing_token_messages.append(f"Pattern has no (Frame) token: {len(frame_numbers)} frames {missing_token_suffix}")
+        missing_token = True
+    # Per-channel subfolders keep passes apart even without a (Channel) token
+    channel_count = max(len(target_channels) for _, _, target_channels in targets)
+    is_valid, message = validate_channel_pattern(pattern, channel_count > 1 and not (sharding and sharding.by_channel))
+    if not is_valid:
+        missing_token_messages.append(f"{message}: {channel_count} passes {missing_token_suffix}")
+        missing_token = True
+    for token, count, name in (("Camera", len({target[0] for target in targets}), "cameras"), ("ViewLayer", len({target[1] for target in targets}), "view layers")):
+        if count > 1 and token not in template.tokens:
+            missing_token_messages.append(f"Pattern has no ({token}) token: {count} {name} {missing_token_suffix}")
+            missing_token = True
+
+    # Generate every filename in one call per camera/view layer (times are predicted as "now")
+    now = datetime.now()
+    for camera_name, view_layer_name, target_channels in targets:
+        if camera_name is None:
+            camera_name = scene.camera.name if scene.camera else "NoCamera"
+        filenames = template.render_many(
+            frame_numbers,
+            [channel_name for channel_name, _ in target_channels],
+            blend_name=get_blend_name(),
+            camera_name=camera_name,
+            view_layer_name=view_layer_name,
+            start_time=now,
+            end_time=now,
+            batch_start_time=now,
+        )
+        plan.outputs.extend(
+            (frame, channel, resolve_output_path(output_folder, filename, extension, sharding, frame, channel, now))
+            for frame, channel, filename in filenames
+        )
+
+    # Collisions: identical paths, or paths that only differ by case (clash on Windows/macOS volumes)
+    by_path = {}
+    for frame, channel, path in plan.outputs:
+        by_path.setdefault(path.lower(), []).append((frame, channel, path))
+    clashes = [entries for entries in by_path.values() if len(entries) > 1]
+    if clashes and not missing_token:
+        example = clashes[0]
+        detail = f"{os.path.basename(example[0][2])} (frames {sorted({entry[0] for entry in example})})"
+        case_only = len({entry[2] for entry in example}) > 1
+        message = f"{len(clashes)} output name collision(s){' differing only by case' if case_only else ''}, e.g. {detail}"
+        # Names with time-based or post-render tokens may still end up different at render time
+        if template.has_per_render_tokens:
+            plan.warnings.append(f"Possible {message}")
+        else:
+            plan.errors.append(message)
+
+    # Files that will be overwritten (one directory listing per folder instead of an exists() per file)
+    existing = set()
+    for folder in {os.path.dirname(path) for _, _, path in plan.outputs}:
+        if os.path.isdir(folder):
+            existing.update(os.path.join(folder, entry.name).lower() for entry in os.scandir(folder))
+    plan.existing_count = sum(1 for _, _, path in plan.outputs if path.lower() in existing)
+
+    # Disk space on the target volume (nearest existing parent if the folder is new)
+    plan.estimated_bytes = estimate_image_bytes(scene) * plan.render_count
+    probe_folder = output_folder
+    while probe_folder and not os.path.exists(probe_folder):
+        parent = os.path.dirname(probe_folder)
+        if parent == probe_folder:
+            break
+        probe_folder = parent
+    try:
+        plan.free_bytes = shutil.disk_usage(probe_folder).free
+        if plan.estimated_bytes > plan.free_bytes:
+            plan.errors.append(f"Not enough disk space: needs ~{format_bytes(plan.estimated_bytes)}, {format_bytes(plan.free_bytes)} free")
+        elif plan.estimated_bytes > plan.free_bytes * 0.9:
+            plan.warnings.append(f"Output will nearly fill the disk ({format_bytes(plan.free_bytes)} free)")
+    except OSError as e:
+        plan.warnings.append(f"Could not read free disk space: {e}")
+
+    # Time estimate from the average render time of the last batch in this scene
+    average_seconds = scene.get(get_average_seconds_property(scene.frh_render_backend))
+    if average_seconds:
+        plan.estimated_seconds = average_seconds * plan.render_count
+
+    # Unbaked simulations with frames out of order: stepping costs time, skipping it gives wrong results
+    simulations = find_simulations(scene)
+    simulation_frames = get_simulation_frames(simulations, frame_numbers)
+    if simulation_frames and scene.frh_prebake_simulations:
+        plan.simulation_frame_count = len(simulation_frames)
+        step_seconds = scene.get(SIMULATION_STEP_SECONDS_PROPERTY)
+        if step_seconds is not None:
+            plan.simulation_seconds = step_seconds * len(simulation_frames)
+            if plan.estimated_seconds is not None:
+                plan.estimated_seconds += plan.simulation_seconds
+    elif simulation_frames:
+        plan.warnings.append(f"{len(simulations)} unbaked simulation(s) and frames out of order: bake them or turn on Step Simulations First")
+
+    return plan
+
+
+# Temporary folders of background batches (copy of the .blend file and the job file)
+BACKGROUND_BATCH_PREFIX = "frh_batch_"
+
+# Batch running in a background Blender process, shown in the panel (one per session)
+_background_batch = None
+
+
+class BackgroundBatch:
+    """
+    A batch rendered by a `blender -b` process from a copy of the file, followed by this session
+    The worker (render_queue.py) prints status and progress lines, a reader thread keeps the
+    latest ones and poll_background_batch() redraws the panel until the process exits
+    """
+
+    def __init__(self, command, work_folder, staging_folders=()):
+        import subprocess
+        from datetime import datetime
+        self.work_folder = work_folder
+        self.staging_folders = staging_folders  # Where the worker writes its temporary renders
+        self.start_time = datetime.now()
+        self.end_time = None
+        self.state = "running"  # running, done, failed or cancelled
+        self.error = ""
+        self.progress = None  # Last progress line: render, total, frame, channel
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace")
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+
+    def _read_output(self):
+        # Unreadable status lines are echoed like any other output, the pipe is always drained
+        for line in self.process.stdout:
+            parsed = render_queue.parse_worker_line(line)
+            if parsed is None:
+                print(f"[background] {line.rstrip()}")
+                continue
+            prefix, fields = parsed
+            if prefix == render_queue.PROGRESS_PREFIX:
+                if {"frame", "render", "total"} <= fields.keys():
+                    self.progress = fields
+            elif fields.get("state", "running") != "running" and self.state == "running":
+                self.state = fields["state"]
+                self.error = fields.get("error") or ""
+
+    @property
+    def running(self):
+        return self.process.poll() is None
+
+    def cancel(self):
+        self.state = "cancelled"
+        self.process.terminate()
+
+    def finish(self):
+        """Final state once the process exited, and removal of the file copy"""
+        from datetime import datetime
+        return_code = self.process.wait()
+        self._reader.join(timeout=5)
+        self.end_time = datetime.now()
+        if self.state == "running":
+            self.state = "failed"
+            self.error = f"Blender exited with code {return_code}"
+        # A terminated worker leaves the render it was writing, named after its own pid
+        for folder in self.staging_folders:
+            removed = remove_staged_files(folder, self.process.pid)
+            if removed:
+                print(f"✓ Removed {removed} unfinished temporary render(s) of the background batch")
+        shutil.rmtree(self.work_folder, ignore_errors=True)
+        print(f"{'✅' if self.state == 'done' else '⚠️ '} {self.get_status_text()}")
+
+    def get_progress_factor(self):
+        if self.state == "done":
+            return 1.0
+        if not self.progress:
+            return 0.0
+        return (self.progress["render"] - 1) / self.progress["total"]
+
+    def get_status_text(self):
+        if self.state == "running":
+            if not self.progress:
+                return "Background batch: starting Blender..."
+            return f"Background batch: frame {self.progress['frame']}, render {self.progress['render']}/{self.progress['total']}"
+        if self.state == "cancelled":
+            return "Background batch cancelled"
+        if self.state == "failed":
+            return f"Background batch failed: {self.error}"
+        elapsed = ((self.end_time or self.start_time) - self.start_time).total_seconds()
+        return f"Background batch done in {format_duration(elapsed)}"
+
+
+def poll_background_batch():
+    """bpy.app.timers callback: redraw the panel while the background batch runs"""
+    batch = _background_batch
+    if batch is None:
+        return None
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'PROPERTIES':
+                area.tag_redraw()
+    if batch.running:
+        return 1.0
+    batch.finish()
+    return None
+
+
+def start_background_batch(scene, frame_string, pattern, output_folder):
+    """Save a copy of the file and render the batch in a `blender -b` worker"""
+    global _background_batch
+    blender = bpy.app.binary_path
+    if not blender:
+        raise RuntimeError("Blender executable not found for the background process")
+    if _background_batch and _background_batch.running:
+        raise RuntimeError("A background batch is already running")
+
+    # The copy keeps the file name, so (FileName) is the same as in this session
+    work_folder = tempfile.mkdtemp(prefix=BACKGROUND_BATCH_PREFIX)
+    blend_path = os.path.join(work_folder, get_blend_name() + ".blend")
+    bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+
+    # A one-job queue: the worker renders it with this operator, in background mode
+    job_path = os.path.join(work_folder, "job.json")
+    job = {"blend": blend_path, "scene": scene.name, "frames": frame_string, "pattern": pattern, "output": output_folder}
+    with open(job_path, 'w') as f:
+        json.dump({"jobs": [job]}, f, indent=2)
+
+    staging_folders = [get_output_folder(folder=output_folder)]
+    if scene.frh_use_local_scratch:
+        staging_folders.append(get_scratch_folder(scene))
+
+    command = render_queue.get_worker_command(blender, blend_path, job_path, [0], __package__)
+    _background_batch = BackgroundBatch(command, work_folder, staging_folders)
+    bpy.app.timers.register(poll_background_batch, first_interval=1.0)
+    return _background_batch
+
+
+class RENDER_OT_set_output_folder(Operator):
+    """Set output folder for rendering specific frames"""
+    bl_idname = "render.set_output_folder"
+    bl_label = "Set Output Folder"
+    bl_description = "Choose the folder where rendered frames will be saved"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Property to store output folder path
+    folder_path: StringProperty(
+        name="Output Folder",
+        description="Choose the folder where rendered frames will be saved",
+        default="",
+        subtype='DIR_PATH'
+    )
+    
+    def execute(self, context):
+        global output_folder_path
+        if self.folder_path.strip():
+            output_folder_path = bpy.path.abspath(self.folder_path.strip())
+            # Ensure the folder exists
+            try:
+                os.makedirs(output_folder_path, exist_ok=True)
+                # Save as default preference
+                save_default_output_folder()
+                self.report({'INFO'}, f"Output folder set to: {output_folder_path}")
+            except Exception as e:
+                self.report({'ERROR'}, f"Failed to create/access folder: {str(e)}")
+                return {'CANCELLED'}
+        else:
+            # Clear the output folder (use default)
+            output_folder_path = ""
+            # Save empty preference
+            save_default_output_folder()
+            self.report({'INFO'}, "Output folder cleared (will use blend file directory)")
+        
+        return {'FINISHED'}
+    
+    def invoke(self, context, event):
+        global output_folder_path
+        self.folder_path = output_folder_path
+        return context.window_manager.invoke_props_dialog(self, width=400)
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "folder_path")
+        layout.separator()
+        
+        # Show information about storage location
+        source = get_output_path_source()
+        info_box = layout.box()
+        if source == 'SCENE_PROPS':
+            info_box.label(text="Storage: Scene Properties (per-project)", icon='SCENE_DATA')
+            info_box.label(text="This folder will be saved in the blend file")
+        else:  # USER_PREFS
+            info_box.label(text="Storage: User Preferences (global)", icon='PREFERENCES')
+            info_box.label(text="This folder will be saved as your default")
+        
+        layout.separator()
+        layout.label(text="Leave empty to use blend file directory")
+        layout.label(text="Change storage location in Add-on Preferences", icon='INFO')
+
+
+class RENDER_OT_set_filename_pattern(Operator):
+    """Set filename pattern for rendered frames"""
+    bl_idname = "render.set_filename_pattern"
+    bl_label = "Set Filename Pattern"
+    bl_description = "Customize the filename pattern for rendered frames using tokens"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Property to store filename pattern
+    pattern: StringProperty(
+        name="Filename Pattern",
+        description="Filename pattern using tokens like (FileName), (Camera), (ViewLayer), (Frame), (Channel), (Start:yyyyMMdd), (End:HHmmss)",
+        default="(FileName)_(Camera)_frame_(Frame)",
+        maxlen=200
+    )
+    
+    def execute(self, context):
+        global filename_pattern
+        if self.pattern.strip():
+            filename_pattern = self.pattern.strip()
+            # Save as default preference
+            save_user_preferences()
+            self.report({'INFO'}, f"Filename pattern set to: {filename_pattern}")
+            # Validate up front instead of finding out during the batch
+            for warning in compile_filename_pattern(filename_pattern).validate():
+                self.report({'WARNING'}, warning)
+        else:
+            # Reset to default
+            filename_pattern = "(FileName)_(Camera)_frame_(Frame)"
+            save_user_preferences()
+            self.report({'INFO'}, "Filename pattern reset to default")
+        
+        return {'FINISHED'}
+    
+    def invoke(self, context, event):
+        global filename_pattern
+        # Load current pattern from the correct source before displaying
+        source = get_output_path_source()
+        if source == 'SCENE_PROPS':
+            try:
+                load_filename_pattern_from_scene(context.scene)
+            except:
+                pass
+        else:
+            load_filename_pattern_from_user_prefs()
+        
+        self.pattern = filename_pattern
+        return context.window_manager.invoke_props_dialog(self, width=500)
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "pattern")
+        layout.separator()
+        
+        # Show information about storage location
+        source = get_output_path_source()
         info_box = layout.box()
         if source == 'SCENE_PROPS':
             info_box.label(text="Storage: Scene Properties (per-project)", icon='SCENE_DATA')
@@ -892,10 +2905,20 @@ class RENDER_OT_specific_frames(Operator):
     bl_description = "Furion Render Helper entered by user (comma separated)"
     bl_options = {'REGISTER', 'UNDO'}
     
+    # Settings of queued batches (render_queue.py), empty: the frame list, folder and pattern set in the UI
+    override_frames: StringProperty(options={'SKIP_SAVE', 'HIDDEN'})
+    override_output_folder: StringProperty(options={'SKIP_SAVE', 'HIDDEN'})
+    override_pattern: StringProperty(options={'SKIP_SAVE', 'HIDDEN'})
+    
     # Internal properties for modal operation
     _timer = None
     _frame_numbers = []
     _current_frame_index = 0
+    _render_targets = []  # (camera name, view layer name, channels) combinations, see get_render_targets()
+    _frame_renders = []  # (camera name, view layer name, channel name, pass name) rendered for every frame
+    _current_render_index = 0
+    _render_single_layer = False  # Render one view layer at a time
+    _original_camera = None
     _original_frame = 0
     _original_filepath = ""
     _original_format = ""
@@ -907,234 +2930,306 @@ class RENDER_OT_specific_frames(Operator):
     _render_start_time = None
     _frame_start_time = None
     _batch_start_time = None  # Time when batch rendering starts
+    _filename_template = None  # Compiled filename pattern for the batch
+    _staging_folder = ""  # Where renders are written before they get their final name
+    _transfer_queue = None  # Background transfer from local scratch (None when writing directly)
+    _sharding = None  # Output subfolder layout for the batch
+    _catalog = None  # RenderCatalog of the output folder
+    _settings_fingerprint = ""
+    _detect_changes = False  # Compare each render with the previous one
+    _change_threshold = 0.0
+    _skip_identical = False
+    _change_report = []
+    _probe_mode = 'OFF'  # Low-res probe before each frame (see PROBE_MODES)
+    _probe_threshold = 0.0
+    _pending_probe = None  # (frame, signature) stored once the frame is fully rendered
+    _skipped_frames = []
+    _backend = 'RENDER'  # See RENDER_BACKENDS
+    _original_engine = None  # Engine to restore when the backend swapped it
+    _sample_budget = None  # SampleBudget when rendering to a time budget
+    _frame_render_seconds = 0.0  # Render time of all channels of the current frame
+    _memory_governor = None  # MemoryGovernor purging and sampling memory between frames
+    _simulation_frames = []  # Frames still to step through before the first render
+    _simulation_seconds = 0.0  # Time spent stepping simulations, not part of any render time
+    _simulation_frame_count = 0
+    _region_rerender = False  # Re-render only the screen region of changed objects
+    _region_margin = 0
+    _frame_region = None  # Pixel region of the current frame, None for a full render
+    _region_bases = {}  # {channel: previous output} the region is pasted over
+    _pending_object_states = None  # (frame, states) stored once the frame is fully rendered
+    _edit_generation = None  # [session, generation] of this batch in the SceneEditTracker
     
     def modal(self, context, event):
         if event.type == 'TIMER':
-            # Check if we're done rendering all frames and channels
-            if self._current_frame_index >= len(self._frame_numbers):
-                return self.finish_rendering(context)
-            
-            # Check if we're done with all channels for current frame
-            if self._current_channel_index >= len(self._selected_channels):
-                # Move to next frame
-                self._current_frame_index += 1
-                self._current_channel_index = 0
-                # Update UI
+            return self.render_step(context)
+        
+        elif event.type == 'ESC':
+            return self.cancel_rendering(context)
+        
+        return {'PASS_THROUGH'}
+    
+    def render_step(self, context):
+        """Render the next frame/channel: called by the modal timer, or in a loop in background mode"""
+        # Step simulations up to the last frame first, the renders then read their caches
+        if self._simulation_frames:
+            return self.step_simulations(context)
+        
+        # Check if we're done rendering all frames and channels
+        if self._current_frame_index >= len(self._frame_numbers):
+            # Wait for background transfers before reporting the batch as finished
+            if self._transfer_queue and self._transfer_queue.pending_count:
+                if context.workspace:
+                    context.workspace.status_text_set(f"Transferring {self._transfer_queue.pending_count} file(s) to output folder...")
+                return {'PASS_THROUGH'}
+            return self.finish_rendering(context)
+        
+        # Check if we're done with all channels for current frame
+        if self._current_render_index >= len(self._frame_renders):
+            # Fully rendered: its probe and object states become the reference for the next batch
+            self.store_pending_probe()
+            self.store_pending_object_states()
+            # Set the samples of the next frame from this frame's render time
+            if self._sample_budget:
+                self._sample_budget.update(self._frame_render_seconds, len(self._frame_numbers) - self._current_frame_index - 1)
+            self._frame_render_seconds = 0.0
+            # Free render buffers and check the memory budget before the next frame
+            if self._memory_governor:
+                self._memory_governor.update(self._frame_numbers[self._current_frame_index])
+            # Move to next frame
+            self._current_frame_index += 1
+            self._current_render_index = 0
+            # Update UI
+            if context.screen:
                 for area in context.screen.areas:
                     area.tag_redraw()
-                return {'PASS_THROUGH'}
-            
-            # Get current frame and channel
-            frame_num = self._frame_numbers[self._current_frame_index]
-            channel_name, pass_name = self._selected_channels[self._current_channel_index]
-            scene = context.scene
-            render = scene.render
-            
-            # Set current frame
+            return {'PASS_THROUGH'}
+        
+        # Get current frame, camera, view layer and channel
+        frame_num = self._frame_numbers[self._current_frame_index]
+        camera_name, view_layer_name, channel_name, pass_name = self._frame_renders[self._current_render_index]
+        scene = context.scene
+        render = scene.render
+        
+        # Evaluate the frame once, every camera and view layer of the frame reuses it
+        if self._current_render_index == 0 or scene.frame_current != frame_num:
             scene.frame_set(frame_num)
-            
-            # Get camera name for filename
-            camera_name = "NoCamera"
-            if scene.camera:
-                camera_name = scene.camera.name
-            
-            # Get view layer name
-            view_layer_name = scene.view_layers[0].name if scene.view_layers else "ViewLayer"
-            
-            # Record frame start time for filename patterns
-            from datetime import datetime
-            self._frame_start_time = datetime.now()
-            
-            # Generate filename using custom pattern with channel
-            global filename_pattern
-            # Only use channel name if pattern contains (Channel) token or multiple channels selected
-            if "(Channel)" in filename_pattern or len(self._selected_channels) > 1:
-                filename = generate_filename_from_pattern(
-                    filename_pattern,
-                    self._blend_filename,
-                    camera_name,
-                    frame_num,
-                    start_time=self._render_start_time,
-                    end_time=None,  # End time not available yet during rendering
-                    channel_name=channel_name,
-                    view_layer_name=view_layer_name,
-                    batch_start_time=self._batch_start_time,
-                    render_duration_seconds=None  # Will be calculated after render
-                )
-            else:
-                filename = generate_filename_from_pattern(
-                    filename_pattern,
-                    self._blend_filename,
-                    camera_name,
-                    frame_num,
-                    start_time=self._render_start_time,
-                    end_time=None,  # End time not available yet during rendering
-                    channel_name=None,
-                    view_layer_name=view_layer_name,
-                    batch_start_time=self._batch_start_time,
-                    render_duration_seconds=None  # Will be calculated after render
-                )
-            
-            # Get file extension from render settings
-            file_format = render.image_settings.file_format.lower()
-            if file_format == 'png':
-                extension = '.png'
-            elif file_format == 'jpeg':
-                extension = '.jpg'
-            elif file_format == 'tiff':
-                extension = '.tif'
-            elif file_format == 'exr':
-                extension = '.exr'
-            else:
-                extension = '.png'  # default
-            
-            # Set full output path
-            full_output_path = os.path.join(self._output_folder, filename + extension)
-            filepath_without_ext = os.path.join(self._output_folder, filename)
-            render.use_file_extension = True
-            render.filepath = filepath_without_ext
-            self._last_saved_path = full_output_path
-            
-            # Calculate total progress (frames * channels)
-            total_renders = len(self._frame_numbers) * len(self._selected_channels)
-            current_render = (self._current_frame_index * len(self._selected_channels)) + self._current_channel_index + 1
-            progress_percent = (current_render / total_renders) * 100
-            progress_bar = "█" * int(progress_percent / 5) + "░" * (20 - int(progress_percent / 5))
-            
-            print("=" * 60)
-            print(f"RENDERING PROGRESS: [{progress_bar}] {progress_percent:.1f}%")
-            print(f"Frame {self._current_frame_index + 1} of {len(self._frame_numbers)}")
-            print(f"Channel {self._current_channel_index + 1} of {len(self._selected_channels)} ({channel_name})")
-            print(f"Current Frame Number: {frame_num}")
-            print(f"Output File: {filename}{extension}")
-            print(f"Full Path: {full_output_path}")
-            print(f"Render Format: {render.image_settings.file_format}")
-            print(f"Resolution: {render.resolution_x}x{render.resolution_y}")
-            print("=" * 60)
-            
-            # Update progress in UI
-            progress_msg = f"Rendering frame {frame_num} - {channel_name} ({current_render}/{total_renders}) -> {filename}{extension}"
-            self.report({'INFO'}, progress_msg)
-            
-            # Set up compositor for this specific pass if needed
-            original_compositor_state = setup_compositor_for_pass(scene, channel_name, pass_name)
-            
-            # Render the frame (use blocking call within modal for proper sequencing)
-            print(f"Starting render of frame {frame_num} - {channel_name}...")
-            from datetime import datetime
-            render_start = datetime.now()
-            bpy.ops.render.render(write_still=True)
-            render_end = datetime.now()
-            render_duration = (render_end - render_start).total_seconds()
-            
-            # If filename pattern contains (RenderDurationSeconds), regenerate filename with actual duration
-            if "(RenderDurationSeconds)" in filename_pattern:
-                # Regenerate filename with render duration
-                if "(Channel)" in filename_pattern or len(self._selected_channels) > 1:
-                    filename = generate_filename_from_pattern(
-                        filename_pattern,
-                        self._blend_filename,
-                        camera_name,
-                        frame_num,
-                        start_time=self._render_start_time,
-                        end_time=render_end,
-                        channel_name=channel_name,
-                        view_layer_name=view_layer_name,
-                        batch_start_time=self._batch_start_time,
-                        render_duration_seconds=render_duration
-                    )
-                else:
-                    filename = generate_filename_from_pattern(
-                        filename_pattern,
-                        self._blend_filename,
-                        camera_name,
-                        frame_num,
-                        start_time=self._render_start_time,
-                        end_time=render_end,
-                        channel_name=None,
-                        view_layer_name=view_layer_name,
-                        batch_start_time=self._batch_start_time,
-                        render_duration_seconds=render_duration
-                    )
-                
-                # Update paths with new filename
-                full_output_path = os.path.join(self._output_folder, filename + extension)
-                self._last_saved_path = full_output_path
-                
-                print(f"✓ Render duration: {render_duration:.2f} seconds")
-            
-            # Check if the file was created - check multiple possible paths
-            file_created = False
-            actual_path = None
-            
-            # Check multiple possible file paths
-            possible_paths = [
-                full_output_path,  # Expected path
-                filepath_without_ext + extension,  # Path without explicit extension
-                filepath_without_ext + f"_{frame_num:04d}{extension}",  # With frame number
-                filepath_without_ext + f"{frame_num:04d}{extension}",  # Frame without underscore
-                full_output_path.replace(extension, f"_{frame_num:04d}{extension}"),  # Expected path with frame
-                full_output_path.replace(extension, f"{frame_num:04d}{extension}")  # Without underscore
-            ]
-            
-            # Also check uppercase extension variants
-            if extension.lower() != extension:
-                possible_paths.extend([
-                    p.replace(extension, extension.upper()) for p in possible_paths[:6]
-                ])
-            
-            for check_path in possible_paths:
-                if os.path.exists(check_path):
-                    file_created = True
-                    actual_path = check_path
-                    print(f"✓ Frame {frame_num} - {channel_name} rendered successfully at: {actual_path}")
-                    break
-            
-            if not file_created:
-                print(f"WARNING: Expected file not found. Checked paths:")
-                for check_path in possible_paths:
-                    print(f"  - {check_path}")
-                
-                # Try to save manually if automatic save failed
-                success = save_render_result(scene, full_output_path)
-                if success and os.path.exists(full_output_path):
-                    file_created = True
-                    actual_path = full_output_path
-                    print(f"✓ Frame {frame_num} - {channel_name} manually saved to: {actual_path}")
-                else:
-                    print(f"❌ Failed to save frame {frame_num} - {channel_name}")
-            
-            
-            # Restore compositor state
+        
+        # Cheap probe render first: skip the frame when it looks like the last batch
+        if self._current_render_index == 0 and self._probe_mode != 'OFF' and self.probe_frame(scene, frame_num):
+            self._current_frame_index += 1
+            return {'PASS_THROUGH'}
+        
+        # Only the screen region of objects that changed since the last batch gets re-rendered
+        if self._current_render_index == 0 and self._region_rerender and self.plan_frame_region(context, frame_num):
+            self._current_frame_index += 1
+            return {'PASS_THROUGH'}
+        
+        # Switch camera (None: the scene camera of this frame) and get its name for the filename
+        if camera_name:
+            scene.camera = bpy.data.objects[camera_name]
+        else:
+            camera_name = scene.camera.name if scene.camera else "NoCamera"
+        
+        # Record frame start time for filename patterns
+        from datetime import datetime
+        self._frame_start_time = datetime.now()
+        
+        # Generate filename using the compiled pattern (compiled once per batch)
+        # Channel names only appear in the filename when the pattern has a (Channel) token
+        filename = self._filename_template.render(
+            frame_num,
+            channel_name,
+            blend_name=self._blend_filename,
+            camera_name=camera_name,
+            view_layer_name=view_layer_name,
+            start_time=self._render_start_time,
+            end_time=None,  # End time not available yet during rendering
+            batch_start_time=self._batch_start_time,
+            render_duration_seconds=None  # Will be calculated after render
+        )
+        
+        # Get file extension from render settings
+        extension = get_file_extension(render.image_settings.file_format)
+        
+        # Render to a temporary name, renamed to the final name once the render is done
+        # (shard subfolders on the output folder are created by the transfer when using scratch)
+        full_output_path = resolve_output_path(
+            self._output_folder, filename, extension, self._sharding,
+            frame_num, channel_name, self._batch_start_time, create=not self._transfer_queue
+        )
+        staging_path = get_staging_path(self._staging_folder, frame_num, channel_name, camera_name, view_layer_name)
+        render.use_file_extension = True
+        render.filepath = staging_path
+        
+        # Calculate total progress (frames * channels)
+        total_renders = len(self._frame_numbers) * len(self._frame_renders)
+        current_render = (self._current_frame_index * len(self._frame_renders)) + self._current_render_index + 1
+        progress_percent = (current_render / total_renders) * 100
+        progress_bar = "█" * int(progress_percent / 5) + "░" * (20 - int(progress_percent / 5))
+        
+        # Machine-readable progress for the session that started this batch (see BackgroundBatch)
+        if bpy.app.background:
+            progress = {"render": current_render, "total": total_renders, "frame": frame_num, "channel": channel_name}
+            print(render_queue.PROGRESS_PREFIX + json.dumps(progress), flush=True)
+        
+        print("=" * 60)
+        print(f"RENDERING PROGRESS: [{progress_bar}] {progress_percent:.1f}%")
+        print(f"Frame {self._current_frame_index + 1} of {len(self._frame_numbers)}")
+        print(f"Render {self._current_render_index + 1} of {len(self._frame_renders)} ({camera_name} / {view_layer_name} / {channel_name})")
+        print(f"Current Frame Number: {frame_num}")
+        print(f"Output File: {filename}{extension}")
+        print(f"Full Path: {full_output_path}")
+        print(f"Render Format: {render.image_settings.file_format}")
+        print(f"Resolution: {render.resolution_x}x{render.resolution_y}")
+        print("=" * 60)
+        
+        # Update progress in UI
+        progress_msg = f"Rendering frame {frame_num} - {channel_name} ({current_render}/{total_renders}) -> {filename}{extension}"
+        self.report({'INFO'}, progress_msg)
+        
+        # Set up compositor for this specific pass if needed
+        original_compositor_state = setup_compositor_for_pass(scene, channel_name, pass_name, view_layer_name if self._render_single_layer else None)
+        
+        # Render the frame (use blocking call within modal for proper sequencing)
+        print(f"Starting render of frame {frame_num} - {channel_name}...")
+        from datetime import datetime
+        render_start = datetime.now()
+        region_state = setup_region_render(scene, self._frame_region) if self._frame_region else None
+        try:
+            render_still(context, self._backend, view_layer_name if self._render_single_layer else "")
+        except RuntimeError as e:
+            # Viewport render without a 3D view: nothing can render, stop the batch
+            print(f"❌ {e}")
+            self.report({'ERROR'}, str(e))
             restore_compositor_state(scene, original_compositor_state)
-            
-            # Move to next channel
-            self._current_channel_index += 1
-            
-            # Update UI
+            return self.cancel_rendering(context)
+        finally:
+            if region_state:
+                restore_region_render(scene, region_state)
+        render_end = datetime.now()
+        render_duration = (render_end - render_start).total_seconds()
+        self._frame_render_seconds += render_duration
+        
+        # Post-render tokens ((End:...), (RenderDurationSeconds)) are only known now
+        if self._filename_template.has_post_render_tokens:
+            filename = self._filename_template.render(
+                frame_num,
+                channel_name,
+                blend_name=self._blend_filename,
+                camera_name=camera_name,
+                view_layer_name=view_layer_name,
+                start_time=self._render_start_time,
+                end_time=render_end,
+                batch_start_time=self._batch_start_time,
+                render_duration_seconds=render_duration
+            )
+            full_output_path = resolve_output_path(self._output_folder, filename, extension, self._sharding, frame_num, channel_name, self._batch_start_time)
+            print(f"✓ Render duration: {render_duration:.2f} seconds")
+        
+        # Find the temporary file Blender wrote, save manually if automatic save failed
+        staged_file = find_written_file(staging_path, extension, frame_num)
+        if not staged_file:
+            print(f"WARNING: Render output not found at {staging_path}{extension}, saving render result manually")
+            if save_render_result(scene, staging_path + extension) and os.path.exists(staging_path + extension):
+                staged_file = staging_path + extension
+        
+        # Region render: paste the region over the previous output of the frame
+        if staged_file and self._frame_region:
+            try:
+                composite_region(self._region_bases[channel_name], staged_file, self._frame_region, staged_file)
+            except (RuntimeError, OSError, KeyError) as e:
+                print(f"❌ Could not paste the re-rendered region over the previous output: {e}")
+                os.remove(staged_file)
+                staged_file = None
+        
+        # Compare with the previous render of this frame/channel
+        # Identical renders can keep the previous file instead of writing it again
+        reused_path = None
+        if staged_file and self._detect_changes:
+            change = self.detect_change(staged_file, full_output_path, frame_num, channel_name, camera_name, view_layer_name)
+            if self._skip_identical and change.get("identical"):
+                os.remove(staged_file)
+                reused_path = change["previous"]
+            elif self._skip_identical and change["status"] == "unchanged":
+                print(f"ℹ️ Frame {frame_num} - {channel_name} below the change threshold but not identical, writing it")
+        
+        # Move the finished file to its final name in one step
+        # (from local scratch: queued, the next frame renders while it is copied)
+        saved = False
+        file_size = os.path.getsize(staged_file) if staged_file and not reused_path else 0
+        if reused_path:
+            print(f"✓ Frame {frame_num} - {channel_name} unchanged, kept previous output: {reused_path}")
+        elif staged_file and self._transfer_queue:
+            self._transfer_queue.submit(staged_file, full_output_path)
+            saved = True
+            print(f"✓ Frame {frame_num} - {channel_name} rendered, queued transfer to: {full_output_path}")
+        elif staged_file and commit_staged_file(staged_file, full_output_path):
+            saved = True
+            print(f"✓ Frame {frame_num} - {channel_name} rendered successfully at: {full_output_path}")
+        else:
+            print(f"❌ Failed to save frame {frame_num} - {channel_name}")
+        
+        if saved:
+            self._last_saved_path = full_output_path
+            self.record_in_catalog(
+                full_output_path, frame_num, channel_name, camera_name, view_layer_name,
+                file_size, render_duration, render_start, render_end
+            )
+        
+        # Restore compositor state
+        restore_compositor_state(scene, original_compositor_state)
+        
+        # Move to next channel
+        self._current_render_index += 1
+        
+        # Update UI
+        if context.screen:
             for area in context.screen.areas:
                 area.tag_redraw()
         
-        elif event.type == 'ESC':
-            return self.cancel_rendering(context)
-        
+        return {'PASS_THROUGH'}
+    
+    def step_simulations(self, context):
+        """Step the scene through the simulation frames, SIMULATION_STEP_SECONDS at a time"""
+        scene = context.scene
+        step_start = time.perf_counter()
+        while self._simulation_frames and time.perf_counter() - step_start < SIMULATION_STEP_SECONDS:
+            scene.frame_set(self._simulation_frames.pop(0))
+        self._simulation_seconds += time.perf_counter() - step_start
+        if self._simulation_frames:
+            if context.workspace:
+                context.workspace.status_text_set(f"Simulating frame {scene.frame_current} of {self._simulation_frames[-1]}...")
+        else:
+            if context.workspace:
+                context.workspace.status_text_set(None)
+            print(f"✓ Simulations stepped to frame {scene.frame_current} in {format_duration(self._simulation_seconds)}")
+            # Remember the stepping speed for the next pre-flight time estimate
+            scene[SIMULATION_STEP_SECONDS_PROPERTY] = self._simulation_seconds / max(1, self._simulation_frame_count)
         return {'PASS_THROUGH'}
     
     def finish_rendering(self, context):
         # Console completion message
-        channel_names = [ch[0] for ch in self._selected_channels]
-        total_renders = len(self._frame_numbers) * len(self._selected_channels)
+        channel_names = sorted({render[2] for render in self._frame_renders})
+        total_renders = len(self._frame_numbers) * len(self._frame_renders)
         print("\n" + "=" * 60)
         print("🎉 RENDERING COMPLETED SUCCESSFULLY! 🎉")
         print(f"✓ Total frames rendered: {len(self._frame_numbers)}")
         print(f"✓ Render channels: {channel_names}")
+        if len(self._render_targets) > 1:
+            print(f"✓ Cameras / view layers: {len(self._render_targets)}")
         print(f"✓ Total renders: {total_renders}")
         print(f"✓ Output folder: {self._output_folder}")
         print(f"✓ Frame numbers: {self._frame_numbers}")
         print("=" * 60 + "\n")
         
-        # Restore original frame and filepath
+        # Remember the average render time for the next pre-flight time estimate
         scene = context.scene
+        if total_renders and self._batch_start_time:
+            from datetime import datetime
+            elapsed_seconds = (datetime.now() - self._batch_start_time).total_seconds() - self._simulation_seconds
+            scene[get_average_seconds_property(self._backend)] = elapsed_seconds / total_renders
+        
+        # Restore original frame and filepath
         scene.frame_set(self._original_frame)
         scene.render.filepath = self._original_filepath
         if self._format_switched and self._original_format:
@@ -1143,21 +3238,287 @@ class RENDER_OT_specific_frames(Operator):
             except Exception:
                 pass
         
-        # Restore original persistent data setting
+        # Restore the scene samples changed by the time budget
+        if self._sample_budget:
+            self._sample_budget.restore()
+            print(f"✓ {self._sample_budget.summary()}")
+        
+        # Restore the render engine swapped in by the render backend
+        if self._original_engine:
+            scene.render.engine = self._original_engine
+        
+        # Restore the scene camera switched by multi-camera batches
+        if self._original_camera and self._original_camera.name in bpy.data.objects:
+            scene.camera = self._original_camera
+        
+        # Record edits again
+        _scene_edits.end_batch()
+        
+        # Restore original persistent data setting (the memory governor may have turned it off)
+        if self._memory_governor:
+            print(f"✓ {self._memory_governor.summary()}")
         scene.render.use_persistent_data = self._original_use_persistent_data
         print(f"✓ Restored persistent data setting to: {self._original_use_persistent_data}")
         
-        # Remove timer
-        wm = context.window_manager
-        wm.event_timer_remove(self._timer)
-        total_renders = len(self._frame_numbers) * len(self._selected_channels)
-        self.report({'INFO'}, f"Successfully rendered {len(self._frame_numbers)} frames with {len(self._selected_channels)} channels ({total_renders} total renders)")
+        # Let queued transfers complete, then remove temporary renders that never got their final name
+        transfer_failures = self.finish_transfers(context)
+        changed_count = self.write_change_report()
+        self.close_catalog()
+        removed = remove_staged_files(self._staging_folder)
+        if removed:
+            print(f"✓ Removed {removed} unfinished temporary render(s)")
+        
+        # Remove timer (none in background mode)
+        if self._timer:
+            context.window_manager.event_timer_remove(self._timer)
+        total_renders = len(self._frame_numbers) * len(self._frame_renders)
+        if transfer_failures:
+            self.report({'WARNING'}, f"{transfer_failures} file(s) could not be transferred and were kept in {self._staging_folder}")
+        if self._skipped_frames:
+            self.report({'INFO'}, f"Skipped {len(self._skipped_frames)} unchanged frame(s) after probe render: {self._skipped_frames}")
+        if self._memory_governor and self._memory_governor.persistent_data_off_frame is not None:
+            self.report({'WARNING'}, f"Memory budget reached, persistent data was turned off from frame {self._memory_governor.persistent_data_off_frame}")
+        if self._detect_changes:
+            self.report({'INFO'}, f"{changed_count} render(s) changed since the last batch (see {CHANGE_REPORT_FOLDER} in the output folder)")
+        self.report({'INFO'}, f"Successfully rendered {len(self._frame_numbers)} frames with {len(self._frame_renders)} renders each ({total_renders} total renders)")
         return {'FINISHED'}
     
+    def probe_frame(self, scene, frame_num):
+        """
+        Render a low-res probe of the frame and compare it with the probe stored after the last full render
+        Returns True when the frame can be skipped (probe unchanged and every channel has an output)
+        """
+        self._pending_probe = None
+        render = scene.render
+        extension = get_file_extension(render.image_settings.file_format)
+        probe_path = os.path.join(tempfile.gettempdir(), f"frh_probe_{os.getpid()}")
+
+        original_state = setup_probe_render(scene, self._probe_mode)
+        try:
+            render.use_file_extension = True
+            render.filepath = probe_path
+            bpy.ops.render.render(write_still=True)
+            probe_file = find_written_file(probe_path, extension, frame_num)
+            if not probe_file:
+                print(f"⚠️ Probe render of frame {frame_num} was not written, rendering in full")
+                return False
+            signature = compute_image_signature(load_image_pixels(probe_file))
+            os.remove(probe_file)
+        except (RuntimeError, OSError) as e:
+            print(f"⚠️ Probe render of frame {frame_num} failed, rendering in full: {e}")
+            return False
+        finally:
+            restore_probe_render(scene, original_state)
+
+        self._pending_probe = (frame_num, signature)
+        if not self._catalog:
+            return False
+        comparison = compare_signatures(signature, self._catalog.get_probe_signature(frame_num, self._settings_fingerprint, self._probe_mode))
+        if not comparison:
+            print(f"🔎 Frame {frame_num}: no probe from an earlier batch, rendering in full")
+            return False
+        if comparison[0] > self._probe_threshold:
+            print(f"🔎 Frame {frame_num}: probe changed (difference {comparison[0]:.4f}), rendering in full")
+            return False
+        outputs = [self._catalog.latest(frame_num, render[2], self._settings_fingerprint) for render in self._frame_renders]
+        if not all(outputs):
+            print(f"🔎 Frame {frame_num}: probe unchanged but outputs are missing, rendering in full")
+            return False
+
+        print(f"⏭️ Frame {frame_num}: probe unchanged (difference {comparison[0]:.4f}), keeping existing outputs")
+        self._pending_probe = None
+        self._skipped_frames.append(frame_num)
+        return True
+    
+    def store_pending_probe(self):
+        """Store the probe of a fully rendered frame as the reference for the next batch"""
+        if self._pending_probe and self._catalog:
+            frame_num, signature = self._pending_probe
+            try:
+                self._catalog.store_probe_signature(frame_num, self._settings_fingerprint, self._probe_mode, signature)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not store probe of frame {frame_num}: {e}")
+        self._pending_probe = None
+    
+    def plan_frame_region(self, context, frame_num):
+        """
+        Compare the objects of the frame with the states stored after its last render
+        Sets the region to re-render (None: full frame). Returns True when nothing changed and
+        the existing outputs are kept
+        """
+        scene = context.scene
+        self._frame_region = None
+        previous_states = self._catalog.get_object_states(frame_num, self._settings_fingerprint) if self._catalog else None
+        # Meshes are only evaluated for objects edited since the previous states were stored
+        full_render, geometry_edited = _scene_edits.get_edit_history(previous_states)
+        reusable_geometry = {}
+        if not full_render:
+            reusable_geometry = {
+                name: state[3] for name, state in previous_states.items()
+                if name not in geometry_edited and len(state) > 3 and state[3]
+            }
+        states = get_object_states(scene, context.evaluated_depsgraph_get(), reusable_geometry)
+        states["__edits__"] = self._edit_generation
+        self._pending_object_states = (frame_num, states)
+        if previous_states is None:
+            print(f"🔲 Frame {frame_num}: no object states from an earlier batch, rendering in full")
+            return False
+        if full_render:
+            print(f"🔲 Frame {frame_num}: edits the object states don't cover (images, collections, another session...), rendering in full")
+            return False
+        self._region_bases = {
+            render[2]: self._catalog.latest(frame_num, render[2], self._settings_fingerprint)
+            for render in self._frame_renders
+        }
+        if not all(self._region_bases.values()):
+            print(f"🔲 Frame {frame_num}: outputs are missing, rendering in full")
+            return False
+
+        render = scene.render
+        width = render.resolution_x * render.resolution_percentage // 100
+        height = render.resolution_y * render.resolution_percentage // 100
+        region = plan_render_region(previous_states, states, width, height, self._region_margin)
+        if region == ():
+            print(f"⏭️ Frame {frame_num}: no object changed on screen, keeping existing outputs")
+            self._skipped_frames.append(frame_num)
+            self.store_pending_object_states()
+            return True
+        if region is None:
+            print(f"🔲 Frame {frame_num}: camera, lights, empties, world/compositor or a large area changed, rendering in full")
+            return False
+        x0, y0, x1, y1 = region
+        print(f"🔲 Frame {frame_num}: re-rendering region {x0},{y0} - {x1},{y1} ({(x1 - x0) * (y1 - y0) * 100 / (width * height):.1f}% of the frame)")
+        self._frame_region = region
+        return False
+    
+    def store_pending_object_states(self):
+        """Store the object states of a rendered frame as the reference for the next batch"""
+        if self._pending_object_states and self._catalog:
+            frame_num, states = self._pending_object_states
+            try:
+                self._catalog.store_object_states(frame_num, self._settings_fingerprint, states)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not store object states of frame {frame_num}: {e}")
+        self._pending_object_states = None
+        self._frame_region = None
+    
+    def detect_change(self, staged_file, final_path, frame_num, channel_name, camera_name=None, view_layer_name=None):
+        """
+        Compare a finished render with the previous render of the same frame/channel
+        Uses the signature stored in the catalog, or the previous file when there is none yet
+        """
+        # Several cameras/view layers: renders of a frame/channel are told apart by camera and view layer
+        if len(self._render_targets) <= 1:
+            camera_name = view_layer_name = None
+        signature_key = "/".join(name for name in (camera_name, view_layer_name, channel_name) if name)
+        entry = {
+            "frame": frame_num,
+            "channel": channel_name,
+            "path": final_path,
+            "status": "new",
+            "difference": None,
+            "previous": None,
+            "heatmap": None,
+        }
+        try:
+            signature = compute_image_signature(load_image_pixels(staged_file))
+            previous_signature = self._catalog.get_signature(frame_num, signature_key) if self._catalog else None
+            previous_path = self._catalog.latest(frame_num, channel_name, camera=camera_name, view_layer=view_layer_name) if self._catalog else None
+            if not previous_path and os.path.exists(final_path):
+                previous_path = final_path
+            if previous_signature is None and previous_path:
+                previous_signature = compute_image_signature(load_image_pixels(previous_path))
+            entry["previous"] = previous_path
+
+            comparison = compare_signatures(signature, previous_signature)
+            if comparison:
+                max_difference, mean_difference, difference_map = comparison
+                entry["difference"] = round(max_difference, 5)
+                entry["mean_difference"] = round(mean_difference, 6)
+                entry["status"] = "changed" if max_difference > self._change_threshold else "unchanged"
+                # The downsampled signature only finds candidates: a file is only replaced by the
+                # previous one when the pixels are exactly the same at full resolution
+                if entry["status"] == "unchanged" and self._skip_identical and previous_path:
+                    entry["identical"] = images_identical(staged_file, previous_path)
+                if entry["status"] == "changed":
+                    heatmap_folder = os.path.join(self._output_folder, CHANGE_REPORT_FOLDER)
+                    os.makedirs(heatmap_folder, exist_ok=True)
+                    heatmap_name = os.path.splitext(os.path.basename(final_path))[0] + "_diff.png"
+                    entry["heatmap"] = os.path.join(heatmap_folder, heatmap_name)
+                    save_heatmap(difference_map, entry["heatmap"])
+            elif previous_signature is not None:
+                # Resolution changed since the last batch
+                entry["status"] = "changed"
+
+            if self._catalog:
+                self._catalog.store_signature(frame_num, signature_key, signature)
+        except (RuntimeError, OSError, sqlite3.Error) as e:
+            entry["status"] = "error"
+            print(f"⚠️ Change detection failed for frame {frame_num} - {channel_name}: {e}")
+
+        print(f"✓ Change check: {entry['status']}" + (f" (difference {entry['difference']})" if entry["difference"] is not None else ""))
+        self._change_report.append(entry)
+        return entry
+    
+    def write_change_report(self):
+        """Write the changed/unchanged report of the batch next to the heatmaps, returns the changed count"""
+        if not self._change_report:
+            return 0
+        changed = [entry for entry in self._change_report if entry["status"] == "changed"]
+        report_folder = os.path.join(self._output_folder, CHANGE_REPORT_FOLDER)
+        report_path = os.path.join(report_folder, f"changes_{self._batch_start_time:%Y%m%d_%H%M%S}.json")
+        try:
+            os.makedirs(report_folder, exist_ok=True)
+            with open(report_path, 'w') as f:
+                json.dump({
+                    "batch_start": self._batch_start_time.isoformat(timespec="seconds"),
+                    "threshold": self._change_threshold,
+                    "changed_frames": sorted({entry["frame"] for entry in changed}),
+                    "renders": self._change_report,
+                }, f, indent=2)
+            print(f"✓ Change report: {len(changed)} of {len(self._change_report)} render(s) changed -> {report_path}")
+        except OSError as e:
+            print(f"⚠️ Could not write change report: {e}")
+        self._change_report = []
+        return len(changed)
+    
+    def record_in_catalog(self, path, frame_num, channel_name, camera_name, view_layer_name, size, duration, started, finished):
+        """Add a saved render to the output folder's catalog"""
+        if not self._catalog:
+            return
+        try:
+            self._catalog.record(
+                path, frame_num, channel_name, camera=camera_name, view_layer=view_layer_name,
+                blend=self._blend_filename, size=size, duration=duration, started=started,
+                finished=finished, batch_started=self._batch_start_time, fingerprint=self._settings_fingerprint
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not record {os.path.basename(path)} in render catalog: {e}")
+    
+    def close_catalog(self):
+        if self._catalog:
+            self._catalog.close()
+            self._catalog = None
+    
+    def finish_transfers(self, context):
+        """Wait for background transfers to drain, returns the number of failed transfers"""
+        if not self._transfer_queue:
+            return 0
+        print(f"⏳ Waiting for {self._transfer_queue.pending_count} transfer(s) to finish...")
+        self._transfer_queue.drain()
+        if context.workspace:
+            context.workspace.status_text_set(None)
+        queue = self._transfer_queue
+        self._transfer_queue = None
+        print(f"✓ Transferred {len(queue.transferred)} file(s) from local scratch")
+        for kept_path, final_path, error in queue.failed:
+            print(f"❌ Not transferred: {final_path} ({error}), kept at {kept_path}")
+        return len(queue.failed)
+    
     def cancel_rendering(self, context):
         # Console cancellation message
-        completed_renders = (self._current_frame_index * len(self._selected_channels)) + self._current_channel_index
-        total_renders = len(self._frame_numbers) * len(self._selected_channels)
+        completed_renders = (self._current_frame_index * len(self._frame_renders)) + self._current_render_index
+        total_renders = len(self._frame_numbers) * len(self._frame_renders)
         print("\n" + "=" * 60)
         print("⚠️  RENDERING CANCELLED BY USER ⚠️")
         print(f"✓ Renders completed: {completed_renders}/{total_renders}")
@@ -1175,81 +3536,143 @@ class RENDER_OT_specific_frames(Operator):
             except Exception:
                 pass
         
-        # Restore original persistent data setting
+        # Restore the scene samples changed by the time budget
+        if self._sample_budget:
+            self._sample_budget.restore()
+            print(f"✓ {self._sample_budget.summary()}")
+        
+        # Restore the render engine swapped in by the render backend
+        if self._original_engine:
+            scene.render.engine = self._original_engine
+        
+        # Restore the scene camera switched by multi-camera batches
+        if self._original_camera and self._original_camera.name in bpy.data.objects:
+            scene.camera = self._original_camera
+        
+        # Record edits again
+        _scene_edits.end_batch()
+        
+        # Restore original persistent data setting (the memory governor may have turned it off)
+        if self._memory_governor:
+            print(f"✓ {self._memory_governor.summary()}")
         scene.render.use_persistent_data = self._original_use_persistent_data
         print(f"✓ Restored persistent data setting to: {self._original_use_persistent_data}")
         
-        # Remove timer
-        wm = context.window_manager
-        wm.event_timer_remove(self._timer)
+        # Let queued transfers complete, then remove temporary renders that never got their final name
+        transfer_failures = self.finish_transfers(context)
+        changed_count = self.write_change_report()
+        self.close_catalog()
+        removed = remove_staged_files(self._staging_folder)
+        if removed:
+            print(f"✓ Removed {removed} unfinished temporary render(s)")
+        
+        # Remove timer (none in background mode)
+        if self._timer:
+            context.window_manager.event_timer_remove(self._timer)
         
-        completed_renders = (self._current_frame_index * len(self._selected_channels)) + self._current_channel_index
-        total_renders = len(self._frame_numbers) * len(self._selected_channels)
+        completed_renders = (self._current_frame_index * len(self._frame_renders)) + self._current_render_index
+        total_renders = len(self._frame_numbers) * len(self._frame_renders)
+        if transfer_failures:
+            self.report({'WARNING'}, f"{transfer_failures} file(s) could not be transferred and were kept in {self._staging_folder}")
         self.report({'WARNING'}, f"Rendering cancelled. Completed {completed_renders}/{total_renders} renders ({self._current_frame_index}/{len(self._frame_numbers)} frames)")
         return {'CANCELLED'}
     
     def execute(self, context):
-        global output_folder_path
         # Parse the frame list
         try:
-            frame_string = context.scene.frh_frame_list.strip()
+            frame_string = (self.override_frames or context.scene.frh_frame_list).strip()
             if not frame_string:
                 self.report({'ERROR'}, "Please enter frame numbers")
                 return {'CANCELLED'}
             
-            # Split by comma and convert to integers or ranges
-            frame_numbers = []
-            for frame_str in frame_string.split(','):
-                frame_str = frame_str.strip()
-                if frame_str:
-                    try:
-                        # Check if it's a range (contains hyphen)
-                        if '-' in frame_str:
-                            # Handle range like "1-5" or "10-20"
-                            range_parts = frame_str.split('-')
-                            if len(range_parts) == 2:
-                                start_frame = int(range_parts[0].strip())
-                                end_frame = int(range_parts[1].strip())
-                                if start_frame <= end_frame:
-                                    # Add all frames in range (inclusive)
-                                    frame_numbers.extend(range(start_frame, end_frame + 1))
-                                else:
-                                    self.report({'ERROR'}, f"Invalid range: {frame_str} (start must be <= end)")
-                                    return {'CANCELLED'}
-                            else:
-                                self.report({'ERROR'}, f"Invalid range format: {frame_str}")
-                                return {'CANCELLED'}
-                        else:
-                            # Single frame number
-                            frame_num = int(frame_str)
-                            frame_numbers.append(frame_num)
-                    except ValueError:
-                        self.report({'ERROR'}, f"Invalid frame number or range: {frame_str}")
-                        return {'CANCELLED'}
+            # Parse individual frames and ranges (duplicates removed, sorted)
+            try:
+                frame_numbers = parse_frame_list(frame_string)
+            except ValueError as e:
+                self.report({'ERROR'}, str(e))
+                return {'CANCELLED'}
             
             if not frame_numbers:
                 self.report({'ERROR'}, "No valid frame numbers found")
                 return {'CANCELLED'}
             
-            # Remove duplicates and sort
-            frame_numbers = sorted(list(set(frame_numbers)))
-            
             # Get selected render channels from Blender's view layer
             scene = context.scene
             selected_channels = get_selected_channels(scene)
             
+            # Cameras and view layers, each view layer with its own passes
+            render_targets = get_render_targets(scene, scene.frh_camera_mode, scene.frh_view_layer_mode, context.selected_objects)
+            if not render_targets:
+                self.report({'ERROR'}, "No camera or view layer to render (select cameras or enable a view layer)")
+                return {'CANCELLED'}
+            
             # Note: Combined is always included by default in get_selected_channels()
-
-            # Show info if multiple channels but no (Channel) token
+            # A missing (Channel) token is reported by the pre-flight check below
             global filename_pattern
-            if len(selected_channels) > 1 and "(Channel)" not in filename_pattern:
-                self.report({'INFO'}, f"💡 Tip: Add (Channel) token to filename pattern for multi-pass rendering. {len(selected_channels)} passes will use the same filename.")
             
-            # Store frame numbers and channels for modal operation
+            # Viewport renders have no render passes: Combined only
+            self._backend = scene.frh_render_backend
+            if self._backend == 'VIEWPORT':
+                if len(selected_channels) > 1:
+                    self.report({'INFO'}, f"Viewport render: only Combined is rendered ({len(selected_channels) - 1} pass(es) skipped)")
+                selected_channels = [channel for channel in selected_channels if channel[0] == 'Combined'] or [('Combined', 'Combined')]
+                render_targets = [(camera_name, view_layer_name, selected_channels) for camera_name, view_layer_name, _ in render_targets]
+                if not find_view3d_override(context):
+                    self.report({'ERROR'}, "Viewport render needs an open 3D viewport")
+                    return {'CANCELLED'}
+            
+            # Deadline of the time budget, as the next occurrence of the time of day
+            from datetime import datetime
+            deadline = parse_deadline(scene.frh_batch_deadline, datetime.now())
+            if scene.frh_time_budget_mode == 'DEADLINE' and not deadline:
+                self.report({'ERROR'}, f"Invalid deadline '{scene.frh_batch_deadline}', use HH:MM")
+                return {'CANCELLED'}
+            
+            # Compile the filename pattern once for the whole batch
+            pattern = self.override_pattern or filename_pattern
+            output_folder = self.override_output_folder or None
+            self._filename_template = compile_filename_pattern(pattern)
+            for warning in self._filename_template.validate():
+                self.report({'WARNING'}, f"Filename pattern: {warning}")
+            
+            # Pre-flight check: collisions and disk space before anything is rendered
+            self._sharding = OutputSharding.from_scene(scene)
+            plan = build_batch_plan(scene, frame_numbers, selected_channels, pattern, get_output_folder(folder=output_folder), self._sharding, render_targets)
+            for warning in plan.warnings:
+                self.report({'WARNING'}, warning)
+            if plan.errors:
+                for error in plan.errors:
+                    print(f"❌ Pre-flight: {error}")
+                self.report({'ERROR'}, f"Batch not started: {plan.errors[0]}")
+                return {'CANCELLED'}
+            for line in plan.summary_lines():
+                print(f"📋 Pre-flight: {line}")
+            
+            # Render in a background Blender process from a copy of the file, this session stays free
+            if scene.frh_render_in_background and not bpy.app.background:
+                if self._backend == 'VIEWPORT':
+                    self.report({'ERROR'}, "Viewport renders can't run in a background process")
+                    return {'CANCELLED'}
+                try:
+                    start_background_batch(scene, frame_string, pattern, get_output_folder(create=True, folder=output_folder))
+                except (RuntimeError, OSError) as e:
+                    self.report({'ERROR'}, str(e))
+                    return {'CANCELLED'}
+                self.report({'INFO'}, f"Rendering {plan.render_count} render(s) in a background Blender process, progress in the panel")
+                return {'FINISHED'}
+            
+            # Store frame numbers and the renders of each frame (camera x view layer x channel) for modal operation
             self._frame_numbers = frame_numbers
-            self._selected_channels = selected_channels
+            self._render_targets = render_targets
+            self._frame_renders = [
+                (camera_name, view_layer_name, channel_name, pass_name)
+                for camera_name, view_layer_name, channels in render_targets
+                for channel_name, pass_name in channels
+            ]
+            self._render_single_layer = scene.frh_view_layer_mode == 'ENABLED'
+            self._original_camera = scene.camera
             self._current_frame_index = 0
-            self._current_channel_index = 0
+            self._current_render_index = 0
             
             # Get current scene
             scene = context.scene
@@ -1260,14 +3683,25 @@ class RENDER_OT_specific_frames(Operator):
             self._original_format = scene.render.image_settings.file_format
             self._format_switched = False
             
+            # Swap in the render engine of the backend (restored when the batch ends)
+            self._original_engine = set_backend_render_engine(scene, self._backend)
+            if self._original_engine:
+                print(f"✓ Render engine for this batch: {scene.render.engine} (was: {self._original_engine})")
+            
             # Store original persistent data setting and enable it for batch rendering
             self._original_use_persistent_data = scene.render.use_persistent_data
             scene.render.use_persistent_data = True
             print(f"✓ Enabled persistent data for batch rendering (was: {self._original_use_persistent_data})")
+            
+            # Memory governor: purge between frames, persistent data off over the budget
+            self._memory_governor = None
+            if scene.frh_memory_governor:
+                self._memory_governor = MemoryGovernor(scene, int(scene.frh_memory_budget * 1024 ** 3))
+                if self._memory_governor.start_bytes is not None:
+                    print(f"🧠 Memory governor: {format_bytes(self._memory_governor.start_bytes)} at start, budget {format_bytes(self._memory_governor.budget_bytes) if self._memory_governor.budget_bytes else 'off'}")
 
             # If current file format is a video/unsupported for still files, switch to PNG temporarily
-            disallowed_formats = {"FFMPEG", "AVI_JPEG", "AVI_RAW", "FRAMESERVER"}
-            if self._original_format in disallowed_formats:
+            if self._original_format in DISALLOWED_STILL_FORMATS:
                 try:
                     scene.render.image_settings.file_format = 'PNG'
                     self._format_switched = True
@@ -1276,42 +3710,88 @@ class RENDER_OT_specific_frames(Operator):
                     self.report({'WARNING'}, f"Could not switch format from {self._original_format}; output may not save correctly: {e}")
             
             # Get the blend file name (without extension)
-            blend_filepath = bpy.data.filepath
-            if blend_filepath:
-                self._blend_filename = os.path.splitext(os.path.basename(blend_filepath))[0]
-            else:
-                self._blend_filename = "untitled"
+            self._blend_filename = get_blend_name()
             
             # Set up output folder
-            if output_folder_path.strip():
-                self._output_folder = output_folder_path
-                # Ensure the folder exists
-                os.makedirs(self._output_folder, exist_ok=True)
-            else:
-                # Use default blend file directory or current directory
-                if blend_filepath:
-                    self._output_folder = os.path.dirname(bpy.path.abspath(blend_filepath))
+            self._output_folder = get_output_folder(create=True, folder=output_folder)
+            
+            # Render to local scratch and move files to the output folder in the background
+            self._staging_folder = self._output_folder
+            self._transfer_queue = None
+            if scene.frh_use_local_scratch:
+                self._staging_folder = get_scratch_folder(scene)
+                self._transfer_queue = OutputTransferQueue(max_workers=scene.frh_transfer_workers)
+                print(f"✓ Rendering to local scratch: {self._staging_folder}")
+            
+            # Record every saved render in the output folder's catalog
+            self._catalog = open_render_catalog(self._output_folder)
+            self._settings_fingerprint = get_settings_fingerprint(scene)
+            
+            # Change detection against the previous batch (signatures live in the catalog)
+            self._detect_changes = scene.frh_detect_changes
+            self._change_threshold = scene.frh_change_threshold
+            self._skip_identical = scene.frh_detect_changes and scene.frh_skip_identical
+            self._change_report = []
+            
+            # Low-res probe renders to skip frames that look the same as in the last batch
+            # (viewport renders are already cheaper than a probe)
+            # Probes and region re-renders compare one image per frame: one camera and view layer only
+            self._probe_mode = scene.frh_probe_mode if self._backend != 'VIEWPORT' and len(render_targets) == 1 else 'OFF'
+            self._probe_threshold = scene.frh_probe_threshold
+            self._pending_probe = None
+            
+            # Region re-render of changed objects (viewport renders have no render border)
+            self._region_rerender = scene.frh_region_rerender and self._backend != 'VIEWPORT' and len(render_targets) == 1
+            if len(render_targets) > 1 and (scene.frh_probe_mode != 'OFF' or scene.frh_region_rerender):
+                self.report({'INFO'}, "Probe renders and region re-renders are off for batches with several cameras or view layers")
+            self._region_margin = scene.frh_region_margin
+            self._frame_region = None
+            self._pending_object_states = None
+            self._skipped_frames = []
+            
+            # Sparse frames jump across time: step unbaked simulations in order up to the last frame first
+            self._simulation_frames = []
+            self._simulation_seconds = 0.0
+            self._simulation_frame_count = 0
+            if scene.frh_prebake_simulations:
+                simulations = find_simulations(scene)
+                self._simulation_frames = get_simulation_frames(simulations, frame_numbers)
+                self._simulation_frame_count = len(self._simulation_frames)
+                if self._simulation_frames:
+                    print(f"🌊 Simulations: {', '.join(name for name, _ in simulations)}")
+                    print(f"🌊 Stepping frames {self._simulation_frames[0]}-{self._simulation_frames[-1]} before rendering")
+            
+            # Time budget: samples follow the measured render times (after the engine swap)
+            self._sample_budget = None
+            self._frame_render_seconds = 0.0
+            if scene.frh_time_budget_mode != 'OFF':
+                budget = SampleBudget(scene, scene.frh_time_budget_mode, scene.frh_frame_time_budget, deadline, scene.frh_budget_min_samples)
+                if budget.enabled:
+                    self._sample_budget = budget
+                    target = f"{scene.frh_frame_time_budget:.0f}s per frame" if budget.mode == 'PER_FRAME' else f"done by {deadline:%Y-%m-%d %H:%M}"
+                    print(f"⏱️  Time budget: {target}, {budget.min_samples}-{budget.base_samples} samples")
                 else:
-                    self._output_folder = os.getcwd()
+                    self.report({'WARNING'}, f"Time budget ignored: {scene.render.engine} has no render samples")
             
-            total_renders = len(frame_numbers) * len(selected_channels)
-            channel_names = [ch[0] for ch in selected_channels]
-            self.report({'INFO'}, f"Starting render of {len(frame_numbers)} frames with {len(selected_channels)} channels ({total_renders} total renders)")
+            total_renders = len(frame_numbers) * len(self._frame_renders)
+            channel_names = sorted({render[2] for render in self._frame_renders})
+            self.report({'INFO'}, f"Starting render of {len(frame_numbers)} frames with {len(self._frame_renders)} renders each ({total_renders} total renders)")
             self.report({'INFO'}, f"Channels: {', '.join(channel_names)}")
             self.report({'INFO'}, f"Frames: {frame_numbers}")
             self.report({'INFO'}, f"Output folder: {self._output_folder}")
             self.report({'INFO'}, "Press ESC to cancel rendering")
             
             # Console startup message
-            total_renders = len(frame_numbers) * len(selected_channels)
-            channel_names = [ch[0] for ch in selected_channels]
+            total_renders = len(frame_numbers) * len(self._frame_renders)
             print("\n" + "=" * 60)
             print("🚀 STARTING BATCH RENDER PROCESS 🚀")
             print(f"📁 Output folder: {self._output_folder}")
             print(f"🎬 Blend file: {self._blend_filename}")
             print(f"🎯 Total frames to render: {len(frame_numbers)}")
             print(f"🎭 Render channels: {channel_names}")
-            print(f"📊 Total renders: {total_renders} ({len(frame_numbers)} frames × {len(selected_channels)} channels)")
+            for camera_name, view_layer_name, channels in render_targets:
+                print(f"📷 {camera_name or 'Scene camera'} / {view_layer_name}: {[channel[0] for channel in channels]}")
+            print(f"📊 Total renders: {total_renders} ({len(frame_numbers)} frames × {len(self._frame_renders)} renders)")
             print(f"📋 Frame list: {frame_numbers}")
             print(f"🖼️  Format: {context.scene.render.image_settings.file_format}")
             print(f"📐 Resolution: {context.scene.render.resolution_x}x{context.scene.render.resolution_y}")
@@ -1324,6 +3804,19 @@ class RENDER_OT_specific_frames(Operator):
             self._render_start_time = datetime.now()
             self._batch_start_time = self._render_start_time  # Batch start is same as first render start
             
+            # Edits from here on are the batch's own, object states of this batch belong to a new generation
+            self._edit_generation = _scene_edits.start_batch()
+            
+            # No event loop in background mode (render_queue.py workers): render the whole batch now
+            if bpy.app.background:
+                self._timer = None
+                result = {'PASS_THROUGH'}
+                while result == {'PASS_THROUGH'}:
+                    result = self.render_step(context)
+                    if self._current_frame_index >= len(self._frame_numbers):
+                        time.sleep(0.1)  # Only waiting for transfers from local scratch
+                return result
+            
             # Start modal operation with timer
             wm = context.window_manager
             self._timer = wm.event_timer_add(0.1, window=context.window)
@@ -1361,6 +3854,10 @@ class RENDER_OT_specific_frames(Operator):
         suggest_op = row.operator("render.suggest_keyframes", text="", icon='KEYFRAME_HLT')
         suggest_op.current_frames = context.scene.frh_frame_list
         
+        # Motion extremes button - for baked/mocap animation where every frame is keyed
+        motion_op = row.operator("render.suggest_motion_extremes", text="", icon='IPO_ELASTIC')
+        motion_op.current_frames = context.scene.frh_frame_list
+        
         col.label(text="Enter frame numbers separated by commas")
         col.label(text="Examples: 1,5,10,25 or 1-5,10-15,30")
         
@@ -1368,11 +3865,365 @@ class RENDER_OT_specific_frames(Operator):
         layout.separator()
         info_box = layout.box()
         info_box.label(text="💡 Click the keyframe icon to auto-populate frames with keyframes", icon='INFO')
+        info_box.label(text="💡 Click the motion icon to suggest motion extremes of selected objects", icon='INFO')
+        
+        # Cameras and view layers rendered for every frame
+        layout.separator()
+        target_box = layout.box()
+        target_box.prop(context.scene, "frh_camera_mode")
+        target_box.prop(context.scene, "frh_view_layer_mode")
+        render_targets = get_render_targets(context.scene, context.scene.frh_camera_mode, context.scene.frh_view_layer_mode, context.selected_objects)
+        if len(render_targets) > 1:
+            target_box.label(text=f"{len(render_targets)} camera/view layer combinations per frame", icon='INFO')
+        elif not render_targets:
+            target_box.label(text="No camera selected or no view layer enabled", icon='ERROR')
+        
+        # Render backend: cheaper engines for previews and blocking passes
+        layout.separator()
+        backend_box = layout.box()
+        backend_box.prop(context.scene, "frh_render_backend")
+        if context.scene.frh_render_backend == 'VIEWPORT':
+            backend_box.label(text="Combined only, needs an open 3D viewport", icon='INFO')
+        backend_box.prop(context.scene, "frh_render_in_background")
+        
+        # Simulations (cloth, particles, rigid bodies, simulation zones) for sparse frame lists
+        layout.separator()
+        layout.prop(context.scene, "frh_prebake_simulations")
+        if context.scene.frh_prebake_simulations:
+            layout.label(text="Adds stepping time before the first render, see the pre-flight estimate", icon='TIME')
+        
+        # Memory governor for large scenes
+        layout.separator()
+        memory_box = layout.box()
+        memory_box.prop(context.scene, "frh_memory_governor")
+        if context.scene.frh_memory_governor:
+            memory_box.prop(context.scene, "frh_memory_budget")
+        
+        # Time budget: samples follow the measured render times
+        budget_box = backend_box.column()
+        budget_box.prop(context.scene, "frh_time_budget_mode")
+        if context.scene.frh_time_budget_mode == 'PER_FRAME':
+            budget_box.prop(context.scene, "frh_frame_time_budget")
+        elif context.scene.frh_time_budget_mode == 'DEADLINE':
+            budget_box.prop(context.scene, "frh_batch_deadline")
+        if context.scene.frh_time_budget_mode != 'OFF':
+            budget_box.prop(context.scene, "frh_budget_min_samples")
+        
+        # Output subfolders for very large batches
+        layout.separator()
+        shard_box = layout.box()
+        shard_box.label(text="Output Subfolders:", icon='FILE_FOLDER')
+        row = shard_box.row(align=True)
+        row.prop(context.scene, "frh_shard_by_batch", toggle=True)
+        row.prop(context.scene, "frh_shard_by_channel", toggle=True)
+        shard_box.prop(context.scene, "frh_shard_frame_block")
+        
+        # Change detection against the previous batch
+        layout.separator()
+        change_box = layout.box()
+        change_box.prop(context.scene, "frh_detect_changes")
+        if context.scene.frh_detect_changes:
+            change_box.prop(context.scene, "frh_change_threshold")
+            change_box.prop(context.scene, "frh_skip_identical")
+        
+        # Probe renders to skip unchanged frames
+        probe_box = change_box.column()
+        probe_box.prop(context.scene, "frh_probe_mode")
+        if context.scene.frh_probe_mode != 'OFF':
+            probe_box.prop(context.scene, "frh_probe_threshold")
+        
+        # Re-render only the screen region of changed objects
+        region_box = change_box.column()
+        region_box.prop(context.scene, "frh_region_rerender")
+        if context.scene.frh_region_rerender:
+            region_box.prop(context.scene, "frh_region_margin")
+        
+        # Local scratch for network output folders
+        layout.separator()
+        scratch_box = layout.box()
+        scratch_box.prop(context.scene, "frh_use_local_scratch")
+        if context.scene.frh_use_local_scratch:
+            scratch_box.prop(context.scene, "frh_scratch_folder")
+            scratch_box.prop(context.scene, "frh_transfer_workers")
         
         layout.separator()
+        layout.operator("render.preflight_batch", text="Check Batch Plan", icon='VIEWZOOM')
         layout.label(text="Note: Press ESC during rendering to cancel", icon='INFO')
 
 
+class RENDER_OT_cancel_background_batch(Operator):
+    """Stop the batch running in a background Blender process"""
+    bl_idname = "render.cancel_background_batch"
+    bl_label = "Cancel Background Batch"
+    bl_description = "Stop the batch running in a background Blender process (finished frames are kept)"
+
+    @classmethod
+    def poll(cls, context):
+        return _background_batch is not None and _background_batch.running
+
+    def execute(self, context):
+        _background_batch.cancel()
+        self.report({'INFO'}, "Background batch cancelled")
+        return {'FINISHED'}
+
+
+class RENDER_OT_preflight_batch(Operator):
+    """Check the batch plan before rendering"""
+    bl_idname = "render.preflight_batch"
+    bl_label = "Check Batch Plan"
+    bl_description = "Check output names for collisions and estimate disk space and render time for the frame list"
+    bl_options = {'REGISTER'}
+
+    _plan = None  # Plan built in invoke, shown in the dialog (draw runs on every redraw)
+    _output_folder = ""
+
+    def invoke(self, context, event):
+        global filename_pattern
+        scene = context.scene
+
+        try:
+            frame_numbers = parse_frame_list(scene.frh_frame_list.strip())
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        if not frame_numbers:
+            self.report({'ERROR'}, "Please enter frame numbers")
+            return {'CANCELLED'}
+
+        render_targets = get_render_targets(scene, scene.frh_camera_mode, scene.frh_view_layer_mode, context.selected_objects)
+        if not render_targets:
+            self.report({'ERROR'}, "No camera selected or no view layer enabled")
+            return {'CANCELLED'}
+
+        # Expanding every output path and listing the folders is too slow to repeat in draw()
+        output_folder = get_output_folder()
+        RENDER_OT_preflight_batch._output_folder = output_folder
+        RENDER_OT_preflight_batch._plan = build_batch_plan(
+            scene, frame_numbers, get_selected_channels(scene), filename_pattern, output_folder, OutputSharding.from_scene(scene), render_targets
+        )
+        return context.window_manager.invoke_props_dialog(self, width=450)
+
+    def draw(self, context):
+        layout = self.layout
+        plan = RENDER_OT_preflight_batch._plan
+        if not plan:
+            return
+
+        box = layout.box()
+        box.label(text=f"Output Folder: {RENDER_OT_preflight_batch._output_folder}", icon='FOLDER_REDIRECT')
+        for line in plan.summary_lines():
+            box.label(text=line, icon='INFO')
+        if plan.outputs:
+            box.label(text=f"First: {os.path.basename(plan.outputs[0][2])}", icon='FILE_IMAGE')
+            box.label(text=f"Last: {os.path.basename(plan.outputs[-1][2])}", icon='FILE_IMAGE')
+
+        if plan.errors or plan.warnings:
+            problem_box = layout.box()
+            for error in plan.errors:
+                row = problem_box.row()
+                row.alert = True
+                row.label(text=error, icon='ERROR')
+            for warning in plan.warnings:
+                problem_box.label(text=warning, icon='QUESTION')
+        else:
+            layout.label(text="No problems found", icon='CHECKMARK')
+
+    def execute(self, context):
+        return {'FINISHED'}
+
+
+class RENDER_OT_render_catalog(Operator):
+    """Show what the render catalog knows about the output folder"""
+    bl_idname = "render.render_catalog"
+    bl_label = "Render Catalog"
+    bl_description = "Show the renders recorded in the output folder: current frame, missing frames per channel and slowest frames"
+    bl_options = {'REGISTER'}
+
+    _report = None  # Catalog summary built in invoke, shown in the dialog (draw runs on every redraw)
+
+    def invoke(self, context, event):
+        scene = context.scene
+        output_folder = get_output_folder()
+        report = {"output_folder": output_folder, "frame": scene.frame_current}
+
+        catalog = open_render_catalog(output_folder, create=False)
+        if catalog:
+            with catalog:
+                report["count"] = catalog.count()
+                # Latest render per channel for the current frame
+                report["latest"] = catalog.latest_by_channel(scene.frame_current)
+                # Frames of the frame list still missing per channel (with the current render settings)
+                frame_numbers = parse_frame_list(scene.frh_frame_list, strict=False)
+                if frame_numbers:
+                    fingerprint = get_settings_fingerprint(scene)
+                    report["missing"] = [
+                        (channel_name, catalog.missing_frames(frame_numbers, channel_name, fingerprint))
+                        for channel_name, _ in get_selected_channels(scene)
+                    ]
+                report["slowest"] = catalog.slowest()
+        RENDER_OT_render_catalog._report = report
+        return context.window_manager.invoke_props_dialog(self, width=450)
+
+    def draw(self, context):
+        layout = self.layout
+        report = RENDER_OT_render_catalog._report
+        if not report:
+            return
+        output_folder = report["output_folder"]
+
+        if "count" not in report:
+            layout.label(text="No render catalog in the output folder yet", icon='INFO')
+            layout.label(text=output_folder)
+            return
+
+        layout.label(text=f"{report['count']} render(s) recorded in {output_folder}", icon='FILE_IMAGE')
+
+        box = layout.box()
+        box.label(text=f"Frame {report['frame']}:", icon='TIME')
+        for channel_name, path in report["latest"].items():
+            box.label(text=f"{channel_name}: {os.path.basename(path)}")
+        if not report["latest"]:
+            box.label(text="Not rendered")
+
+        if report.get("missing"):
+            box = layout.box()
+            box.label(text="Missing from frame list (current settings):", icon='ERROR')
+            for channel_name, missing in report["missing"]:
+                text = ", ".join(str(frame) for frame in missing[:15]) + (" ..." if len(missing) > 15 else "")
+                box.label(text=f"{channel_name}: {text or 'complete'}")
+
+        # Slowest renders
+        if report["slowest"]:
+            box = layout.box()
+            box.label(text="Slowest renders:", icon='SORTTIME')
+            for frame_num, channel_name, duration in report["slowest"]:
+                box.label(text=f"Frame {frame_num} - {channel_name}: {format_duration(duration)}")
+
+    def execute(self, context):
+        return {'FINISHED'}
+
+
+class RENDER_OT_check_output_folder(Operator):
+    """Check the output folder for missing frames and broken image files"""
+    bl_idname = "render.check_output_folder"
+    bl_label = "Check Output Folder"
+    bl_description = "Check the output folder against the frame list and enabled channels: missing outputs, empty, truncated or corrupt images"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    queue_gaps: BoolProperty(
+        name="Queue Gaps in Frame List",
+        description="Replace the frame list with the frames that are missing or broken",
+        default=True
+    )
+
+    _report = None  # Result of the last check, shown in the dialog
+
+    def invoke(self, context, event):
+        global filename_pattern
+        scene = context.scene
+        output_folder = get_output_folder()
+        if not os.path.isdir(output_folder):
+            self.report({'ERROR'}, f"Output folder does not exist: {output_folder}")
+            return {'CANCELLED'}
+
+        # Frame list, or the scene frame range when empty
+        try:
+            frame_numbers = parse_frame_list(scene.frh_frame_list.strip())
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        if not frame_numbers:
+            frame_numbers = list(range(scene.frame_start, scene.frame_end + 1))
+        render_targets = get_render_targets(scene, scene.frh_camera_mode, scene.frh_view_layer_mode, context.selected_objects)
+        if not render_targets:
+            self.report({'ERROR'}, "No camera selected or no view layer enabled")
+            return {'CANCELLED'}
+
+        # Index the folder with the filename pattern once, knowing every camera and view layer of the batch
+        # (no camera: the scene camera of each frame, which markers can switch)
+        cameras = {camera_name for camera_name, _, _ in render_targets if camera_name}
+        if any(camera_name is None for camera_name, _, _ in render_targets):
+            cameras.update(marker.camera.name for marker in scene.timeline_markers if marker.camera)
+            if scene.camera:
+                cameras.add(scene.camera.name)
+        known_values = {
+            "FileName": get_blend_name(),
+            "Camera": cameras,
+            "ViewLayer": {view_layer_name for _, view_layer_name, _ in render_targets},
+        }
+        folder_index = OutputFolderIndex(output_folder, filename_pattern, OutputSharding.from_scene(scene), known_values)
+
+        # Check each camera/view layer against its own files and channels, validating the files in a worker pool
+        reports = []
+        for camera_name, view_layer_name, target_channels in render_targets:
+            wanted = {"view_layer": view_layer_name.translate(INVALID_FILENAME_CHARS)}
+            if camera_name:
+                wanted["camera"] = camera_name.translate(INVALID_FILENAME_CHARS)
+            entries = [
+                (entry["frame"], entry["channel"], entry["path"])
+                for entry in folder_index.entries
+                if "frame" in entry and all(entry.get(key, value) == value for key, value in wanted.items())
+            ]
+            target_report = check_renders.check_output(entries, frame_numbers, [channel_name for channel_name, _ in target_channels])
+            if len(render_targets) > 1:
+                # Name the camera and view layer in the channel column
+                label = f"{camera_name or 'scene camera'} / {view_layer_name}"
+                target_report["missing"] = [(frame, f"{channel} ({label})") for frame, channel in target_report["missing"]]
+                target_report["broken"] = [(frame, f"{channel} ({label})", *rest) for frame, channel, *rest in target_report["broken"]]
+            reports.append(target_report)
+        report = check_renders.merge_reports(reports)
+        RENDER_OT_check_output_folder._report = report
+
+        print("\n" + "=" * 60)
+        print("🔍 OUTPUT FOLDER CHECK")
+        print(f"📁 {output_folder}")
+        print(f"✓ Checked {report['checked_files']} file(s), expected {report['expected']} output(s)")
+        for frame_num, channel_name in report["missing"]:
+            print(f"❌ Missing: frame {frame_num} - {channel_name}")
+        for frame_num, channel_name, path, status, message in report["broken"]:
+            print(f"❌ {status.capitalize()}: frame {frame_num} - {channel_name}: {path} ({message})")
+        if folder_index.unmatched:
+            print(f"ℹ️ {len(folder_index.unmatched)} image(s) don't match the filename pattern and were ignored")
+        print("=" * 60 + "\n")
+
+        self.queue_gaps = bool(report["gap_frames"])
+        return context.window_manager.invoke_props_dialog(self, width=450)
+
+    def draw(self, context):
+        layout = self.layout
+        report = RENDER_OT_check_output_folder._report
+        if not report:
+            return
+
+        box = layout.box()
+        box.label(text=f"Checked {report['checked_files']} file(s), expected {report['expected']} output(s)", icon='INFO')
+        if not report["gap_frames"]:
+            box.label(text="All outputs present and readable", icon='CHECKMARK')
+            return
+
+        if report["missing"]:
+            row = box.row()
+            row.alert = True
+            row.label(text=f"{len(report['missing'])} missing output(s)", icon='ERROR')
+        for frame_num, channel_name, path, status, message in report["broken"][:10]:
+            row = box.row()
+            row.alert = True
+            row.label(text=f"Frame {frame_num} - {channel_name}: {message}", icon='ERROR')
+        if len(report["broken"]) > 10:
+            box.label(text=f"... and {len(report['broken']) - 10} more broken file(s) (see console)")
+
+        gap_spec = check_renders.format_frame_spec(report["gap_frames"])
+        layout.label(text=f"Frames to re-render: {gap_spec if len(gap_spec) <= 60 else gap_spec[:57] + '...'}")
+        layout.prop(self, "queue_gaps")
+
+    def execute(self, context):
+        report = RENDER_OT_check_output_folder._report
+        if report and report["gap_frames"] and self.queue_gaps:
+            context.scene.frh_frame_list = check_renders.format_frame_spec(report["gap_frames"])
+            self.report({'INFO'}, f"Queued {len(report['gap_frames'])} frame(s) to re-render in the frame list")
+        return {'FINISHED'}
+
+
 class RENDER_OT_current_frame(Operator):
     """Render the current frame to the configured output folder"""
     bl_idname = "render.current_frame"
@@ -1401,27 +4252,15 @@ class RENDER_OT_current_frame(Operator):
             format_switched = False
 
             # Determine output folder
-            blend_filepath = bpy.data.filepath
-            if output_folder_path.strip():
-                output_folder = bpy.path.abspath(output_folder_path.strip())
-                os.makedirs(output_folder, exist_ok=True)
-            else:
-                if blend_filepath:
-                    output_folder = os.path.dirname(bpy.path.abspath(blend_filepath))
-                else:
-                    output_folder = os.getcwd()
+            output_folder = get_output_folder(create=True)
 
             # Determine blend name and frame
-            if blend_filepath:
-                blend_name = os.path.splitext(os.path.basename(blend_filepath))[0]
-            else:
-                blend_name = "untitled"
+            blend_name = get_blend_name()
             frame_num = scene.frame_current
 
             # File extension from render format
             # Ensure an image-capable format
-            disallowed_formats = {"FFMPEG", "AVI_JPEG", "AVI_RAW", "FRAMESERVER"}
-            if original_format in disallowed_formats:
+            if original_format in DISALLOWED_STILL_FORMATS:
                 try:
                     render.image_settings.file_format = 'PNG'
                     format_switched = True
@@ -1429,17 +4268,7 @@ class RENDER_OT_current_frame(Operator):
                 except Exception as e:
                     self.report({'WARNING'}, f"Could not switch format from {original_format}; output may not save correctly: {e}")
 
-            fmt = render.image_settings.file_format.lower()
-            if fmt == 'png':
-                extension = '.png'
-            elif fmt == 'jpeg':
-                extension = '.jpg'
-            elif fmt == 'tiff':
-                extension = '.tif'
-            elif fmt == 'exr':
-                extension = '.exr'
-            else:
-                extension = '.png'
+            extension = get_file_extension(render.image_settings.file_format)
 
             # Get camera name
             camera_name = "NoCamera"
@@ -1464,6 +4293,8 @@ class RENDER_OT_current_frame(Operator):
             from datetime import datetime
             batch_start_time = datetime.now()  # For current frame, batch start is when user clicks render
             saved_paths = []
+            catalog = open_render_catalog(output_folder)
+            settings_fingerprint = get_settings_fingerprint(scene)
 
             # Perform single render without compositor manipulation
             render_start = datetime.now()
@@ -1484,47 +4315,49 @@ class RENDER_OT_current_frame(Operator):
 
             # Now save each channel from the single render result
             for channel_name, pass_name in selected_channels:
-                # Generate filename for this channel - only use channel name if pattern contains (Channel) token
-                if "(Channel)" in filename_pattern or len(selected_channels) > 1:
-                    # Use channel name in filename
-                    filename = generate_filename_from_pattern(
-                        filename_pattern,
-                        blend_name,
-                        camera_name,
-                        frame_num,
-                        start_time=render_start,
-                        end_time=render_end,
-                        channel_name=channel_name,
-                        view_layer_name=view_layer_name,
-                        batch_start_time=batch_start_time,
-                        render_duration_seconds=render_duration
-                    )
-                else:
-                    # Don't use channel name - for single Combined pass without (Channel) token
-                    filename = generate_filename_from_pattern(
-                        filename_pattern,
-                        blend_name,
-                        camera_name,
-                        frame_num,
-                        start_time=render_start,
-                        end_time=render_end,
-                        channel_name=None,  # This will default to "Combined" but won't be used
-                        view_layer_name=view_layer_name,
-                        batch_start_time=batch_start_time,
-                        render_duration_seconds=render_duration
-                    )
+                # Generate filename for this channel - channel name only used if pattern contains (Channel) token
+                filename = generate_filename_from_pattern(
+                    filename_pattern,
+                    blend_name,
+                    camera_name,
+                    frame_num,
+                    start_time=render_start,
+                    end_time=render_end,
+                    channel_name=channel_name,
+                    view_layer_name=view_layer_name,
+                    batch_start_time=batch_start_time,
+                    render_duration_seconds=render_duration
+                )
                 
-                full_output_path = os.path.join(output_folder, filename + extension)
+                full_output_path = resolve_output_path(
+                    output_folder, filename, extension, OutputSharding.from_scene(scene),
+                    frame_num, channel_name, batch_start_time, create=True
+                )
 
                 # Save this specific pass from the render result (no re-rendering needed)
-                success = save_render_pass(scene, channel_name, pass_name, full_output_path)
+                # Written under a temporary name first so the final file only appears when complete
+                staged_path = get_staging_path(output_folder, frame_num, channel_name, camera_name, view_layer_name) + extension
+                success = save_render_pass(scene, channel_name, pass_name, staged_path)
+                success = success and os.path.exists(staged_path) and commit_staged_file(staged_path, full_output_path)
                 
-                if success and os.path.exists(full_output_path):
+                if success:
                     saved_paths.append(full_output_path)
                     print(f"✓ Saved {channel_name} to: {full_output_path}")
+                    try:
+                        if catalog:
+                            catalog.record(
+                                full_output_path, frame_num, channel_name, camera=camera_name, view_layer=view_layer_name,
+                                blend=blend_name, duration=render_duration, started=render_start, finished=render_end,
+                                batch_started=batch_start_time, fingerprint=settings_fingerprint
+                            )
+                    except sqlite3.Error as e:
+                        print(f"⚠️ Could not record {channel_name} in render catalog: {e}")
                 else:
                     print(f"❌ Failed to save {channel_name} to: {full_output_path}")
 
+            if catalog:
+                catalog.close()
+
             # Restore original filepath and format
             render.filepath = original_filepath
             if format_switched:
@@ -1540,9 +4373,217 @@ class RENDER_OT_current_frame(Operator):
                 self.report({'WARNING'}, "Render completed but could not confirm output files")
                 return {'FINISHED'}
 
-        except Exception as e:
-            self.report({'ERROR'}, f"Error rendering current frame: {str(e)}")
-            return {'CANCELLED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Error rendering current frame: {str(e)}")
+            return {'CANCELLED'}
+
+
+class RENDER_OT_tiled_frame(Operator):
+    """Render the current frame as border tiles in parallel background Blender workers"""
+    bl_idname = "render.tiled_frame"
+    bl_label = "Render Tiled Frame"
+    bl_description = "Split the current frame into border tiles, render them in background Blender workers and stitch every pass"
+    bl_options = {'REGISTER'}
+
+    tiles_x: IntProperty(
+        name="Tiles X",
+        description="Number of tile columns",
+        default=4,
+        min=1,
+        max=64
+    )
+
+    tiles_y: IntProperty(
+        name="Tiles Y",
+        description="Number of tile rows",
+        default=4,
+        min=1,
+        max=64
+    )
+
+    workers: IntProperty(
+        name="Local Workers",
+        description="Background Blender processes on this machine. 0 waits for farm workers started on the job folder",
+        default=2,
+        min=0,
+        max=64
+    )
+
+    _timer = None
+    _processes = []
+    _job_folder = ""
+    _job = None
+    _channels = []
+    _start_time = None
+
+    def execute(self, context):
+        scene = context.scene
+        render = scene.render
+        blender = bpy.app.binary_path
+        if self.workers and not blender:
+            self.report({'ERROR'}, "Blender executable not found for background workers")
+            return {'CANCELLED'}
+
+        # Tiles are composited one by one, effects reading neighbouring pixels would show seams
+        seam_nodes = render_tiles.find_non_pointwise_nodes(scene)
+        if seam_nodes:
+            self.report({'ERROR'}, f"Compositor nodes would leave seams between tiles: {', '.join(seam_nodes[:5])}{'...' if len(seam_nodes) > 5 else ''}. Mute them or render the frame normally")
+            return {'CANCELLED'}
+        seam_effects = render_tiles.find_screen_space_effects(scene)
+        if seam_effects:
+            self.report({'ERROR'}, f"{', '.join(seam_effects)} would leave seams between tiles. Render the frame normally or use Cycles")
+            return {'CANCELLED'}
+        if render_tiles.uses_render_denoising(scene):
+            self.report({'WARNING'}, "Cycles denoising is off for the tiles (it would leave seams): raise the samples or denoise the stitched image")
+
+        # Job folder next to the outputs, so farm nodes sharing the output folder can join
+        from datetime import datetime
+        self._start_time = datetime.now()
+        frame_num = scene.frame_current
+        output_folder = get_output_folder(create=True)
+        self._job_folder = os.path.join(output_folder, f"{TILE_JOB_PREFIX}{frame_num:04d}_{self._start_time:%Y%m%d_%H%M%S}")
+        os.makedirs(self._job_folder, exist_ok=True)
+
+        # Workers render from a copy, the artist can keep editing this file
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.join(self._job_folder, render_tiles.JOB_BLEND_FILENAME), copy=True)
+
+        self._channels = get_selected_channels(scene)
+        passes = {
+            channel_name: render_tiles.COMBINED_SOCKET if channel_name == 'Combined' else PASS_SOCKET_NAMES.get(channel_name, channel_name)
+            for channel_name, _ in self._channels
+        }
+        width = render.resolution_x * render.resolution_percentage // 100
+        height = render.resolution_y * render.resolution_percentage // 100
+        tiles = render_tiles.plan_tiles(width, height, self.tiles_x, self.tiles_y)
+        view_layer_name = scene.view_layers[0].name if scene.view_layers else "ViewLayer"
+        self._job = render_tiles.create_job(self._job_folder, frame_num, width, height, tiles, passes, view_layer_name)
+
+        # Each worker gets its share of the CPU threads
+        threads = max(1, (os.cpu_count() or 1) // self.workers) if self.workers else 0
+        self._processes = render_tiles.launch_workers(blender, self._job_folder, self.workers, threads) if self.workers else []
+
+        print("\n" + "=" * 60)
+        print("🧩 TILED RENDER")
+        print(f"🧭 Frame: {frame_num} ({width}x{height})")
+        print(f"🔲 Tiles: {len(tiles)} ({self.tiles_x}x{self.tiles_y})")
+        print(f"🎭 Channels: {list(passes)}")
+        print(f"⚙️  Local workers: {self.workers} ({threads} threads each)")
+        print(f"📁 Job folder: {self._job_folder}")
+        print("💡 Farm nodes can join with:")
+        print(f"   blender -b \"{os.path.join(self._job_folder, render_tiles.JOB_BLEND_FILENAME)}\" --python \"{render_tiles.__file__}\" -- --job \"{os.path.join(self._job_folder, render_tiles.JOB_FILENAME)}\"")
+        print("=" * 60 + "\n")
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.5, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, f"Rendering {len(tiles)} tiles of frame {frame_num}, press ESC to cancel")
+        return {'RUNNING_MODAL'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self, width=300)
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            for process in self._processes:
+                process.terminate()
+            self.release_local_claims()
+            return self.finish(context, f"Tiled render cancelled, job kept in {self._job_folder}", {'WARNING'})
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        done, claimed, open_tiles = render_tiles.get_job_status(self._job_folder, self._job)
+        total = len(self._job["tiles"])
+        context.workspace.status_text_set(f"Tiled render: {len(done)}/{total} tiles done")
+        if len(done) < total:
+            # Local workers gone with tiles left: only farm workers could finish the job now
+            if self._processes and all(process.poll() is not None for process in self._processes):
+                self.release_local_claims()
+                return self.finish(context, f"{total - len(done)} tile(s) not rendered, job kept in {self._job_folder}", {'ERROR'})
+            return {'PASS_THROUGH'}
+
+        try:
+            saved_paths = self.save_stitched_outputs(context)
+        except Exception as e:
+            return self.finish(context, f"Could not stitch tiles: {e}", {'ERROR'})
+        shutil.rmtree(self._job_folder, ignore_errors=True)
+        return self.finish(context, f"Saved {len(saved_paths)} channel(s) stitched from {total} tiles", {'INFO'})
+
+    def release_local_claims(self):
+        """Free the tiles the local workers claimed but didn't finish, so the kept job can be resumed"""
+        import subprocess
+        for process in self._processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        owners = {render_tiles.get_claim_owner(process.pid) for process in self._processes}
+        released = render_tiles.release_claims(self._job_folder, self._job, owners)
+        if released:
+            print(f"🧩 Released {released} unfinished tile(s) for workers joining the job later")
+
+    def save_stitched_outputs(self, context):
+        """Stitch each pass with NumPy and save it under its pattern name"""
+        global filename_pattern
+        from datetime import datetime
+        scene = context.scene
+        render_end = datetime.now()
+        render_duration = (render_end - self._start_time).total_seconds()
+        output_folder = get_output_folder(create=True)
+        extension = get_file_extension(scene.render.image_settings.file_format)
+        camera_name = scene.camera.name if scene.camera else "NoCamera"
+        frame_num = self._job["frame"]
+
+        saved_paths = []
+        catalog = open_render_catalog(output_folder)
+        try:
+            for channel_name, _ in self._channels:
+                pixels = render_tiles.stitch_pass(self._job_folder, self._job, channel_name)
+                image = bpy.data.images.new(f"_frh_tiled_{channel_name}", self._job["width"], self._job["height"], alpha=True, float_buffer=True)
+                try:
+                    image.pixels.foreach_set(pixels.ravel())
+                    filename = generate_filename_from_pattern(
+                        filename_pattern,
+                        get_blend_name(),
+                        camera_name,
+                        frame_num,
+                        start_time=self._start_time,
+                        end_time=render_end,
+                        channel_name=channel_name,
+                        view_layer_name=self._job["view_layer"],
+                        batch_start_time=self._start_time,
+                        render_duration_seconds=render_duration
+                    )
+                    full_output_path = resolve_output_path(
+                        output_folder, filename, extension, OutputSharding.from_scene(scene),
+                        frame_num, channel_name, self._start_time, create=True
+                    )
+                    # Saved with the scene's output format and color management, like a render
+                    staged_path = get_staging_path(output_folder, frame_num, channel_name, camera_name, self._job["view_layer"]) + extension
+                    image.save_render(filepath=staged_path, scene=scene)
+                finally:
+                    bpy.data.images.remove(image)
+                if commit_staged_file(staged_path, full_output_path):
+                    saved_paths.append(full_output_path)
+                    print(f"✓ Saved {channel_name} to: {full_output_path}")
+                    if catalog:
+                        catalog.record(
+                            full_output_path, frame_num, channel_name, camera=camera_name, view_layer=self._job["view_layer"],
+                            blend=get_blend_name(), duration=render_duration, started=self._start_time, finished=render_end,
+                            batch_started=self._start_time, fingerprint=get_settings_fingerprint(scene)
+                        )
+        finally:
+            if catalog:
+                catalog.close()
+        return saved_paths
+
+    def finish(self, context, message, level):
+        context.window_manager.event_timer_remove(self._timer)
+        context.workspace.status_text_set(None)
+        print(f"{'✅' if level == {'INFO'} else '⚠️ '} {message}")
+        self.report(level, message)
+        return {'FINISHED'} if level == {'INFO'} else {'CANCELLED'}
 
 
 class RENDER_OT_browse_output_folder(Operator):
@@ -1553,18 +4594,9 @@ class RENDER_OT_browse_output_folder(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        global output_folder_path
         try:
-            blend_filepath = bpy.data.filepath
-            
             # Determine output folder
-            if output_folder_path.strip():
-                folder_to_open = bpy.path.abspath(output_folder_path.strip())
-            else:
-                if blend_filepath:
-                    folder_to_open = os.path.dirname(bpy.path.abspath(blend_filepath))
-                else:
-                    folder_to_open = os.getcwd()
+            folder_to_open = get_output_folder()
 
             # Check if folder exists
             if not os.path.exists(folder_to_open):
@@ -1604,19 +4636,11 @@ class RENDER_OT_open_output_folder(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        global output_folder_path
         try:
             scene = context.scene
-            blend_filepath = bpy.data.filepath
             
             # Determine output folder
-            if output_folder_path.strip():
-                folder_to_open = bpy.path.abspath(output_folder_path.strip())
-            else:
-                if blend_filepath:
-                    folder_to_open = os.path.dirname(bpy.path.abspath(blend_filepath))
-                else:
-                    folder_to_open = os.getcwd()
+            folder_to_open = get_output_folder()
 
             # Check if folder exists
             if not os.path.exists(folder_to_open):
@@ -1624,10 +4648,7 @@ class RENDER_OT_open_output_folder(Operator):
                 return {'CANCELLED'}
 
             # Get current frame file info for better user feedback
-            if blend_filepath:
-                blend_name = os.path.splitext(os.path.basename(blend_filepath))[0]
-            else:
-                blend_name = "untitled"
+            blend_name = get_blend_name()
             
             frame_num = scene.frame_current
             camera_name = "NoCamera"
@@ -1638,17 +4659,7 @@ class RENDER_OT_open_output_folder(Operator):
             view_layer_name = scene.view_layers[0].name if scene.view_layers else "ViewLayer"
 
             # Determine file extension from render settings
-            fmt = scene.render.image_settings.file_format.lower()
-            if fmt == 'png':
-                extension = '.png'
-            elif fmt == 'jpeg':
-                extension = '.jpg'
-            elif fmt == 'tiff':
-                extension = '.tif'
-            elif fmt == 'exr':
-                extension = '.exr'
-            else:
-                extension = '.png'
+            extension = get_file_extension(scene.render.image_settings.file_format)
 
             # Generate expected filename using the current pattern
             from datetime import datetime
@@ -1663,38 +4674,46 @@ class RENDER_OT_open_output_folder(Operator):
                 view_layer_name=view_layer_name
             )
             expected_filename = expected_filename_base + extension
-            expected_filepath = os.path.join(folder_to_open, expected_filename)
 
             # Console info
             print("\n" + "=" * 60)
             print("�️  OPENING RENDERED FRAME RESULT")
             print(f"Current timeline frame: {frame_num}")
             print(f"Looking for file: {expected_filename}")
-            print(f"Full path: {expected_filepath}")
-            
-            # Check if the rendered file exists
-            if not os.path.exists(expected_filepath):
-                # Try alternative extensions/formats that might exist
-                alternative_files = []
-                base_name = expected_filename_base  # Use the pattern-generated base name
-                common_extensions = ['.png', '.jpg', '.jpeg', '.tif', '.tiff', '.exr', '.bmp']
-                
-                for ext in common_extensions:
-                    alt_path = os.path.join(folder_to_open, base_name + ext)
-                    if os.path.exists(alt_path):
-                        alternative_files.append(alt_path)
-                
-                if alternative_files:
-                    expected_filepath = alternative_files[0]  # Use the first found file
-                    expected_filename = os.path.basename(expected_filepath)
-                    print(f"✓ Found alternative: {expected_filename}")
-                else:
-                    print(f"❌ File not found: {expected_filename}")
-                    print("=" * 60 + "\n")
-                    self.report({'ERROR'}, f"Rendered frame not found: {expected_filename}. Please render frame {frame_num} first.")
-                    return {'CANCELLED'}
-            else:
-                print(f"✓ File exists: {expected_filename}")
+            print(f"Output folder: {folder_to_open}")
+            
+            # Latest Combined render of this frame from the catalog (no filename guessing needed)
+            expected_filepath = None
+            catalog = open_render_catalog(folder_to_open, create=False)
+            if catalog:
+                with catalog:
+                    expected_filepath = catalog.latest(frame_num, FILENAME_TOKENS["Channel"])
+                if expected_filepath:
+                    print("✓ Found in render catalog")
+            
+            # Without a catalog entry: look in the shard subfolder (newest batch first), then try alternative extensions/formats
+            sharding = OutputSharding.from_scene(scene)
+            if not expected_filepath:
+                extensions = [extension] + [ext for ext in IMAGE_EXTENSIONS if ext != extension]
+                expected_filepath = find_output_file(
+                    folder_to_open, expected_filename_base, extensions,
+                    sharding, frame_num, FILENAME_TOKENS["Channel"]
+                )
+            
+            # Names with other dates/cameras (older batches, other machines): parse the folder with the pattern
+            if not expected_filepath:
+                known_values = {"FileName": blend_name, "Camera": camera_name, "ViewLayer": view_layer_name}
+                folder_index = OutputFolderIndex(folder_to_open, filename_pattern, sharding, known_values)
+                expected_filepath = folder_index.find(frame_num, FILENAME_TOKENS["Channel"])
+                if expected_filepath:
+                    print("✓ Found by parsing filenames in the output folder")
+            if not expected_filepath:
+                print(f"❌ File not found: {expected_filename}")
+                print("=" * 60 + "\n")
+                self.report({'ERROR'}, f"Rendered frame not found: {expected_filename}. Please render frame {frame_num} first.")
+                return {'CANCELLED'}
+            expected_filename = os.path.basename(expected_filepath)
+            print(f"✓ File exists: {expected_filepath}")
             
             print("=" * 60 + "\n")
 
@@ -2049,6 +5068,694 @@ def viewport_header_draw(self, context):
             row.prop(context.scene, "frh_camera_keyframe", text="", icon='DECORATE_KEYFRAME', toggle=True)
 
 
+# ---------------------------------------------------------------------------
+# Keyframe index
+# ---------------------------------------------------------------------------
+# Scanning every fcurve of every action on each click of the keyframe icon gets
+# slow on heavy scenes, so keyframes are cached per (action, slot). Entries are
+# dropped from the depsgraph handler when an action is edited, and can
+# optionally be stored in the blend file so the index is warm right after load.
+
+# (action name, slot identifier) -> frozenset of keyframe frame numbers
+# Non-action sources such as Grease Pencil layer frames use "Type:name" keys
+_keyframe_index = {}
+
+KEYFRAME_INDEX_PROPERTY = "frh_keyframe_index"
+
+
+def iter_slot_fcurves(action, slot):
+    """Yield all FCurves in this action that belong to the given slot."""
+    if not action:
+        return
+
+    # Layered actions path (5.0+)
+    if hasattr(action, "layers"):
+        for layer in action.layers:
+            for strip in layer.strips:
+                # Only keyframe strips store fcurves
+                if strip.type != 'KEYFRAME':
+                    continue
+
+                # If slot is provided, get channelbag for this slot
+                if slot:
+                    try:
+                        cb = strip.channelbag(slot, ensure=False)
+                        if cb:
+                            for fc in cb.fcurves:
+                                yield fc
+                    except Exception:
+                        # Fallback: iterate all channelbags on the strip and match by slot
+                        for bag in strip.channelbags:
+                            if bag.slot == slot:
+                                for fc in bag.fcurves:
+                                    yield fc
+                else:
+                    # No slot provided, iterate all channelbags
+                    for bag in strip.channelbags:
+                        for fc in bag.fcurves:
+                            yield fc
+
+    # Legacy fallback (Blender 4.x and earlier)
+    else:
+        fcurves = getattr(action, "fcurves", [])
+        for fc in fcurves:
+            yield fc
+
+
+def iter_action_fcurves(action, slot):
+    """Yield the FCurves used for keyframe detection, handling both Blender 4.x and 5.0"""
+    # Try Blender 4.x style first - direct fcurves access
+    if hasattr(action, 'fcurves') and not callable(action.fcurves):
+        try:
+            if len(action.fcurves) > 0:
+                yield from action.fcurves
+                return
+        except Exception as e:
+            print(f"    Failed to access fcurves directly: {e}")
+
+    # Blender 5.0 layered animation system with slots
+    if hasattr(action, "layers"):
+        yield from iter_slot_fcurves(action, slot)
+
+
+def get_keyframe_index_name(id_block):
+    """Get the name an ID is stored under in the keyframe index"""
+    name = getattr(id_block, "name_full", id_block.name)
+    if isinstance(id_block, bpy.types.Action):
+        return name
+    return f"{id_block.bl_rna.identifier}:{name}"
+
+
+def get_actions_by_index_name():
+    """Map keyframe index names to actions (linked actions are stored as "Name [library.blend]")"""
+    return {get_keyframe_index_name(action): action for action in bpy.data.actions}
+
+
+def get_keyframe_index_key(action, slot):
+    """Get the cache key for an action/slot pair"""
+    slot_name = getattr(slot, "identifier", "") if slot else ""
+    return (get_keyframe_index_name(action), slot_name)
+
+
+# Channel groups used for filtering keyframes by property
+CHANNEL_GROUPS = [
+    ('LOCATION', "Location", "Location and delta location channels"),
+    ('ROTATION', "Rotation", "Euler, quaternion and axis-angle rotation channels"),
+    ('SCALE', "Scale", "Scale and delta scale channels"),
+    ('CUSTOM', "Custom Properties", "Custom property channels"),
+    ('OTHER', "Other", "All other animated properties (materials, shape keys, camera, etc.)"),
+]
+
+# Matches fcurve data paths such as pose.bones["Arm.L"].rotation_quaternion
+BONE_DATA_PATH_PATTERN = re.compile(r'^pose\.bones\["((?:[^"\\]|\\.)*)"\]\.?(.*)$')
+
+
+def parse_fcurve_data_path(data_path):
+    """Split an fcurve data path into (bone name, property path), bone name is "" for non-bone channels"""
+    match = BONE_DATA_PATH_PATTERN.match(data_path)
+    if match:
+        return match.group(1).replace('\\"', '"'), match.group(2)
+    return "", data_path
+
+
+def classify_channel_property(property_path):
+    """Get the channel group (LOCATION, ROTATION, SCALE, CUSTOM, OTHER) of a property path"""
+    if property_path.startswith('["'):
+        return 'CUSTOM'
+    if property_path in {"location", "delta_location"}:
+        return 'LOCATION'
+    if property_path.startswith(("rotation_", "delta_rotation_")):
+        return 'ROTATION'
+    if property_path in {"scale", "delta_scale"}:
+        return 'SCALE'
+    return 'OTHER'
+
+
+def get_custom_property_name(property_path):
+    """Get the name of a custom property path like ["my_prop"]"""
+    return property_path[2:-2] if property_path.startswith('["') else property_path
+
+
+# Keyframe types as shown in the Dope Sheet, stored as int8 codes in the index
+KEYFRAME_TYPES = [
+    ('KEYFRAME', "Keyframe", "Normal keyframes"),
+    ('BREAKDOWN', "Breakdown", "Breakdown keyframes"),
+    ('MOVING_HOLD', "Moving Hold", "Moving hold keyframes"),
+    ('EXTREME', "Extreme", "Extreme keyframes"),
+    ('JITTER', "Jitter", "Jitter keyframes"),
+    ('GENERATED', "Generated", "Keyframes generated by tools"),
+]
+KEYFRAME_TYPE_CODES = {item[0]: code for code, item in enumerate(KEYFRAME_TYPES)}
+
+
+class ActionKeyframeIndex:
+    """Keyframes of one action/slot, grouped by parsed fcurve data_path"""
+    __slots__ = ("frames", "channels", "keys", "by_bone", "by_group")
+
+    def __init__(self, keys):
+        # (bone name, property path, array index) -> (raw frames float64 array, keyframe type int8 array)
+        self.keys = keys
+        # (bone name, property path, array index) -> frozenset of rounded frames
+        self.channels = {}
+        self.by_bone = {}
+        self.by_group = {}
+        frames = set()
+        for key, (raw_frames, _) in keys.items():
+            channel_frames = frozenset(np.round(raw_frames).astype(int).tolist())
+            self.channels[key] = channel_frames
+            bone_name, property_path, _ = key
+            self.by_bone.setdefault(bone_name, []).append(key)
+            group = classify_channel_property(property_path)
+            self.by_group[group] = self.by_group.get(group, frozenset()) | channel_frames
+            frames.update(channel_frames)
+        self.frames = frozenset(frames)
+
+    def filter(self, channel_filter=None, raw=False):
+        """
+        Get frames for the channels matching a filter dict with optional keys:
+        bones (set of bone names), groups (set of channel groups), custom_properties (set of names),
+        key_types (set of keyframe types)
+        With raw, the unrounded key times are returned
+        """
+        channel_filter = channel_filter or {}
+        if not channel_filter and not raw:
+            return self.frames
+        bones = channel_filter.get("bones")
+        groups = channel_filter.get("groups")
+        custom_names = channel_filter.get("custom_properties")
+        key_types = channel_filter.get("key_types")
+
+        # Fast path: group filter only, answered from the per-group unions
+        if bones is None and not custom_names and key_types is None and not raw:
+            if groups is None:
+                return self.frames
+            frames = set()
+            for group in groups:
+                frames.update(self.by_group.get(group, ()))
+            return frames
+
+        # Only visit the channels of the requested bones
+        if bones is None:
+            keys = self.channels.keys()
+        else:
+            keys = [key for bone_name in bones for key in self.by_bone.get(bone_name, ())]
+
+        if key_types is not None:
+            wanted_codes = np.array([KEYFRAME_TYPE_CODES[key_type] for key_type in key_types], dtype=np.int8)
+
+        frames = set()
+        for key in keys:
+            property_path = key[1]
+            group = classify_channel_property(property_path)
+            if groups is not None and group not in groups:
+                continue
+            if group == 'CUSTOM' and custom_names and get_custom_property_name(property_path) not in custom_names:
+                continue
+            if key_types is None and not raw:
+                frames.update(self.channels[key])
+                continue
+            raw_frames, type_codes = self.keys[key]
+            if key_types is not None:
+                # Vectorised keyframe type filter on the raw key arrays
+                raw_frames = raw_frames[np.isin(type_codes, wanted_codes)]
+            frames.update(raw_frames.tolist() if raw else np.round(raw_frames).astype(int).tolist())
+        return frames
+
+
+@functools.lru_cache(maxsize=1)
+def get_keyframe_type_lookup():
+    """Array mapping Blender's keyframe type enum values to KEYFRAME_TYPE_CODES"""
+    enum_items = bpy.types.Keyframe.bl_rna.properties["type"].enum_items
+    lookup = np.zeros(max(item.value for item in enum_items) + 1, dtype=np.int8)
+    for item in enum_items:
+        lookup[item.value] = KEYFRAME_TYPE_CODES.get(item.identifier, 0)
+    return lookup
+
+
+def read_fcurve_keys(fcurve):
+    """Read an fcurve's key frames and keyframe types into NumPy arrays"""
+    points = fcurve.keyframe_points
+    count = len(points)
+    co = np.empty(count * 2, dtype=np.float32)
+    points.foreach_get("co", co)
+    # Enum values in bulk, mapped to the index codes with one lookup
+    type_values = np.empty(count, dtype=np.int32)
+    points.foreach_get("type", type_values)
+    lookup = get_keyframe_type_lookup()
+    type_codes = lookup[np.clip(type_values, 0, len(lookup) - 1)]
+    return co[0::2].astype(np.float64), type_codes
+
+
+def scan_action_keyframes(action, slot):
+    """Read an action's keyframes into an ActionKeyframeIndex without using the cache"""
+    keys = {}
+    try:
+        for fcurve in iter_action_fcurves(action, slot):
+            raw_frames, type_codes = read_fcurve_keys(fcurve)
+            bone_name, property_path = parse_fcurve_data_path(fcurve.data_path)
+            key = (bone_name, property_path, fcurve.array_index)
+            if key in keys:
+                # Same channel in several layers/strips
+                raw_frames = np.concatenate([keys[key][0], raw_frames])
+                type_codes = np.concatenate([keys[key][1], type_codes])
+            keys[key] = (raw_frames, type_codes)
+    except Exception as e:
+        print(f"    Error reading keyframes from action '{action.name}': {e}")
+    return ActionKeyframeIndex(keys)
+
+
+def cluster_keyframes(frames, tolerance=0, max_frames=0):
+    """
+    Merge key times within tolerance frames of a cluster's first key into that key (where the
+    pose is reached), then cap to max_frames evenly spread frames
+    Takes raw key times, only the representatives are rounded to frame numbers
+    """
+    frames = np.unique(np.asarray(list(frames), dtype=np.float64))
+    if len(frames) == 0:
+        return []
+
+    if tolerance > 0:
+        # A cluster spans at most tolerance frames from its first key, so evenly spaced
+        # keys don't chain into one cluster
+        representatives = []
+        start = 0
+        while start < len(frames):
+            representatives.append(frames[start])
+            start = int(np.searchsorted(frames, frames[start] + tolerance, side='right'))
+        frames = np.asarray(representatives)
+    frames = np.unique(np.round(frames).astype(np.int64))
+
+    if max_frames > 0 and len(frames) > max_frames:
+        # Even spread over the clusters, always keeping the first and last
+        picks = np.unique(np.round(np.linspace(0, len(frames) - 1, max_frames)).astype(np.int64))
+        frames = frames[picks]
+
+    return frames.tolist()
+
+
+def get_action_index(action, slot=None):
+    """Get the ActionKeyframeIndex for an action/slot pair, scanning it on a cache miss"""
+    key = get_keyframe_index_key(action, slot)
+    entry = _keyframe_index.get(key)
+    if entry is None:
+        entry = scan_action_keyframes(action, slot)
+        _keyframe_index[key] = entry
+    return entry
+
+
+def get_action_keyframes(action, slot=None, channel_filter=None, raw=False):
+    """Get keyframe frame numbers (raw key times with raw) for an action/slot pair, using the keyframe index"""
+    return get_action_index(action, slot).filter(channel_filter, raw)
+
+
+def invalidate_keyframe_index(id_block=None):
+    """Drop cached keyframes for one action (or Grease Pencil), or the whole index if no ID is given"""
+    if id_block is None:
+        _keyframe_index.clear()
+        return
+    index_name = get_keyframe_index_name(id_block)
+    for key in [key for key in _keyframe_index if key[0] == index_name]:
+        del _keyframe_index[key]
+
+
+def get_action_signature(action, slot):
+    """Cheap fingerprint (fcurve count, key count) used to validate a stored index"""
+    fcurve_count = 0
+    key_count = 0
+    for fcurve in iter_action_fcurves(action, slot):
+        fcurve_count += 1
+        key_count += len(fcurve.keyframe_points)
+    return [fcurve_count, key_count]
+
+
+def find_action_slot(action, slot_identifier):
+    """Find an action slot by identifier (Blender 4.4+), None for legacy actions"""
+    if not slot_identifier:
+        return None
+    for slot in getattr(action, "slots", []):
+        if slot.identifier == slot_identifier:
+            return slot
+    return None
+
+
+def save_keyframe_index_to_scene(scene):
+    """Store the keyframe index in the scene's custom properties"""
+    entries = []
+    actions = get_actions_by_index_name()
+    for (action_name, slot_name), entry in _keyframe_index.items():
+        action = actions.get(action_name)
+        if not action:
+            continue
+        slot = find_action_slot(action, slot_name)
+        entries.append({
+            "action": action_name,
+            "slot": slot_name,
+            "signature": get_action_signature(action, slot),
+            "channels": [[*key, raw_frames.tolist(), type_codes.tolist()] for key, (raw_frames, type_codes) in entry.keys.items()],
+        })
+    scene[KEYFRAME_INDEX_PROPERTY] = json.dumps(entries)
+    print(f"Saved keyframe index to scene '{scene.name}' ({len(entries)} entries)")
+
+
+def load_keyframe_index_from_scene(scene):
+    """Restore keyframe index entries stored in the scene, skipping stale ones"""
+    if KEYFRAME_INDEX_PROPERTY not in scene:
+        return 0
+    try:
+        entries = json.loads(scene[KEYFRAME_INDEX_PROPERTY])
+    except Exception as e:
+        print(f"Could not read stored keyframe index: {e}")
+        return 0
+
+    loaded = 0
+    actions = get_actions_by_index_name()
+    for entry in entries:
+        action = actions.get(entry.get("action", ""))
+        if not action:
+            continue
+        slot = find_action_slot(action, entry.get("slot", ""))
+        # Skip entries whose action was edited without the add-on running
+        if get_action_signature(action, slot) != entry.get("signature"):
+            continue
+        keys = {
+            (bone_name, property_path, array_index): (np.array(raw_frames, dtype=np.float64), np.array(type_codes, dtype=np.int8))
+            for bone_name, property_path, array_index, raw_frames, type_codes in entry.get("channels", [])
+        }
+        _keyframe_index[get_keyframe_index_key(action, slot)] = ActionKeyframeIndex(keys)
+        loaded += 1
+    print(f"Loaded {loaded}/{len(entries)} keyframe index entries from scene '{scene.name}'")
+    return loaded
+
+
+# bpy.data collections whose datablocks can carry animation data
+ANIMATION_DATA_COLLECTIONS = (
+    "objects", "meshes", "curves", "metaballs", "lattices", "armatures",
+    "cameras", "lights", "lightprobes", "speakers", "volumes", "pointclouds",
+    "hair_curves", "shape_keys", "materials", "textures", "node_groups",
+    "worlds", "scenes", "particles", "linestyles", "movieclips", "masks",
+    "cache_files",
+)
+
+# bpy.data collections holding Grease Pencil datablocks (legacy and v3)
+GREASE_PENCIL_COLLECTIONS = ("grease_pencils", "grease_pencils_v3")
+
+
+def has_animation(id_block):
+    """Check whether an ID has an action, NLA strips or drivers"""
+    anim = getattr(id_block, "animation_data", None)
+    if not anim:
+        return False
+    return bool(anim.action or len(anim.nla_tracks) or len(anim.drivers))
+
+
+def find_animated_ids():
+    """
+    Walk the animation users in bpy.data once
+    Returns the set of datablocks with animation data or Grease Pencil frames
+    """
+    animated = set()
+    for collection_name in ANIMATION_DATA_COLLECTIONS:
+        for id_block in getattr(bpy.data, collection_name, ()):
+            if has_animation(id_block):
+                animated.add(id_block)
+            # Embedded node trees (materials, worlds, lights, compositor) are not in bpy.data.node_groups
+            node_tree = getattr(id_block, "node_tree", None)
+            if node_tree and has_animation(node_tree):
+                animated.add(node_tree)
+
+    for collection_name in GREASE_PENCIL_COLLECTIONS:
+        for gpencil in getattr(bpy.data, collection_name, ()):
+            if has_animation(gpencil) or any(len(layer.frames) for layer in gpencil.layers):
+                animated.add(gpencil)
+    return animated
+
+
+def remap_nla_strip_frames(strip, frames, raw=False):
+    """Map action frames to scene frames through an NLA strip's offset, scale, repeat and reverse"""
+    action_start = strip.action_frame_start
+    action_end = strip.action_frame_end
+    scale = strip.scale if strip.scale > 0 else 1.0
+    cycle_length = (action_end - action_start) * scale
+
+    remapped = set()
+    for frame in frames:
+        if frame < action_start or frame > action_end:
+            continue
+        local_offset = (action_end - frame) if strip.use_reverse else (frame - action_start)
+        cycle = 0
+        while cycle < max(1, math.ceil(strip.repeat)):
+            strip_frame = strip.frame_start + cycle * cycle_length + local_offset * scale
+            if strip_frame > strip.frame_end + 1e-4:
+                break
+            remapped.add(strip_frame if raw else round(strip_frame))
+            if cycle_length <= 0:
+                break
+            cycle += 1
+    return remapped
+
+
+def collect_nla_strip_keyframes(strip, default_slot, channel_filter=None, raw=False):
+    """Collect remapped keyframes from an NLA strip, including meta strip children"""
+    frames = set()
+    if strip.mute:
+        return frames
+    if strip.type == 'META':
+        for child in strip.strips:
+            frames.update(collect_nla_strip_keyframes(child, default_slot, channel_filter, raw))
+    elif strip.action:
+        slot = getattr(strip, "action_slot", None) or default_slot
+        frames.update(remap_nla_strip_frames(strip, get_action_keyframes(strip.action, slot, channel_filter, raw), raw))
+    return frames
+
+
+def get_grease_pencil_frames(gpencil, channel_filter=None, raw=False):
+    """Get drawing frame numbers from a Grease Pencil datablock, using the keyframe index"""
+    key = (get_keyframe_index_name(gpencil), "")
+    entry = _keyframe_index.get(key)
+    if entry is None:
+        # Each layer is stored as a channel so the index has the same shape as actions
+        entry = ActionKeyframeIndex({
+            ("", layer.info if hasattr(layer, "info") else layer.name, 0): (
+                np.array([frame.frame_number for frame in layer.frames], dtype=np.float64),
+                np.array([KEYFRAME_TYPE_CODES.get(getattr(frame, "keyframe_type", 'KEYFRAME'), 0) for frame in layer.frames], dtype=np.int8),
+            )
+            for layer in gpencil.layers
+            if not getattr(layer, "hide", False)
+        })
+        _keyframe_index[key] = entry
+    return entry.filter(channel_filter, raw)
+
+
+def collect_id_keyframes(id_block, channel_filter=None, raw=False):
+    """Collect keyframes from one datablock's action, NLA tracks and Grease Pencil frames"""
+    frames = set()
+    anim = getattr(id_block, "animation_data", None)
+    if anim:
+        slot = getattr(anim, "action_slot", None)
+        if anim.action:
+            frames.update(get_action_keyframes(anim.action, slot, channel_filter, raw))
+        for track in anim.nla_tracks:
+            if track.mute:
+                continue
+            for strip in track.strips:
+                frames.update(collect_nla_strip_keyframes(strip, slot, channel_filter, raw))
+
+    if hasattr(id_block, "layers") and not isinstance(id_block, bpy.types.Action):
+        layers = id_block.layers
+        if len(layers) and hasattr(layers[0], "frames"):
+            frames.update(get_grease_pencil_frames(id_block, channel_filter, raw))
+    return frames
+
+
+def iter_node_tree_sources(node_tree, visited):
+    """Yield a node tree and the node groups nested inside it"""
+    if not node_tree or node_tree in visited:
+        return
+    visited.add(node_tree)
+    yield node_tree
+    for node in node_tree.nodes:
+        yield from iter_node_tree_sources(getattr(node, "node_tree", None), visited)
+
+
+def iter_id_animation_sources(id_block, visited):
+    """Yield an ID plus every datablock whose animation can change how it renders"""
+    if not id_block or id_block in visited:
+        return
+    visited.add(id_block)
+    yield id_block
+
+    # Driver sources: keys on the driving datablock move the driven one
+    anim = getattr(id_block, "animation_data", None)
+    if anim:
+        for driver_fcurve in anim.drivers:
+            for variable in driver_fcurve.driver.variables:
+                for target in variable.targets:
+                    yield from iter_id_animation_sources(target.id, visited)
+
+    # Embedded node tree (materials, worlds, lights) and compositor (node_tree before 5.0)
+    yield from iter_node_tree_sources(getattr(id_block, "node_tree", None), visited)
+    yield from iter_node_tree_sources(getattr(id_block, "compositing_node_group", None), visited)
+
+
+def iter_object_animation_sources(obj, visited=None):
+    """Yield every datablock feeding an object's animation: data, shape keys, materials, node trees, drivers"""
+    if visited is None:
+        visited = set()
+    yield from iter_id_animation_sources(obj, visited)
+
+    data = getattr(obj, "data", None)
+    if data:
+        yield from iter_id_animation_sources(data, visited)
+        # Shape key datablocks
+        yield from iter_id_animation_sources(getattr(data, "shape_keys", None), visited)
+
+    # Material and shader node tree animation
+    for mat_slot in getattr(obj, "material_slots", ()):
+        yield from iter_id_animation_sources(mat_slot.material, visited)
+
+    # Geometry nodes and particle systems
+    for modifier in getattr(obj, "modifiers", ()):
+        if modifier.type == 'NODES':
+            yield from iter_node_tree_sources(modifier.node_group, visited)
+        elif modifier.type == 'PARTICLE_SYSTEM':
+            yield from iter_id_animation_sources(modifier.particle_system.settings, visited)
+
+
+def iter_scene_animation_sources(scene, visited=None):
+    """Yield scene-level datablocks: scene, world and compositor node tree"""
+    if visited is None:
+        visited = set()
+    yield from iter_id_animation_sources(scene, visited)
+    yield from iter_id_animation_sources(scene.world, visited)
+
+
+def get_object_channel_filter(obj, channel_filter):
+    """Narrow the (armature object name, bone name) pairs of a channel filter to one object's bone names"""
+    if not channel_filter or channel_filter.get("bones") is None:
+        return channel_filter
+    return dict(channel_filter, bones={bone_name for object_name, bone_name in channel_filter["bones"] if object_name == obj.name})
+
+
+def collect_object_keyframes(obj, animated_ids=None, channel_filter=None, raw=False):
+    """Collect all keyframes from an object and the datablocks it depends on"""
+    if animated_ids is None:
+        animated_ids = find_animated_ids()
+    # Selected bones belong to one armature, an action shared with another armature is filtered per object
+    channel_filter = get_object_channel_filter(obj, channel_filter)
+    frames = set()
+    for id_block in iter_object_animation_sources(obj):
+        if id_block in animated_ids:
+            frames.update(collect_id_keyframes(id_block, channel_filter, raw))
+    return frames
+
+
+def collect_scene_keyframes(scene, objects=None, channel_filter=None, raw=False):
+    """
+    Collect keyframes for a scene using the keyframe index
+    channel_filter is an optional dict, see ActionKeyframeIndex.filter(), with bones given as
+    (armature object name, bone name) pairs
+    With raw, unrounded key times (scene time, after NLA remapping) are collected
+    Returns (keyframes, object_keyframes) where object_keyframes maps object names to sorted frames
+    """
+    keyframes = set()
+    object_keyframes = {}
+
+    if objects is None:
+        objects = scene.objects
+
+    # One pass over bpy.data finds the animated datablocks, everything else is skipped
+    animated_ids = find_animated_ids()
+    if not animated_ids:
+        return keyframes, object_keyframes
+
+    for obj in objects:
+        obj_frames = collect_object_keyframes(obj, animated_ids, channel_filter, raw)
+        if obj_frames:
+            object_keyframes[obj.name] = sorted(obj_frames)
+            keyframes.update(obj_frames)
+
+    # Also check scene animation data (world, scene properties, compositor, etc.)
+    # Bone filtering targets characters, so scene-level channels are skipped with it
+    if channel_filter and channel_filter.get("bones") is not None:
+        return keyframes, object_keyframes
+    for id_block in iter_scene_animation_sources(scene):
+        if id_block in animated_ids:
+            keyframes.update(collect_id_keyframes(id_block, channel_filter, raw))
+
+    return keyframes, object_keyframes
+
+
+def get_selected_bones(context):
+    """
+    Get (armature object name, bone name) pairs of the selected pose bones (pose mode) or the
+    selected bones of selected armatures, so same-named bones of other rigs aren't included
+    """
+    selected_pose_bones = getattr(context, "selected_pose_bones", None)
+    if selected_pose_bones:
+        return {(pose_bone.id_data.name, pose_bone.name) for pose_bone in selected_pose_bones}
+
+    bones = set()
+    for obj in context.selected_objects:
+        if obj.type != 'ARMATURE' or not obj.pose:
+            continue
+        for pose_bone in obj.pose.bones:
+            # Blender 5.0 stores selection on pose bones, earlier versions on bones
+            if getattr(pose_bone, "select", None) or getattr(pose_bone.bone, "select", False):
+                bones.add((obj.name, pose_bone.name))
+    return bones
+
+
+def sync_frame_list_with_keys(scene):
+    """Rewrite the frame list from the keyframes inside the scene frame range"""
+    keyframes, _ = collect_scene_keyframes(scene)
+    frames = sorted(frame for frame in keyframes if scene.frame_start <= frame <= scene.frame_end)
+    keyframe_string = ','.join(map(str, frames))
+    # Only write on change, writing the property triggers another depsgraph update
+    if scene.frh_frame_list != keyframe_string:
+        scene.frh_frame_list = keyframe_string
+
+
+@bpy.app.handlers.persistent
+def on_depsgraph_update(scene, depsgraph):
+    """Handler that invalidates the keyframe index when actions are edited and records edits for region re-renders"""
+    _scene_edits.record(depsgraph)
+    actions_changed = False
+    for update in depsgraph.updates:
+        id_block = update.id.original
+        if isinstance(id_block, bpy.types.Action):
+            invalidate_keyframe_index(id_block)
+            actions_changed = True
+        elif (get_keyframe_index_name(id_block), "") in _keyframe_index:
+            # Grease Pencil frames are indexed per datablock
+            invalidate_keyframe_index(id_block)
+            actions_changed = True
+
+    if actions_changed and getattr(scene, "frh_keyframe_live_sync", False):
+        try:
+            sync_frame_list_with_keys(scene)
+        except Exception as e:
+            print(f"Could not sync frame list with keyframes: {e}")
+
+
+@bpy.app.handlers.persistent
+def on_file_save(dummy):
+    """Handler called before a blend file is saved"""
+    for scene in bpy.data.scenes:
+        if getattr(scene, "frh_keyframe_index_persist", False):
+            try:
+                save_keyframe_index_to_scene(scene)
+            except Exception as e:
+                print(f"Could not save keyframe index: {e}")
+        elif KEYFRAME_INDEX_PROPERTY in scene:
+            del scene[KEYFRAME_INDEX_PROPERTY]
+
+
+def update_keyframe_live_sync(self, context):
+    """Sync the frame list immediately when live sync is switched on"""
+    if self.frh_keyframe_live_sync:
+        sync_frame_list_with_keys(self)
+
+
 class RENDER_OT_suggest_keyframes(Operator):
     """Scan the dope sheet and suggest frames with keyframes"""
     bl_idname = "render.suggest_keyframes"
@@ -2070,6 +5777,66 @@ class RENDER_OT_suggest_keyframes(Operator):
         default=False
     )
     
+    # Channel-level filtering through the fcurve data_path index
+    selected_bones_only: BoolProperty(
+        name="Selected Bones Only",
+        description="Only use keyframes on the selected pose bones (object-level channels are skipped)",
+        default=False
+    )
+    
+    channel_groups: EnumProperty(
+        name="Channels",
+        description="Only use keyframes on these kinds of channels",
+        items=CHANNEL_GROUPS,
+        options={'ENUM_FLAG'},
+        default={item[0] for item in CHANNEL_GROUPS}
+    )
+    
+    custom_properties: StringProperty(
+        name="Custom Properties",
+        description="Comma separated custom property names to include (empty = all custom properties)",
+        default=""
+    )
+    
+    # Keyframe type filtering and clustering
+    key_types: EnumProperty(
+        name="Key Types",
+        description="Only use keyframes of these types",
+        items=KEYFRAME_TYPES,
+        options={'ENUM_FLAG'},
+        default={item[0] for item in KEYFRAME_TYPES}
+    )
+    
+    cluster_tolerance: IntProperty(
+        name="Merge Tolerance",
+        description="Merge keys within this many frames of a cluster's first key into that frame (0 = off)",
+        default=0,
+        min=0,
+        max=1000
+    )
+    
+    max_frames: IntProperty(
+        name="Max Frames",
+        description="Maximum number of frames to suggest, spread evenly over the keys (0 = unlimited)",
+        default=0,
+        min=0,
+        max=100000
+    )
+    
+    def get_channel_filter(self, context):
+        """Build the channel filter dict from the operator options, None when nothing is filtered"""
+        channel_filter = {}
+        if self.selected_bones_only:
+            channel_filter["bones"] = get_selected_bones(context)
+        if set(self.channel_groups) != {item[0] for item in CHANNEL_GROUPS}:
+            channel_filter["groups"] = set(self.channel_groups)
+        custom_names = {name.strip() for name in self.custom_properties.split(',') if name.strip()}
+        if custom_names:
+            channel_filter["custom_properties"] = custom_names
+        if set(self.key_types) != {item[0] for item in KEYFRAME_TYPES}:
+            channel_filter["key_types"] = set(self.key_types)
+        return channel_filter or None
+    
     def execute(self, context):
         scene = context.scene
         
@@ -2079,29 +5846,8 @@ class RENDER_OT_suggest_keyframes(Operator):
         
         if self.current_frames.strip():
             try:
-                frame_numbers = []
-                frame_string = self.current_frames.strip()
-                
-                # Parse the frame list (same logic as the render operator)
-                for frame_str in frame_string.split(','):
-                    frame_str = frame_str.strip()
-                    if frame_str:
-                        try:
-                            # Check if it's a range (contains hyphen)
-                            if '-' in frame_str:
-                                # Handle range like "1-5" or "10-20"
-                                range_parts = frame_str.split('-')
-                                if len(range_parts) == 2:
-                                    start_frame = int(range_parts[0].strip())
-                                    end_frame = int(range_parts[1].strip())
-                                    if start_frame <= end_frame:
-                                        frame_numbers.extend(range(start_frame, end_frame + 1))
-                            else:
-                                # Single frame number
-                                frame_num = int(frame_str)
-                                frame_numbers.append(frame_num)
-                        except ValueError:
-                            pass  # Skip invalid entries
+                # Parse the frame list (same logic as the render operator, invalid entries skipped)
+                frame_numbers = parse_frame_list(self.current_frames.strip(), strict=False)
                 
                 if frame_numbers:
                     frame_range_min = min(frame_numbers)
@@ -2115,137 +5861,6 @@ class RENDER_OT_suggest_keyframes(Operator):
         original_frame = scene.frame_current
         
         try:
-            keyframes = set()
-            
-            # Helper function to iterate FCurves from action with slot support (Blender 5.0)
-            def iter_slot_fcurves(action, slot):
-                """Yield all FCurves in this action that belong to the given slot."""
-                if not action:
-                    return
-
-                # Layered actions path (5.0+)
-                if hasattr(action, "layers"):
-                    for layer in action.layers:
-                        for strip in layer.strips:
-                            # Only keyframe strips store fcurves
-                            if strip.type != 'KEYFRAME':
-                                continue
-
-                            # If slot is provided, get channelbag for this slot
-                            if slot:
-                                try:
-                                    cb = strip.channelbag(slot, ensure=False)
-                                    if cb:
-                                        for fc in cb.fcurves:
-                                            yield fc
-                                except Exception:
-                                    # Fallback: iterate all channelbags on the strip and match by slot
-                                    for bag in strip.channelbags:
-                                        if bag.slot == slot:
-                                            for fc in bag.fcurves:
-                                                yield fc
-                            else:
-                                # No slot provided, iterate all channelbags
-                                for bag in strip.channelbags:
-                                    for fc in bag.fcurves:
-                                        yield fc
-
-                # Legacy fallback (Blender 4.x and earlier)
-                else:
-                    fcurves = getattr(action, "fcurves", [])
-                    for fc in fcurves:
-                        yield fc
-
-            # Helper function to get keyframes from action (Blender 4.x and 5.0)
-            def get_keyframes_from_action(action, obj=None):
-                """Extract keyframe frame numbers from an action, handling both Blender 4.x and 5.0"""
-                frames = set()
-                
-                # Try Blender 4.x style first - direct fcurves access
-                if hasattr(action, 'fcurves') and not callable(action.fcurves):
-                    try:
-                        fcurve_count = len(action.fcurves)
-                        if fcurve_count > 0:
-                            print(f"    Found {fcurve_count} fcurves (Blender 4.x style)")
-                            for fcurve in action.fcurves:
-                                for keyframe_point in fcurve.keyframe_points:
-                                    try:
-                                        # Try co.x first (newer style)
-                                        frame = round(keyframe_point.co.x)
-                                    except AttributeError:
-                                        # Fall back to co[0] (older style)
-                                        frame = int(keyframe_point.co[0])
-                                    frames.add(frame)
-                            if frames:
-                                print(f"    Extracted {len(frames)} unique keyframes from fcurves")
-                                return frames
-                    except Exception as e:
-                        print(f"    Failed to access fcurves directly: {e}")
-                
-                # Try Blender 5.0 layered animation system with slots
-                if hasattr(action, "layers"):
-                    print(f"    Detected Blender 5.0 layered animation system")
-                    
-                    # Get the slot for this object if available (Blender 5.0)
-                    slot = None
-                    if obj and hasattr(obj, 'animation_data'):
-                        slot = getattr(obj.animation_data, "action_slot", None)
-                    
-                    # Use the slot-aware iterator to get fcurves
-                    try:
-                        fcurve_count = 0
-                        for fcurve in iter_slot_fcurves(action, slot):
-                            fcurve_count += 1
-                            for keyframe_point in fcurve.keyframe_points:
-                                try:
-                                    frame = round(keyframe_point.co.x)
-                                except AttributeError:
-                                    frame = int(keyframe_point.co[0])
-                                frames.add(frame)
-                        
-                        if fcurve_count > 0:
-                            print(f"    Found {fcurve_count} fcurves with {len(frames)} unique keyframes")
-                            return frames
-                    except Exception as e:
-                        print(f"    Error accessing fcurves via slots: {e}")
-                
-                return frames
-            
-            # Collect keyframes from all objects in the scene
-            def collect_keyframes_from_object(obj):
-                """Recursively collect all keyframes from an object's animation data"""
-                frames = set()
-                
-                # Check if object has animation data
-                if obj.animation_data and obj.animation_data.action:
-                    action = obj.animation_data.action
-                    print(f"  Checking object '{obj.name}' with action '{action.name}'")
-                    obj_frames = get_keyframes_from_action(action, obj)
-                    frames.update(obj_frames)
-                
-                # Check object data animation (e.g., shape keys, mesh animation)
-                if hasattr(obj, 'data') and obj.data and hasattr(obj.data, 'animation_data') and obj.data.animation_data:
-                    if obj.data.animation_data.action:
-                        action = obj.data.animation_data.action
-                        print(f"  Checking object data '{obj.name}.data' with action '{action.name}'")
-                        obj_frames = get_keyframes_from_action(action, obj.data)
-                        frames.update(obj_frames)
-                
-                # Check material animation
-                if hasattr(obj, 'material_slots'):
-                    for mat_slot in obj.material_slots:
-                        if mat_slot.material and mat_slot.material.animation_data:
-                            if mat_slot.material.animation_data.action:
-                                action = mat_slot.material.animation_data.action
-                                print(f"  Checking material '{mat_slot.material.name}' with action '{action.name}'")
-                                mat_frames = get_keyframes_from_action(action, mat_slot.material)
-                                frames.update(mat_frames)
-                
-                return frames
-            
-            # Collect keyframes from objects
-            object_keyframes = {}
-            
             # Determine which objects to scan
             if self.selected_only:
                 objects_to_scan = [obj for obj in context.selected_objects]
@@ -2257,25 +5872,17 @@ class RENDER_OT_suggest_keyframes(Operator):
                 objects_to_scan = scene.objects
                 print(f"Scanning all {len(objects_to_scan)} objects in scene for keyframes...")
             
-            for obj in objects_to_scan:
-                obj_frames = collect_keyframes_from_object(obj)
-                if obj_frames:
-                    object_keyframes[obj.name] = sorted(list(obj_frames))
-                    keyframes.update(obj_frames)
-            
-            # Also check scene animation data (world, scene properties, etc.)
-            if scene.animation_data and scene.animation_data.action:
-                action = scene.animation_data.action
-                print(f"  Checking scene animation with action '{action.name}'")
-                scene_frames = get_keyframes_from_action(action, scene)
-                keyframes.update(scene_frames)
-            
-            # Check world animation
-            if scene.world and scene.world.animation_data and scene.world.animation_data.action:
-                action = scene.world.animation_data.action
-                print(f"  Checking world animation with action '{action.name}'")
-                world_frames = get_keyframes_from_action(action, scene.world)
-                keyframes.update(world_frames)
+            channel_filter = self.get_channel_filter(context)
+            if channel_filter and channel_filter.get("bones") is not None and not channel_filter["bones"]:
+                self.report({'WARNING'}, "No bones selected. Please select pose bones or uncheck 'Selected Bones Only'.")
+                return {'CANCELLED'}
+            if channel_filter:
+                print(f"Channel filter: {channel_filter}")
+            
+            # Collect keyframes through the keyframe index (cached per action and slot)
+            cached_before = len(_keyframe_index)
+            keyframes, object_keyframes = collect_scene_keyframes(scene, objects_to_scan, channel_filter)
+            print(f"Keyframe index: {len(_keyframe_index)} entries ({len(_keyframe_index) - cached_before} newly scanned)")
             
             # Filter keyframes based on existing frame range or scene frame range
             if frame_range_min is not None and frame_range_max is not None:
@@ -2291,6 +5898,15 @@ class RENDER_OT_suggest_keyframes(Operator):
             
             filtered_keyframes = {frame for frame in keyframes if frame_start <= frame <= frame_end}
             
+            # Merge near-duplicate keys and cap the frame count
+            if self.cluster_tolerance > 0 or self.max_frames > 0:
+                key_count = len(filtered_keyframes)
+                # Cluster the unrounded key times, only the representatives become frame numbers
+                raw_keyframes, _ = collect_scene_keyframes(scene, objects_to_scan, channel_filter, raw=True)
+                raw_keyframes = [frame for frame in raw_keyframes if frame_start <= round(frame) <= frame_end]
+                filtered_keyframes = set(cluster_keyframes(raw_keyframes, self.cluster_tolerance, self.max_frames))
+                print(f"Clustered {key_count} keyframes down to {len(filtered_keyframes)} (tolerance {self.cluster_tolerance}, max {self.max_frames or 'unlimited'})")
+            
             # Debug output
             print(f"=== Keyframe Collection Debug Info ===")
             print(f"Filter source: {filter_source}")
@@ -2341,6 +5957,35 @@ class RENDER_OT_suggest_keyframes(Operator):
         
         layout.prop(self, "selected_only")
         
+        layout.separator()
+        channel_box = layout.box()
+        channel_box.label(text="Channel Filter:", icon='FCURVE')
+        channel_box.prop(self, "selected_bones_only")
+        row = channel_box.row(align=True)
+        row.prop(self, "channel_groups")
+        channel_box.prop(self, "custom_properties")
+        if self.selected_bones_only:
+            bone_count = len(get_selected_bones(context))
+            if bone_count > 0:
+                channel_box.label(text=f"Will use {bone_count} selected bone(s)", icon='BONE_DATA')
+            else:
+                channel_box.label(text="⚠ No bones selected!", icon='ERROR')
+        
+        layout.separator()
+        key_box = layout.box()
+        key_box.label(text="Key Types and Clustering:", icon='KEYTYPE_KEYFRAME_VEC')
+        key_box.prop(self, "key_types")
+        row = key_box.row(align=True)
+        row.prop(self, "cluster_tolerance")
+        row.prop(self, "max_frames")
+        
+        layout.separator()
+        index_box = layout.box()
+        index_box.label(text="Keyframe Index:", icon='KEYFRAME')
+        index_box.prop(context.scene, "frh_keyframe_live_sync")
+        index_box.prop(context.scene, "frh_keyframe_index_persist")
+        index_box.label(text=f"Cached actions: {len(_keyframe_index)}")
+        
         layout.separator()
         box = layout.box()
         box.label(text="Quick Access:", icon='INFO')
@@ -2356,6 +6001,174 @@ class RENDER_OT_suggest_keyframes(Operator):
                 layout.label(text="⚠ No objects selected!", icon='ERROR')
 
 
+def get_motion_targets(context, use_bones):
+    """Get (object, pose bone or None) pairs to sample for motion analysis"""
+    targets = []
+    selected_bones = get_selected_bones(context) if use_bones else set()
+    for obj in context.selected_objects:
+        if use_bones and obj.type == 'ARMATURE' and obj.pose:
+            for pose_bone in obj.pose.bones:
+                if (obj.name, pose_bone.name) in selected_bones:
+                    targets.append((obj, pose_bone))
+        else:
+            targets.append((obj, None))
+    return targets
+
+
+def sample_world_transforms(scene, targets, frames):
+    """
+    Sample evaluated world-space matrices of all targets in one pass over the frames
+    Returns a NumPy array of shape (frames, targets, 4, 4)
+    """
+    samples = np.empty((len(frames), len(targets), 4, 4), dtype=np.float64)
+    for frame_index, frame in enumerate(frames):
+        scene.frame_set(frame)
+        for target_index, (obj, pose_bone) in enumerate(targets):
+            matrix = obj.matrix_world if pose_bone is None else obj.matrix_world @ pose_bone.matrix
+            samples[frame_index, target_index] = matrix
+    return samples
+
+
+def select_motion_extreme_frames(frames, samples, frame_budget):
+    """
+    Pick frames at motion extremes (local minima of motion magnitude) and the largest
+    pose changes, up to frame_budget frames. samples come from sample_world_transforms()
+    Returns (selected frames, per-frame motion magnitude)
+    """
+    frame_count = len(frames)
+    if frame_count <= 2 or frame_budget >= frame_count:
+        return list(frames), np.zeros(frame_count)
+
+    positions = samples[:, :, :3, 3]
+    # Normalise rotation so object scale does not dominate the rotation term
+    rotations = samples[:, :, :3, :3]
+    rotations = rotations / np.maximum(np.linalg.norm(rotations, axis=2, keepdims=True), 1e-9)
+
+    # Position and rotation live in different units, scale each to [0, 1] over the range
+    position_extent = np.ptp(positions.reshape(frame_count, -1), axis=0).max()
+    positions = positions / max(position_extent, 1e-9)
+    poses = np.concatenate([positions.reshape(frame_count, -1), rotations.reshape(frame_count, -1)], axis=1)
+
+    # Per-frame motion magnitude: pose change to the previous and next frame
+    step = np.linalg.norm(np.diff(poses, axis=0), axis=1)
+    motion = np.zeros(frame_count)
+    motion[1:] += step
+    motion[:-1] += step
+    motion[1:-1] *= 0.5
+
+    # Local extremes: frames where motion slows to a stop or reverses direction
+    interior = np.arange(1, frame_count - 1)
+    is_minimum = (motion[interior] <= motion[interior - 1]) & (motion[interior] < motion[interior + 1])
+    candidates = interior[is_minimum]
+
+    selected = [0, frame_count - 1]
+    nearest = np.minimum(
+        np.linalg.norm(poses - poses[0], axis=1),
+        np.linalg.norm(poses - poses[-1], axis=1),
+    )
+    threshold = nearest.max() * 0.01
+
+    def farthest_point(pool):
+        # Greedily add the frame whose pose differs most from every selected frame
+        while len(selected) < frame_budget and len(pool):
+            best = pool[np.argmax(nearest[pool])]
+            if nearest[best] <= threshold:
+                break
+            selected.append(int(best))
+            np.minimum(nearest, np.linalg.norm(poses - poses[best], axis=1), out=nearest)
+
+    # Extremes first, then fill the budget with the largest remaining pose changes
+    farthest_point(candidates)
+    farthest_point(np.arange(frame_count))
+
+    return sorted(frames[index] for index in selected), motion
+
+
+class RENDER_OT_suggest_motion_extremes(Operator):
+    """Sample object/bone motion and suggest frames at motion extremes"""
+    bl_idname = "render.suggest_motion_extremes"
+    bl_label = "Suggest Motion Extremes"
+    bl_description = "Sample selected objects or bones over the frame range and populate the frame numbers field with motion extremes and the largest pose changes (for baked or mocap animation)"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    # Property to receive current frame list from the render operator
+    current_frames: StringProperty(
+        name="Current Frames",
+        description="Current frame list to respect min/max values",
+        default=""
+    )
+    
+    frame_budget: IntProperty(
+        name="Frame Budget",
+        description="Maximum number of frames to suggest",
+        default=24,
+        min=2,
+        max=10000
+    )
+    
+    use_bones: BoolProperty(
+        name="Sample Selected Bones",
+        description="Sample the selected pose bones of selected armatures instead of whole objects",
+        default=False
+    )
+    
+    def execute(self, context):
+        scene = context.scene
+        
+        # Frame range: existing frame list or scene frame range
+        frame_numbers = parse_frame_list(self.current_frames.strip(), strict=False) if self.current_frames.strip() else []
+        if frame_numbers:
+            frame_start, frame_end = min(frame_numbers), max(frame_numbers)
+        else:
+            frame_start, frame_end = scene.frame_start, scene.frame_end
+        frames = list(range(frame_start, frame_end + 1))
+        
+        targets = get_motion_targets(context, self.use_bones)
+        if not targets:
+            self.report({'WARNING'}, "No objects or bones selected. Please select the animated objects to analyse.")
+            return {'CANCELLED'}
+        
+        original_frame = scene.frame_current
+        try:
+            from datetime import datetime
+            sample_start = datetime.now()
+            samples = sample_world_transforms(scene, targets, frames)
+            suggested, motion = select_motion_extreme_frames(frames, samples, self.frame_budget)
+            elapsed = (datetime.now() - sample_start).total_seconds()
+        finally:
+            scene.frame_set(original_frame)
+        
+        # Debug output
+        print(f"=== Motion Extremes Debug Info ===")
+        print(f"Sampled {len(targets)} target(s) over frames {frame_start} - {frame_end} in {elapsed:.2f}s")
+        print(f"Peak motion at frame {frames[int(motion.argmax())]}" if len(motion) else "No motion")
+        print(f"Suggested frames: {suggested}")
+        
+        keyframe_string = ','.join(map(str, suggested))
+        scene.frh_frame_list = keyframe_string
+        self.report({'INFO'}, f"Suggested {len(suggested)} frames from {len(targets)} target(s): {keyframe_string[:80]}{'...' if len(keyframe_string) > 80 else ''}")
+        return {'FINISHED'}
+    
+    def invoke(self, context, event):
+        # Same convention as keyframe suggestion: Shift+Click shows the options dialog
+        if event.shift:
+            return context.window_manager.invoke_props_dialog(self, width=400)
+        return self.execute(context)
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.label(text="Motion Extreme Options:", icon='SETTINGS')
+        layout.separator()
+        layout.prop(self, "frame_budget")
+        layout.prop(self, "use_bones")
+        
+        layout.separator()
+        box = layout.box()
+        box.label(text="Samples selected objects/bones on every frame", icon='INFO')
+        box.label(text="Useful for mocap or baked animation")
+        box.label(text="where every frame is a keyframe")
+
+
 class RENDER_PT_specific_frames_panel(Panel):
     """Panel for rendering specific frames"""
     bl_label = "Furion Render Helper"
@@ -2472,9 +6285,24 @@ class RENDER_PT_specific_frames_panel(Panel):
         # Rendering section
         layout.separator()
         layout.label(text="Render Frames:")
-        layout.operator("render.specific_frames", text="Render Specific Frames", icon='RENDER_STILL')
-        layout.operator("render.current_frame", text="Render Current Frame", icon='RENDER_STILL')
-        layout.operator("render.open_output_folder", text="Open Rendered Frame Result", icon='IMAGE_DATA')
+        row = layout.row(align=True)
+        row.operator("render.specific_frames", text="Render Specific Frames", icon='RENDER_STILL')
+        row.operator("render.preflight_batch", text="", icon='VIEWZOOM')
+        
+        # Batch running in a background Blender process
+        if _background_batch:
+            box = layout.box()
+            box.progress(factor=_background_batch.get_progress_factor(), text=_background_batch.get_status_text())
+            if _background_batch.running:
+                box.operator("render.cancel_background_batch", text="Cancel Background Batch", icon='CANCEL')
+        
+        row = layout.row(align=True)
+        row.operator("render.current_frame", text="Render Current Frame", icon='RENDER_STILL')
+        row.operator("render.tiled_frame", text="", icon='MESH_GRID')
+        row = layout.row(align=True)
+        row.operator("render.open_output_folder", text="Open Rendered Frame Result", icon='IMAGE_DATA')
+        row.operator("render.render_catalog", text="", icon='PRESET')
+        row.operator("render.check_output_folder", text="", icon='CHECKMARK')
 
         # Viewport Settings section
         layout.separator()
@@ -2525,7 +6353,9 @@ def register():
     bpy.utils.register_class(RENDER_OT_browse_output_folder)
     bpy.utils.register_class(RENDER_OT_set_filename_pattern)
     bpy.utils.register_class(RENDER_OT_specific_frames)
+    bpy.utils.register_class(RENDER_OT_cancel_background_batch)
     bpy.utils.register_class(RENDER_OT_current_frame)
+    bpy.utils.register_class(RENDER_OT_tiled_frame)
     bpy.utils.register_class(RENDER_OT_open_output_folder)
     bpy.utils.register_class(RENDER_OT_set_viewport_focal_length)
     bpy.utils.register_class(CAMERA_OT_focal_length_adjust)
@@ -2533,6 +6363,10 @@ def register():
     bpy.utils.register_class(CAMERA_OT_dof_distance_pick)
     bpy.utils.register_class(VIEW3D_MT_camera_dof_menu)
     bpy.utils.register_class(RENDER_OT_suggest_keyframes)
+    bpy.utils.register_class(RENDER_OT_suggest_motion_extremes)
+    bpy.utils.register_class(RENDER_OT_preflight_batch)
+    bpy.utils.register_class(RENDER_OT_render_catalog)
+    bpy.utils.register_class(RENDER_OT_check_output_folder)
     bpy.utils.register_class(RENDER_PT_specific_frames_panel)
     
     # Add camera context menu item
@@ -2560,9 +6394,192 @@ def register():
         default=False
     )
     
+    bpy.types.Scene.frh_keyframe_live_sync = BoolProperty(
+        name="Keep Frame List in Sync with Keys",
+        description="Rewrite the frame numbers whenever keyframes are edited (limited to the scene frame range)",
+        default=False,
+        update=update_keyframe_live_sync
+    )
+    
+    bpy.types.Scene.frh_use_local_scratch = BoolProperty(
+        name="Render to Local Scratch",
+        description="Write renders to a local folder and move them to the output folder in the background (for network output folders)",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_scratch_folder = StringProperty(
+        name="Scratch Folder",
+        description="Local folder for renders before transfer (empty: system temp folder)",
+        default="",
+        subtype='DIR_PATH'
+    )
+    
+    bpy.types.Scene.frh_transfer_workers = IntProperty(
+        name="Parallel Transfers",
+        description="Number of files copied to the output folder at the same time",
+        default=2,
+        min=1,
+        max=8
+    )
+    
+    bpy.types.Scene.frh_shard_by_batch = BoolProperty(
+        name="Per Batch",
+        description="Put each batch in its own subfolder named after the batch start time",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_shard_by_channel = BoolProperty(
+        name="Per Channel",
+        description="Put each render pass in its own subfolder",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_shard_frame_block = IntProperty(
+        name="Frames per Folder",
+        description="Split frames into subfolders of this many frames, e.g. 0000-0999 (0: off)",
+        default=0,
+        min=0
+    )
+    
+    bpy.types.Scene.frh_detect_changes = BoolProperty(
+        name="Detect Changes",
+        description="Compare every render with the previous render of the same frame and channel, and write a report with heatmaps of the changed frames",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_change_threshold = FloatProperty(
+        name="Change Threshold",
+        description="Smallest difference of a downsampled image area (0-1) that counts as a change",
+        default=0.01,
+        min=0.0,
+        max=1.0,
+        precision=3
+    )
+    
+    bpy.types.Scene.frh_skip_identical = BoolProperty(
+        name="Keep Identical Outputs",
+        description="Don't write renders whose pixels are exactly the same as the previous file, keep the previous file instead",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_camera_mode = EnumProperty(
+        name="Cameras",
+        description="Cameras every frame of the batch is rendered through. Use the (Camera) token to tell them apart",
+        items=CAMERA_MODES,
+        default='SCENE'
+    )
+    
+    bpy.types.Scene.frh_view_layer_mode = EnumProperty(
+        name="View Layers",
+        description="View layers rendered for every frame. Use the (ViewLayer) token to tell them apart",
+        items=VIEW_LAYER_MODES,
+        default='FIRST'
+    )
+    
+    bpy.types.Scene.frh_render_backend = EnumProperty(
+        name="Render Backend",
+        description="How the batch renders each frame. Faster backends are meant for blocking and previews",
+        items=RENDER_BACKENDS,
+        default='RENDER'
+    )
+    
+    bpy.types.Scene.frh_render_in_background = BoolProperty(
+        name="Render in Background Process",
+        description="Render the batch in a separate Blender process from a copy of the file, so this session stays free to work in",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_prebake_simulations = BoolProperty(
+        name="Step Simulations First",
+        description="Before rendering frames out of order, play unbaked simulations (cloth, particles, rigid bodies, fluids, simulation zones) frame by frame up to the last frame, so every frame renders from the simulation cache. Stepping can take long, the pre-flight check shows the frames and the time of the last batch",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_memory_governor = BoolProperty(
+        name="Memory Governor",
+        description="Free render buffers and orphan images created by the batch after every frame, log the memory use and turn persistent data off over the memory budget",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_memory_budget = FloatProperty(
+        name="Memory Budget (GB)",
+        description="Memory of the Blender process above which persistent data is turned off for the rest of the batch (0: keep it on)",
+        default=16.0,
+        min=0.0,
+        precision=1
+    )
+    
+    bpy.types.Scene.frh_time_budget_mode = EnumProperty(
+        name="Time Budget",
+        description="Lower the render samples from frame to frame to keep to a time budget",
+        items=TIME_BUDGET_MODES,
+        default='OFF'
+    )
+    
+    bpy.types.Scene.frh_frame_time_budget = FloatProperty(
+        name="Seconds per Frame",
+        description="Render time per frame (all channels) the samples are adjusted to",
+        default=60.0,
+        min=1.0,
+        subtype='TIME_ABSOLUTE',
+        unit='TIME_ABSOLUTE'
+    )
+    
+    bpy.types.Scene.frh_batch_deadline = StringProperty(
+        name="Deadline",
+        description="Time of day (HH:MM) the batch should be done by. Times already passed today mean tomorrow",
+        default="08:00"
+    )
+    
+    bpy.types.Scene.frh_budget_min_samples = IntProperty(
+        name="Min Samples",
+        description="The time budget never lowers samples below this",
+        default=16,
+        min=1
+    )
+    
+    bpy.types.Scene.frh_probe_mode = EnumProperty(
+        name="Probe Render",
+        description="Render a cheap probe of each frame first and skip the full render when it matches the last batch",
+        items=PROBE_MODES,
+        default='OFF'
+    )
+    
+    bpy.types.Scene.frh_probe_threshold = FloatProperty(
+        name="Probe Threshold",
+        description="Largest probe difference (0-1) that still counts as unchanged",
+        default=0.02,
+        min=0.0,
+        max=1.0,
+        precision=3
+    )
+    
+    bpy.types.Scene.frh_region_rerender = BoolProperty(
+        name="Re-render Changed Regions",
+        description="Compare objects with the last batch and only re-render the screen region of the ones that changed, pasted over the previous output",
+        default=False
+    )
+    
+    bpy.types.Scene.frh_region_margin = IntProperty(
+        name="Region Margin",
+        description="Pixels added around the changed region (for motion blur, shadows and filter width)",
+        default=32,
+        min=0
+    )
+    
+    bpy.types.Scene.frh_keyframe_index_persist = BoolProperty(
+        name="Store Keyframe Index in Blend File",
+        description="Save the keyframe index with the blend file so keyframe suggestions are instant after loading",
+        default=False
+    )
+    
     # Add handler to reload output folder when file is loaded
     bpy.app.handlers.load_post.append(on_file_load)
     
+    # Add handlers to keep the keyframe index up to date
+    bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    bpy.app.handlers.save_pre.append(on_file_save)
+    
     # Load saved preferences
     load_user_preferences()
 
@@ -2577,18 +6594,53 @@ def unregister():
     # Remove handler
     if on_file_load in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(on_file_load)
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+    if on_file_save in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(on_file_save)
+    invalidate_keyframe_index()
+    if bpy.app.timers.is_registered(poll_background_batch):
+        bpy.app.timers.unregister(poll_background_batch)
     
     # Unregister scene properties
     del bpy.types.Scene.frh_show_tips
     del bpy.types.Scene.frh_frame_list
     del bpy.types.Scene.frh_camera_keyframe
+    del bpy.types.Scene.frh_keyframe_live_sync
+    del bpy.types.Scene.frh_keyframe_index_persist
+    del bpy.types.Scene.frh_use_local_scratch
+    del bpy.types.Scene.frh_scratch_folder
+    del bpy.types.Scene.frh_transfer_workers
+    del bpy.types.Scene.frh_shard_by_batch
+    del bpy.types.Scene.frh_shard_by_channel
+    del bpy.types.Scene.frh_shard_frame_block
+    del bpy.types.Scene.frh_detect_changes
+    del bpy.types.Scene.frh_change_threshold
+    del bpy.types.Scene.frh_skip_identical
+    del bpy.types.Scene.frh_camera_mode
+    del bpy.types.Scene.frh_view_layer_mode
+    del bpy.types.Scene.frh_render_backend
+    del bpy.types.Scene.frh_render_in_background
+    del bpy.types.Scene.frh_prebake_simulations
+    del bpy.types.Scene.frh_memory_governor
+    del bpy.types.Scene.frh_memory_budget
+    del bpy.types.Scene.frh_time_budget_mode
+    del bpy.types.Scene.frh_frame_time_budget
+    del bpy.types.Scene.frh_batch_deadline
+    del bpy.types.Scene.frh_budget_min_samples
+    del bpy.types.Scene.frh_probe_mode
+    del bpy.types.Scene.frh_probe_threshold
+    del bpy.types.Scene.frh_region_rerender
+    del bpy.types.Scene.frh_region_margin
     
     bpy.utils.unregister_class(FurionRenderHelperPreferences)
     bpy.utils.unregister_class(RENDER_OT_set_output_folder)
     bpy.utils.unregister_class(RENDER_OT_browse_output_folder)
     bpy.utils.unregister_class(RENDER_OT_set_filename_pattern)
     bpy.utils.unregister_class(RENDER_OT_specific_frames)
+    bpy.utils.unregister_class(RENDER_OT_cancel_background_batch)
     bpy.utils.unregister_class(RENDER_OT_current_frame)
+    bpy.utils.unregister_class(RENDER_OT_tiled_frame)
     bpy.utils.unregister_class(RENDER_OT_open_output_folder)
     bpy.utils.unregister_class(RENDER_OT_set_viewport_focal_length)
     bpy.utils.unregister_class(CAMERA_OT_focal_length_adjust)
@@ -2596,6 +6648,10 @@ def unregister():
     bpy.utils.unregister_class(CAMERA_OT_dof_distance_pick)
     bpy.utils.unregister_class(VIEW3D_MT_camera_dof_menu)
     bpy.utils.unregister_class(RENDER_OT_suggest_keyframes)
+    bpy.utils.unregister_class(RENDER_OT_check_output_folder)
+    bpy.utils.unregister_class(RENDER_OT_render_catalog)
+    bpy.utils.unregister_class(RENDER_OT_preflight_batch)
+    bpy.utils.unregister_class(RENDER_OT_suggest_motion_extremes)
     bpy.utils.unregister_class(RENDER_PT_specific_frames_panel)
 
 
@@ -64,6 +64,9 @@ def create_extension_package():
     files_to_include = [
         'blender_manifest.toml',
         '__init__.py',
+        'check_renders.py',
+        'render_tiles.py',
+        'render_queue.py',
         'README.md',
         'LICENSE',
         'CHANGELOG.md',
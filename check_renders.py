@@ -0,0 +1,346 @@
+"""
+Check a render output folder for missing frames and broken image files
+
+Used by the "Check Output Folder" operator and as a command line tool:
+
+    python check_renders.py FOLDER --frames 1-250 [--channels Combined,Depth] [--jobs N] [--output report.json]
+
+Every image is validated in a worker pool: PNG chunks are walked and their CRCs
+verified, JPEG start/end markers, TIFF headers and EXR headers plus scanline
+offset tables are checked, so zero-byte, truncated and corrupt files are found
+without opening them in an image viewer. The exit code is 1 when anything is
+missing or broken.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import struct
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+EXR_MAGIC = 20000630
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.exr', '.bmp', '.tga', '.webp', '.jp2')
+
+# Subfolder with the change detection heatmaps of the add-on
+CHANGE_REPORT_FOLDER = "frh_changes"
+
+# Scanlines per chunk for each EXR compression (index = compression attribute value)
+EXR_LINES_PER_CHUNK = [1, 1, 1, 16, 32, 16, 32, 32, 32, 256]
+
+# Frame numbers as written by the (Frame) token: 4+ digits, negative frames as -005
+# A "-" is only a minus sign after the start of the name or a separator ("shot_-005", "shot--005"),
+# otherwise it is the separator itself ("shot-0001")
+FRAME_NUMBER_PATTERN = re.compile(r'((?:^|(?<=[_.\s-]))-[0-9]{3,}|(?<![0-9])[0-9]{4,})(?![0-9])')
+
+
+class ImageCheckError(Exception):
+    """An image file failed validation"""
+
+
+# ---------------------------------------------------------------------------
+# Image validation
+# ---------------------------------------------------------------------------
+
+def check_png(f, size):
+    """Walk every chunk, verify CRCs and require IHDR first and IEND last"""
+    if f.read(8) != PNG_SIGNATURE:
+        raise ImageCheckError("not a PNG signature")
+    first = True
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            raise ImageCheckError("truncated (no IEND chunk)")
+        length, chunk_type = struct.unpack(">I4s", header)
+        if f.tell() + length + 4 > size:
+            raise ImageCheckError(f"truncated in {chunk_type.decode('latin-1')} chunk")
+        data = f.read(length)
+        (crc,) = struct.unpack(">I", f.read(4))
+        if zlib.crc32(chunk_type + data) & 0xffffffff != crc:
+            raise ImageCheckError(f"CRC mismatch in {chunk_type.decode('latin-1')} chunk")
+        if first and chunk_type != b'IHDR':
+            raise ImageCheckError("first chunk is not IHDR")
+        first = False
+        if chunk_type == b'IEND':
+            return
+
+
+def check_jpeg(f, size):
+    """Start of image marker at the start, end of image marker at the end"""
+    if f.read(2) != b'\xff\xd8':
+        raise ImageCheckError("not a JPEG start marker")
+    f.seek(max(0, size - 2))
+    if f.read(2) != b'\xff\xd9':
+        raise ImageCheckError("truncated (no end marker)")
+
+
+def check_tiff(f, size):
+    """Byte order mark, magic number and a first IFD inside the file"""
+    header = f.read(8)
+    if header[:4] == b'II*\x00':
+        (ifd_offset,) = struct.unpack("<I", header[4:8])
+    elif header[:4] == b'MM\x00*':
+        (ifd_offset,) = struct.unpack(">I", header[4:8])
+    else:
+        raise ImageCheckError("not a TIFF header")
+    if not 8 <= ifd_offset < size:
+        raise ImageCheckError("first IFD outside the file")
+
+
+def read_exr_header(f):
+    """Read EXR header attributes into {name: (type, raw value)}"""
+    attributes = {}
+    while True:
+        name = b''
+        while True:
+            char = f.read(1)
+            if not char:
+                raise ImageCheckError("truncated header")
+            if char == b'\x00':
+                break
+            name += char
+        if not name:
+            return attributes
+        attribute_type = b''
+        while True:
+            char = f.read(1)
+            if not char:
+                raise ImageCheckError("truncated header")
+            if char == b'\x00':
+                break
+            attribute_type += char
+        (attribute_size,) = struct.unpack("<i", f.read(4))
+        value = f.read(attribute_size)
+        if len(value) < attribute_size:
+            raise ImageCheckError("truncated header")
+        attributes[name.decode('latin-1')] = (attribute_type.decode('latin-1'), value)
+
+
+def check_exr(f, size):
+    """Header attributes, then the scanline offset table and the last chunk against the file size"""
+    magic, version = struct.unpack("<ii", f.read(8))
+    if magic != EXR_MAGIC:
+        raise ImageCheckError("not an OpenEXR file")
+    attributes = read_exr_header(f)
+    for required in ("channels", "compression", "dataWindow", "displayWindow"):
+        if required not in attributes:
+            raise ImageCheckError(f"header has no {required} attribute")
+
+    # Tiled and multi-part files: the header is all we check
+    if version & 0x200 or version & 0x1000:
+        return
+
+    compression = attributes["compression"][1][0]
+    x_min, y_min, x_max, y_max = struct.unpack("<iiii", attributes["dataWindow"][1])
+    lines_per_chunk = EXR_LINES_PER_CHUNK[compression] if compression < len(EXR_LINES_PER_CHUNK) else 1
+    chunk_count = math.ceil((y_max - y_min + 1) / lines_per_chunk)
+    table = f.read(8 * chunk_count)
+    if len(table) < 8 * chunk_count:
+        raise ImageCheckError("truncated offset table")
+    offsets = struct.unpack(f"<{chunk_count}Q", table)
+    if any(offset == 0 or offset >= size for offset in offsets):
+        raise ImageCheckError("truncated (chunk offsets outside the file)")
+    f.seek(max(offsets))
+    chunk_header = f.read(8)
+    if len(chunk_header) < 8:
+        raise ImageCheckError("truncated last chunk")
+    _, data_size = struct.unpack("<ii", chunk_header)
+    if max(offsets) + 8 + data_size > size:
+        raise ImageCheckError("truncated last chunk")
+
+
+IMAGE_CHECKS = {
+    '.png': check_png,
+    '.jpg': check_jpeg,
+    '.jpeg': check_jpeg,
+    '.tif': check_tiff,
+    '.tiff': check_tiff,
+    '.exr': check_exr,
+}
+
+
+def check_image(path):
+    """Validate one image, returns (path, status, message) with status ok/empty/broken/unreadable"""
+    try:
+        size = os.path.getsize(path)
+        if size == 0:
+            return path, "empty", "zero-byte file"
+        check = IMAGE_CHECKS.get(os.path.splitext(path)[1].lower())
+        if check:
+            with open(path, 'rb') as f:
+                check(f, size)
+        return path, "ok", ""
+    except ImageCheckError as e:
+        return path, "broken", str(e)
+    except (OSError, struct.error) as e:
+        return path, "unreadable", str(e)
+
+
+def check_images(paths, jobs=None):
+    """Validate many images in a thread pool (file reads and CRCs release the GIL)"""
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as executor:
+        return list(executor.map(check_image, paths))
+
+
+# ---------------------------------------------------------------------------
+# Completeness
+# ---------------------------------------------------------------------------
+
+def parse_frame_spec(frame_spec):
+    """Parse "1-5,10,20-30" into a sorted list of unique frames"""
+    frames = set()
+    for entry in frame_spec.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        match = re.fullmatch(r'(-?\d+)\s*-\s*(-?\d+)', entry)
+        if match:
+            start, end = int(match.group(1)), int(match.group(2))
+            frames.update(range(min(start, end), max(start, end) + 1))
+        else:
+            frames.add(int(entry))
+    return sorted(frames)
+
+
+def format_frame_spec(frames):
+    """Compress frames into a frame spec with ranges: [1,2,3,7] -> "1-3,7" """
+    parts = []
+    frames = sorted(set(frames))
+    index = 0
+    while index < len(frames):
+        end_index = index
+        while end_index + 1 < len(frames) and frames[end_index + 1] == frames[end_index] + 1:
+            end_index += 1
+        if end_index - index >= 2:
+            parts.append(f"{frames[index]}-{frames[end_index]}")
+        else:
+            parts.extend(str(frame) for frame in frames[index:end_index + 1])
+        index = end_index + 1
+    return ','.join(parts)
+
+
+def scan_output_folder(folder, channels):
+    """
+    Find (frame, channel, path) for every image in a folder tree without knowing the pattern
+    The frame is the last frame-like number in the name, the channel a known channel name
+    in the filename or a parent folder (per-channel subfolders), otherwise the first channel
+    """
+    entries = []
+    channel_pattern = re.compile(
+        r'(?:^|[_.\-\s])(' + '|'.join(re.escape(channel) for channel in sorted(channels, key=len, reverse=True)) + r')(?:$|[_.\-\s])'
+    )
+    for root, folders, files in os.walk(folder):
+        # Hidden folders (tile jobs) and change reports hold the add-on's own images, not renders
+        folders[:] = [name for name in folders if not name.startswith('.') and name != CHANGE_REPORT_FOLDER]
+        folder_parts = os.path.relpath(root, folder).split(os.sep)
+        for name in files:
+            base, extension = os.path.splitext(name)
+            if extension.lower() not in IMAGE_EXTENSIONS or name.startswith('.'):
+                continue
+            frames = FRAME_NUMBER_PATTERN.findall(base)
+            if not frames:
+                continue
+            match = channel_pattern.search(base)
+            channel = match.group(1) if match else next((part for part in folder_parts if part in channels), channels[0])
+            entries.append((int(frames[-1]), channel, os.path.join(root, name)))
+    return entries
+
+
+def check_output(entries, frames, channels, jobs=None):
+    """
+    Check (frame, channel, path) entries against the expected frames x channels
+    Returns a report with missing pairs, broken files and the frames that need re-rendering
+    """
+    expected = set(frames)
+    by_pair = {}
+    for frame, channel, path in entries:
+        if frame in expected and channel in channels:
+            by_pair.setdefault((frame, channel), []).append(path)
+
+    results = check_images([path for paths in by_pair.values() for path in paths], jobs)
+    status_by_path = {path: (status, message) for path, status, message in results}
+
+    missing = []
+    broken = []
+    for frame in frames:
+        for channel in channels:
+            paths = by_pair.get((frame, channel))
+            if not paths:
+                missing.append((frame, channel))
+                continue
+            # A pair is fine if at least one of its files is fine (older batches may have broken copies)
+            bad = [(path,) + status_by_path[path] for path in paths if status_by_path[path][0] != "ok"]
+            if len(bad) == len(paths):
+                broken.extend((frame, channel, path, status, message) for path, status, message in bad)
+
+    gap_frames = sorted({frame for frame, _ in missing} | {entry[0] for entry in broken})
+    return {
+        "checked_files": len(results),
+        "expected": len(frames) * len(channels),
+        "missing": missing,
+        "broken": broken,
+        "gap_frames": gap_frames,
+    }
+
+
+def merge_reports(reports):
+    """Combine check_output() reports (e.g. one per camera/view layer) into one report"""
+    return {
+        "checked_files": sum(report["checked_files"] for report in reports),
+        "expected": sum(report["expected"] for report in reports),
+        "missing": [pair for report in reports for pair in report["missing"]],
+        "broken": [entry for report in reports for entry in report["broken"]],
+        "gap_frames": sorted({frame for report in reports for frame in report["gap_frames"]}),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Check a render output folder for missing frames and broken images")
+    parser.add_argument("folder", help="Output folder (searched recursively)")
+    parser.add_argument("--frames", required=True, help='Frame spec, e.g. "1-250" or "1,5,10-20"')
+    parser.add_argument("--channels", default="Combined", help="Comma separated channel names (default: Combined)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of parallel checks")
+    parser.add_argument("-o", "--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_arguments(argv)
+    if not os.path.isdir(args.folder):
+        print(f"❌ Not a folder: {args.folder}", file=sys.stderr)
+        return 1
+    try:
+        frames = parse_frame_spec(args.frames)
+    except ValueError:
+        print(f"❌ Invalid frame spec: {args.frames}", file=sys.stderr)
+        return 1
+    channels = [channel.strip() for channel in args.channels.split(',') if channel.strip()]
+
+    report = check_output(scan_output_folder(args.folder, channels), frames, channels, args.jobs)
+
+    print(f"Checked {report['checked_files']} file(s), expected {report['expected']} output(s)", file=sys.stderr)
+    for frame, channel in report["missing"]:
+        print(f"❌ Missing: frame {frame} - {channel}", file=sys.stderr)
+    for frame, channel, path, status, message in report["broken"]:
+        print(f"❌ {status.capitalize()}: frame {frame} - {channel}: {path} ({message})", file=sys.stderr)
+    if report["gap_frames"]:
+        print(f"Frames to re-render: {format_frame_spec(report['gap_frames'])}", file=sys.stderr)
+    else:
+        print("✅ Complete", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["gap_frames"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
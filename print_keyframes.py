@@ -1,8 +1,39 @@
-import bpy
+"""
+Print keyframe numbers, or build a keyframe report for many .blend files
+
+Inside Blender (Text Editor or without arguments) this prints the keyframes of the
+current scene. With arguments it works as a command line tool:
+
+    python print_keyframes.py [--jobs N] [--output report.json] [--users] PATH [PATH ...]
+    blender -b --python print_keyframes.py -- PATH [PATH ...]
+
+PATH can be a .blend file or a directory (searched recursively). Each file is read
+by a `blender -b` worker that only loads the actions (and with --users the objects
+using them) through bpy.data.libraries.load instead of opening the full scene.
+Workers run in parallel and the results are written as one JSON report.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+try:
+    import bpy
+except ImportError:
+    # Running as a plain Python script (report supervisor only)
+    bpy = None
+
 
 def iter_slot_fcurves(action, slot):
     """Yield all FCurves in this action that belong to the given slot."""
-    if not action or not slot:
+    if not action:
         return
 
     # Layered actions path (5.0+)
@@ -13,6 +44,13 @@ def iter_slot_fcurves(action, slot):
                 if strip.type != 'KEYFRAME':
                     continue
 
+                # No slot: every channelbag on the strip
+                if not slot:
+                    for bag in strip.channelbags:
+                        for fc in bag.fcurves:
+                            yield fc
+                    continue
+
                 # Preferred lookup: get channelbag for this slot on this strip
                 cb = strip.channelbag(slot, ensure=False)
                 if cb:
@@ -30,13 +68,60 @@ def iter_slot_fcurves(action, slot):
         for fc in getattr(action, "fcurves", []):
             yield fc
 
-def unique_keyframe_frames(action, slot):
-    """Get unique keyframe frame numbers from an action for a given slot."""
-    frames = set()
+def keyframe_times(action, slot):
+    """Get unique (unrounded) keyframe times from an action for a given slot."""
+    times = set()
     for fc in iter_slot_fcurves(action, slot):
         for kp in fc.keyframe_points:
-            frames.add(round(kp.co.x))
-    return frames
+            times.add(kp.co.x)
+    return times
+
+def unique_keyframe_frames(action, slot):
+    """Get unique keyframe frame numbers from an action for a given slot."""
+    return {round(time) for time in keyframe_times(action, slot)}
+
+def remap_nla_strip_frames(strip, frames):
+    """Map action frames to scene frames through an NLA strip's offset, scale, repeat and reverse"""
+    action_start = strip.action_frame_start
+    action_end = strip.action_frame_end
+    scale = strip.scale if strip.scale > 0 else 1.0
+    cycle_length = (action_end - action_start) * scale
+
+    remapped = set()
+    for frame in frames:
+        if frame < action_start or frame > action_end:
+            continue
+        local_offset = (action_end - frame) if strip.use_reverse else (frame - action_start)
+        cycle = 0
+        while cycle < max(1, math.ceil(strip.repeat)):
+            strip_frame = strip.frame_start + cycle * cycle_length + local_offset * scale
+            if strip_frame > strip.frame_end + 1e-4:
+                break
+            remapped.add(round(strip_frame))
+            if cycle_length <= 0:
+                break
+            cycle += 1
+    return remapped
+
+def iter_action_strips(anim):
+    """Yield the unmuted action strips of an animation's NLA tracks, including meta strip children"""
+    def iter_strips(strips):
+        for strip in strips:
+            if strip.mute:
+                continue
+            if strip.type == 'META':
+                yield from iter_strips(strip.strips)
+            elif strip.action:
+                yield strip
+
+    for track in getattr(anim, "nla_tracks", []):
+        if not track.mute:
+            yield from iter_strips(track.strips)
+
+def nla_strip_keyframe_frames(strip, default_slot):
+    """Get the keyframes of an NLA strip's action in scene frames"""
+    strip_slot = getattr(strip, "action_slot", None) or default_slot
+    return remap_nla_strip_frames(strip, keyframe_times(strip.action, strip_slot))
 
 def print_keyframes():
     """Print all keyframe numbers in the current scene."""
@@ -55,20 +140,14 @@ def print_keyframes():
 
         # Get the slot for this object
         slot = getattr(anim, "action_slot", None)
-        
+
         # Collect keyframes using the Blender 5.0 API
         frames = unique_keyframe_frames(action, slot)
         all_keyframes.update(frames)
 
-        # Also check NLA strips
-        nla_tracks = getattr(anim, "nla_tracks", None)
-        if nla_tracks:
-            for track in nla_tracks:
-                for strip in getattr(track, "strips", []):
-                    strip_action = getattr(strip, "action", None)
-                    if strip_action:
-                        strip_frames = unique_keyframe_frames(strip_action, slot)
-                        all_keyframes.update(strip_frames)
+        # Also check NLA strips (action time mapped to scene time)
+        for strip in iter_action_strips(anim):
+            all_keyframes.update(nla_strip_keyframe_frames(strip, slot))
 
     # Scene-level animation data
     scene_anim = getattr(scene, "animation_data", None)
@@ -87,7 +166,217 @@ def print_keyframes():
     else:
         print("No keyframes found in the current scene.")
 
+
+# ---------------------------------------------------------------------------
+# Worker: runs inside `blender -b` for one .blend file
+# ---------------------------------------------------------------------------
+
+def slot_user_name(slot):
+    """Get the intended user name from a slot identifier ("OBCube" -> "Cube")"""
+    identifier = getattr(slot, "identifier", "")
+    return identifier[2:] if len(identifier) > 2 else identifier
+
+
+def report_blend_file(filepath, with_users=False):
+    """Read actions (and optionally their object users) from a .blend file without opening it"""
+    with bpy.data.libraries.load(filepath, link=True) as (data_from, data_to):
+        data_to.actions = list(data_from.actions)
+        if with_users:
+            data_to.objects = list(data_from.objects)
+
+    entries = []
+    all_keyframes = set()
+
+    if with_users:
+        # Object users: resolve each object's action, slot and NLA strips
+        for obj in data_to.objects:
+            anim = getattr(obj, "animation_data", None) if obj else None
+            if not anim:
+                continue
+            slot = getattr(anim, "action_slot", None)
+            if anim.action:
+                frames = unique_keyframe_frames(anim.action, slot)
+                entries.append({
+                    "object": obj.name,
+                    "action": anim.action.name,
+                    "slot": getattr(slot, "identifier", ""),
+                    "keyframes": sorted(frames),
+                })
+                all_keyframes.update(frames)
+            for strip in iter_action_strips(anim):
+                # Map action time to scene time through the strip offset, scale, repeat and reverse
+                frames = nla_strip_keyframe_frames(strip, slot)
+                entries.append({
+                    "object": obj.name,
+                    "action": strip.action.name,
+                    "slot": getattr(getattr(strip, "action_slot", None) or slot, "identifier", ""),
+                    "nla_strip": strip.name,
+                    "keyframes": sorted(frames),
+                })
+                all_keyframes.update(frames)
+    else:
+        # Actions only: the slot identifier names the object the slot was made for
+        for action in data_to.actions:
+            if not action:
+                continue
+            slots = list(getattr(action, "slots", []))
+            for slot in slots or [None]:
+                frames = unique_keyframe_frames(action, slot)
+                if not frames:
+                    continue
+                entries.append({
+                    "object": slot_user_name(slot) if slot else None,
+                    "action": action.name,
+                    "slot": getattr(slot, "identifier", ""),
+                    "keyframes": sorted(frames),
+                })
+                all_keyframes.update(frames)
+
+    return {
+        "file": filepath,
+        "entries": entries,
+        "keyframes": sorted(all_keyframes),
+    }
+
+
+def run_worker(filepath, output_path, with_users):
+    """Worker entry point: write the report for one file as JSON"""
+    try:
+        result = report_blend_file(filepath, with_users)
+    except Exception as e:
+        result = {"file": filepath, "error": str(e), "entries": [], "keyframes": []}
+    with open(output_path, 'w') as f:
+        json.dump(result, f)
+
+
+# ---------------------------------------------------------------------------
+# Supervisor: fans files out across blender workers
+# ---------------------------------------------------------------------------
+
+def find_blend_files(paths):
+    """Expand files and directories into a sorted list of .blend files"""
+    blend_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                blend_files.extend(os.path.join(root, name) for name in files if name.lower().endswith(".blend"))
+        elif path.lower().endswith(".blend") and os.path.isfile(path):
+            blend_files.append(path)
+        else:
+            print(f"⚠️  Skipped: {path} (not a .blend file or directory)", file=sys.stderr)
+    return sorted(set(os.path.abspath(path) for path in blend_files))
+
+
+def find_blender_executable(explicit=None):
+    """Find the Blender executable: argument, $BLENDER, running Blender, then PATH"""
+    if explicit:
+        return explicit
+    if os.environ.get("BLENDER"):
+        return os.environ["BLENDER"]
+    if bpy is not None and bpy.app.binary_path:
+        return bpy.app.binary_path
+    return shutil.which("blender")
+
+
+def report_with_worker(blender, filepath, with_users, timeout):
+    """Run one `blender -b` worker for a file and return its report"""
+    fd, output_path = tempfile.mkstemp(prefix="frh_keys_", suffix=".json")
+    os.close(fd)
+    command = [
+        blender, "-b", "--factory-startup", "--python", os.path.abspath(__file__),
+        "--", "--worker", filepath, "--worker-output", output_path,
+    ]
+    if with_users:
+        command.append("--users")
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        if os.path.getsize(output_path) == 0:
+            error = process.stderr.strip() or process.stdout.strip() or f"exit code {process.returncode}"
+            return {"file": filepath, "error": error[-500:], "entries": [], "keyframes": []}
+        with open(output_path, 'r') as f:
+            return json.load(f)
+    except subprocess.TimeoutExpired:
+        return {"file": filepath, "error": f"Timed out after {timeout}s", "entries": [], "keyframes": []}
+    finally:
+        os.remove(output_path)
+
+
+def build_report(blend_files, blender, jobs, with_users, timeout):
+    """Report keyframes for many files in parallel"""
+    start_time = datetime.now()
+    results = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(report_with_worker, blender, filepath, with_users, timeout): filepath
+            for filepath in blend_files
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["file"]] = result
+            status = f"❌ {result['error'][:80]}" if result.get("error") else f"✅ {len(result['keyframes'])} keyframes"
+            print(f"[{len(results)}/{len(blend_files)}] {os.path.basename(result['file'])}: {status}", file=sys.stderr)
+
+    return {
+        "generated": start_time.isoformat(timespec="seconds"),
+        "duration_seconds": round((datetime.now() - start_time).total_seconds(), 2),
+        "files": [results[filepath] for filepath in blend_files],
+    }
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Report keyframes of one or many .blend files as JSON")
+    parser.add_argument("paths", nargs="*", help=".blend files or directories")
+    parser.add_argument("-o", "--output", help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Number of parallel Blender workers")
+    parser.add_argument("--blender", help="Path to the Blender executable")
+    parser.add_argument("--users", action="store_true", help="Also load the objects using the actions (object names, NLA strips)")
+    parser.add_argument("--timeout", type=int, default=300, help="Timeout per file in seconds")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_arguments(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.worker_output, args.users)
+        return 0
+
+    blend_files = find_blend_files(args.paths)
+    if not blend_files:
+        print("No .blend files found", file=sys.stderr)
+        return 1
+
+    blender = find_blender_executable(args.blender)
+    if not blender:
+        print("❌ Blender not found. Use --blender or set $BLENDER", file=sys.stderr)
+        return 1
+
+    # Progress goes to stderr so the JSON report can be piped from stdout
+    print(f"🔑 Reporting keyframes for {len(blend_files)} file(s) with {args.jobs} worker(s)", file=sys.stderr)
+    report = build_report(blend_files, blender, max(1, args.jobs), args.users, args.timeout)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output} ({report['duration_seconds']}s)", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0 if not any(result.get("error") for result in report["files"]) else 1
+
+
+def get_cli_arguments():
+    """Arguments for the command line tool, None when run from Blender without any"""
+    if bpy is None:
+        return sys.argv[1:]
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return None
+
+
 if __name__ == "__main__":
+    cli_arguments = get_cli_arguments()
+    if cli_arguments or bpy is None:
+        sys.exit(main(cli_arguments or []))
     print_keyframes()
-
-print_keyframes()
@@ -0,0 +1,333 @@
+"""
+Render a queue of batches across scenes and .blend files in background Blender
+
+    python render_queue.py JOBFILE [--workers N] [--status status.json] [--blender PATH] [--addon MODULE]
+
+JOBFILE is JSON ({"jobs": [...]}) or TOML:
+
+    [[job]]
+    blend = "shots/sh010.blend"      # relative to the job file
+    scene = "Scene"                  # optional, the active scene by default
+    frames = "1-100"
+    pattern = "(FileName)_(Frame)"   # optional, the file's filename pattern by default
+    output = "//renders"             # optional, the file's output folder by default
+    priority = 10                    # optional, higher runs first
+
+Every job runs through the add-on's "Render Specific Frames" batch (channels, pre-flight
+check, catalog, ...) inside a `blender -b` worker, so the add-on has to be enabled in the
+user preferences (or named with --addon). Jobs are ordered by priority and jobs on the same
+.blend file run back to back in one process, which opens the file only once. With one worker
+a single Blender process works through the whole queue; with more workers the files are
+spread over a pool of processes. Progress (renders done of the running job) and failures
+are written to the status file (default: JOBFILE.status.json) after every change, and each
+worker's output to a log file.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+try:
+    import bpy
+except ImportError:
+    # Running as a plain Python script (queue supervisor only)
+    bpy = None
+
+# Worker output lines starting with these carry a job status update / batch progress as JSON
+STATUS_PREFIX = "FRH_QUEUE "
+PROGRESS_PREFIX = "FRH_PROGRESS "
+
+
+# ---------------------------------------------------------------------------
+# Job file
+# ---------------------------------------------------------------------------
+
+def load_jobs(job_path):
+    """Read and normalize the jobs of a JSON or TOML job file"""
+    with open(job_path, 'rb') as f:
+        data = f.read()
+    if job_path.lower().endswith(".toml"):
+        import tomllib
+        document = tomllib.loads(data.decode("utf-8"))
+    else:
+        document = json.loads(data)
+    entries = document if isinstance(document, list) else document.get("jobs", document.get("job", []))
+
+    base_folder = os.path.dirname(os.path.abspath(job_path))
+    jobs = []
+    for index, entry in enumerate(entries):
+        if not entry.get("blend") or not entry.get("frames"):
+            raise ValueError(f"Job {index + 1} needs 'blend' and 'frames'")
+        frames = entry["frames"]
+        if isinstance(frames, list):
+            frames = ",".join(str(frame) for frame in frames)
+        output = entry.get("output", "")
+        # Plain relative output folders are relative to the job file, "//" to the .blend file
+        if output and not output.startswith("//") and not os.path.isabs(output):
+            output = os.path.join(base_folder, output)
+        blend = os.path.normpath(os.path.join(base_folder, entry["blend"]))
+        jobs.append({
+            "index": index,
+            "name": entry.get("name") or f"{os.path.basename(blend)}:{entry.get('scene') or 'active scene'}",
+            "blend": blend,
+            "scene": entry.get("scene", ""),
+            "frames": str(frames),
+            "pattern": entry.get("pattern", ""),
+            "output": output,
+            "priority": int(entry.get("priority", 0)),
+        })
+    return jobs
+
+
+def group_jobs(jobs):
+    """Order jobs by priority and group consecutive jobs on the same .blend file"""
+    groups = []
+    for job in sorted(jobs, key=lambda job: (-job["priority"], job["index"])):
+        if groups and groups[-1][0]["blend"] == job["blend"]:
+            groups[-1].append(job)
+        else:
+            groups.append([job])
+    return groups
+
+
+# ---------------------------------------------------------------------------
+# Worker: runs inside `blender -b` and works through its jobs
+# ---------------------------------------------------------------------------
+
+def report_status(index, **fields):
+    print(STATUS_PREFIX + json.dumps(dict(fields, index=index)), flush=True)
+
+
+def parse_worker_line(line):
+    """
+    (prefix, fields) of a worker status or progress line, None for any other output
+    Lines that aren't valid JSON (cut off by a crash, mixed with other output) are None as well,
+    so readers echo them and keep draining the pipe
+    """
+    for prefix in (STATUS_PREFIX, PROGRESS_PREFIX):
+        if line.startswith(prefix):
+            try:
+                fields = json.loads(line[len(prefix):])
+            except ValueError:
+                return None
+            return (prefix, fields) if isinstance(fields, dict) else None
+    return None
+
+
+def ensure_addon(addon):
+    """Enable the render helper add-on if the user preferences didn't"""
+    if hasattr(bpy.types, "RENDER_OT_specific_frames"):
+        return
+    if addon:
+        import addon_utils
+        addon_utils.enable(addon, default_set=False)
+    if not hasattr(bpy.types, "RENDER_OT_specific_frames"):
+        raise RuntimeError("Furion Render Helper is not enabled (enable it in the preferences or pass --addon)")
+
+
+def run_job(job):
+    """Render one job with the add-on's batch operator in the open file"""
+    scene = bpy.data.scenes.get(job["scene"]) if job["scene"] else bpy.context.scene
+    if scene is None:
+        raise RuntimeError(f"Scene not found: {job['scene']}")
+    with bpy.context.temp_override(scene=scene):
+        result = bpy.ops.render.specific_frames(
+            override_frames=job["frames"],
+            override_output_folder=job["output"],
+            override_pattern=job["pattern"],
+        )
+    if 'FINISHED' not in result:
+        raise RuntimeError("Batch did not finish (see the worker log)")
+
+
+def run_worker(job_path, indices, addon):
+    """Worker entry point: open each .blend file once and render its jobs"""
+    jobs = {job["index"]: job for job in load_jobs(job_path)}
+    ensure_addon(addon)
+    for index in indices:
+        job = jobs[index]
+        report_status(index, state="running", started=datetime.now().isoformat(timespec="seconds"))
+        try:
+            if os.path.normcase(os.path.abspath(bpy.data.filepath)) != os.path.normcase(job["blend"]):
+                bpy.ops.wm.open_mainfile(filepath=job["blend"])
+            run_job(job)
+            report_status(index, state="done", finished=datetime.now().isoformat(timespec="seconds"))
+        except Exception as e:
+            report_status(index, state="failed", finished=datetime.now().isoformat(timespec="seconds"), error=str(e))
+
+
+# ---------------------------------------------------------------------------
+# Supervisor: starts the workers and keeps the status file
+# ---------------------------------------------------------------------------
+
+class QueueStatus:
+    """Status of every job, written to a JSON file on each change (one writer: the supervisor)"""
+
+    def __init__(self, path, job_path, jobs):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = {
+            "job_file": os.path.abspath(job_path),
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "updated": None,
+            "jobs": [
+                {key: job[key] for key in ("index", "name", "blend", "scene", "frames", "priority")}
+                | {"state": "queued", "worker": None, "progress": None, "started": None, "finished": None, "error": None}
+                for job in jobs
+            ],
+        }
+        self.write()
+
+    def update(self, index, **fields):
+        with self._lock:
+            self.data["jobs"][index].update(fields)
+            self.write()
+
+    def write(self):
+        self.data["updated"] = datetime.now().isoformat(timespec="seconds")
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(temporary_path, self.path)
+
+    def state(self, index):
+        return self.data["jobs"][index]["state"]
+
+
+def find_blender_executable(explicit=None):
+    """Find the Blender executable: argument, $BLENDER, then PATH"""
+    return explicit or os.environ.get("BLENDER") or shutil.which("blender")
+
+
+def get_worker_command(blender, blend, job_path, indices, addon=None):
+    """Command line of a `blender -b` worker rendering the given jobs of a job file"""
+    command = [
+        blender, "-b", blend, "--python", os.path.abspath(__file__),
+        "--", "--worker", "--worker-jobs", ",".join(str(index) for index in indices), job_path,
+    ]
+    if addon:
+        command += ["--addon", addon]
+    return command
+
+
+def run_worker_process(blender, job_path, worker, groups, addon, status, log_path):
+    """Run one `blender -b` worker on its groups of jobs and follow its status output"""
+    indices = [job["index"] for group in groups for job in group]
+    command = get_worker_command(blender, groups[0][0]["blend"], job_path, indices, addon)
+    for index in indices:
+        status.update(index, worker=worker)
+
+    running_index = None
+    with open(log_path, 'w') as log:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace")
+        for line in process.stdout:
+            log.write(line)
+            parsed = parse_worker_line(line)
+            if parsed is None:
+                if line.startswith((STATUS_PREFIX, PROGRESS_PREFIX)):
+                    print(f"[worker {worker}] ⚠️ Unreadable status line: {line.rstrip()}", file=sys.stderr)
+                continue
+            prefix, fields = parsed
+            if prefix == STATUS_PREFIX and fields.get("index") in indices:
+                running_index = fields.pop("index")
+                status.update(running_index, **fields)
+                job = status.data["jobs"][running_index]
+                print(f"[worker {worker}] {job['name']}: {fields.get('state')}" + (f" ({fields['error']})" if fields.get("error") else ""), file=sys.stderr)
+            elif prefix == PROGRESS_PREFIX and running_index is not None:
+                status.update(running_index, progress=f"{fields.get('render')}/{fields.get('total')}")
+        process.wait()
+
+    # Jobs the worker never finished (crash, or Blender quit early)
+    for index in indices:
+        if status.state(index) in ("queued", "running"):
+            status.update(index, state="failed", error=f"Worker exited with code {process.returncode}, see {log_path}")
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Render a queue of batches from a JSON or TOML job file")
+    parser.add_argument("job_file", help="Job file (.json or .toml)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of Blender processes (default: 1)")
+    parser.add_argument("--status", help="Status file (default: JOBFILE.status.json)")
+    parser.add_argument("--blender", help="Path to the Blender executable")
+    parser.add_argument("--addon", help="Module name of the add-on, if it isn't enabled in the user preferences")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-jobs", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_arguments(argv)
+
+    if args.worker:
+        run_worker(args.job_file, [int(index) for index in args.worker_jobs.split(",")], args.addon)
+        return 0
+
+    try:
+        jobs = load_jobs(args.job_file)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read job file: {e}", file=sys.stderr)
+        return 1
+    if not jobs:
+        print("No jobs in the job file", file=sys.stderr)
+        return 1
+
+    blender = find_blender_executable(args.blender)
+    if not blender:
+        print("❌ Blender not found. Use --blender or set $BLENDER", file=sys.stderr)
+        return 1
+
+    status_path = args.status or os.path.splitext(args.job_file)[0] + ".status.json"
+    status = QueueStatus(status_path, args.job_file, jobs)
+
+    # Groups go round robin to the workers, so the highest priorities start first
+    groups = group_jobs(jobs)
+    worker_count = max(1, min(args.workers, len(groups)))
+    worker_groups = [groups[worker::worker_count] for worker in range(worker_count)]
+
+    print(f"🗂️  {len(jobs)} job(s) on {len(groups)} file group(s) with {worker_count} worker(s), status: {status_path}", file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        futures = {}
+        for worker, assigned in enumerate(worker_groups):
+            log_path = os.path.splitext(status_path)[0] + f".worker{worker}.log"
+            future = executor.submit(run_worker_process, blender, os.path.abspath(args.job_file), worker, assigned, args.addon, status, log_path)
+            futures[future] = (worker, assigned)
+
+    # A worker that couldn't start or follow its process (wrong --blender path, status file not
+    # writable, ...) fails its unfinished jobs with the exception instead of leaving them queued
+    for future, (worker, assigned) in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            print(f"❌ Worker {worker}: {e}", file=sys.stderr)
+            for job in (job for group in assigned for job in group):
+                if status.state(job["index"]) in ("queued", "running"):
+                    try:
+                        status.update(job["index"], state="failed", worker=worker, error=f"Worker {worker} failed: {e}")
+                    except OSError:
+                        # Keep the state in memory for the summary when the status file can't be written
+                        status.data["jobs"][job["index"]].update(state="failed", error=f"Worker {worker} failed: {e}")
+
+    failed = [job for job in status.data["jobs"] if job["state"] != "done"]
+    for job in failed:
+        print(f"❌ {job['name']}: {job['error']}", file=sys.stderr)
+    print(f"✅ {len(jobs) - len(failed)}/{len(jobs)} job(s) done", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def get_cli_arguments():
+    """Arguments after "--" inside Blender, all arguments as a plain script"""
+    if bpy is None:
+        return sys.argv[1:]
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return []
+
+
+if __name__ == "__main__":
+    sys.exit(main(get_cli_arguments()))
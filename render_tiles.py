@@ -0,0 +1,382 @@
+"""
+Render one large frame as border tiles in parallel Blender workers and stitch them
+
+Used by the "Render Tiled Frame" operator, and on farm nodes that share the output folder:
+
+    blender -b JOB_FOLDER/scene.blend --python render_tiles.py -- --job JOB_FOLDER/job.json
+    python render_tiles.py --job JOB_FOLDER/job.json     (print the job status)
+
+A job folder holds a copy of the .blend file, job.json (frame, resolution, tiles and
+passes) and the rendered tiles. Workers claim tiles with lock files, so any number of
+workers on any number of machines can work on the same job. Each tile is rendered with
+a cropped render border and every pass is written as a float EXR through a File Output
+node. Once all tiles are done the operator stitches each pass with NumPy. The compositor
+runs per tile, so the operator refuses compositor setups with nodes that read neighbouring
+pixels (blur, glare, ...) and EEVEE/Workbench screen-space effects, which would leave seams
+at the tile borders. Cycles render denoising is turned off in the workers for the same reason.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+
+try:
+    import bpy
+except ImportError:
+    # Running as a plain Python script (job status only)
+    bpy = None
+
+JOB_FILENAME = "job.json"
+JOB_BLEND_FILENAME = "scene.blend"
+TILE_PREFIX = "tile_"
+
+# Composite output instead of a Render Layers socket (what a normal render saves as Combined)
+COMBINED_SOCKET = "Combined"
+
+# Compositor nodes whose pixels depend on neighbouring pixels, the whole image or the pixel
+# position: composited tile by tile they leave seams at the tile borders
+NON_POINTWISE_NODE_TYPES = {
+    "CompositorNodeBlur", "CompositorNodeBokehBlur", "CompositorNodeDBlur", "CompositorNodeBilateralblur",
+    "CompositorNodeDefocus", "CompositorNodeVecBlur", "CompositorNodeGlare", "CompositorNodeSunBeams",
+    "CompositorNodeFilter", "CompositorNodeDilateErode", "CompositorNodeDespeckle", "CompositorNodeDenoise",
+    "CompositorNodeKuwahara", "CompositorNodePixelate", "CompositorNodeInpaint", "CompositorNodeAntiAliasing",
+    "CompositorNodeLensdist", "CompositorNodeMovieDistortion", "CompositorNodeStabilize", "CompositorNodeDisplace",
+    "CompositorNodeMapUV", "CompositorNodeTransform", "CompositorNodeTranslate", "CompositorNodeRotate",
+    "CompositorNodeScale", "CompositorNodeFlip", "CompositorNodeCrop", "CompositorNodeCornerPin",
+    "CompositorNodePlaneTrackDeform", "CompositorNodeKeying", "CompositorNodeDoubleEdgeMask",
+    "CompositorNodeNormalize", "CompositorNodeLevels", "CompositorNodeTonemap", "CompositorNodeBoxMask",
+    "CompositorNodeEllipseMask", "CompositorNodeSplit", "CompositorNodeTexture", "CompositorNodeImage",
+    "CompositorNodeMovieClip", "CompositorNodeMask",
+}
+
+# Render engines with screen-space effects (reflections, ambient occlusion, bloom, ...)
+SCREEN_SPACE_ENGINES = {"BLENDER_EEVEE", "BLENDER_EEVEE_NEXT"}
+
+
+# ---------------------------------------------------------------------------
+# Job
+# ---------------------------------------------------------------------------
+
+def plan_tiles(width, height, tiles_x, tiles_y):
+    """Split width x height pixels into tiles, pixel rows counted from the bottom like Blender's border"""
+    tiles = []
+    for row in range(tiles_y):
+        for column in range(tiles_x):
+            x0, x1 = width * column // tiles_x, width * (column + 1) // tiles_x
+            y0, y1 = height * row // tiles_y, height * (row + 1) // tiles_y
+            if x1 > x0 and y1 > y0:
+                tiles.append({"index": len(tiles), "x0": x0, "x1": x1, "y0": y0, "y1": y1})
+    return tiles
+
+
+def create_job(job_folder, frame, width, height, tiles, passes, view_layer):
+    """Write job.json, passes is {channel: Render Layers socket}"""
+    job = {
+        "blend": JOB_BLEND_FILENAME,
+        "frame": frame,
+        "width": width,
+        "height": height,
+        "tiles": tiles,
+        "passes": passes,
+        "view_layer": view_layer,
+    }
+    with open(os.path.join(job_folder, JOB_FILENAME), 'w') as f:
+        json.dump(job, f, indent=2)
+    return job
+
+
+def load_job(job_path):
+    with open(job_path, 'r') as f:
+        return json.load(f)
+
+
+def get_tile_name(index):
+    return f"{TILE_PREFIX}{index:03d}"
+
+
+def get_claim_owner(pid):
+    """Text a worker process writes into its claim files"""
+    return f"{socket.gethostname()} {pid}"
+
+
+def claim_tile(job_folder, index):
+    """Create the tile's lock file, False when another worker already has it"""
+    try:
+        fd = os.open(os.path.join(job_folder, get_tile_name(index) + ".claim"), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, 'w') as f:
+        f.write(get_claim_owner(os.getpid()))
+    return True
+
+
+def release_claims(job_folder, job, owners):
+    """
+    Remove the claims of unfinished tiles held by the given owners (see get_claim_owner), so
+    workers joining the job later render those tiles. Returns the number of released tiles.
+    """
+    released = 0
+    for tile in job["tiles"]:
+        if is_tile_done(job_folder, tile["index"]):
+            continue
+        claim_path = os.path.join(job_folder, get_tile_name(tile["index"]) + ".claim")
+        try:
+            with open(claim_path, 'r') as f:
+                owner = f.read().strip()
+            if owner in owners:
+                os.remove(claim_path)
+                released += 1
+        except OSError:
+            continue
+    return released
+
+
+def is_tile_done(job_folder, index):
+    return os.path.exists(os.path.join(job_folder, get_tile_name(index) + ".done"))
+
+
+def get_job_status(job_folder, job):
+    """Tile indices that are done, claimed (rendering or failed) and still open"""
+    done, claimed, open_tiles = [], [], []
+    for tile in job["tiles"]:
+        index = tile["index"]
+        if is_tile_done(job_folder, index):
+            done.append(index)
+        elif os.path.exists(os.path.join(job_folder, get_tile_name(index) + ".claim")):
+            claimed.append(index)
+        else:
+            open_tiles.append(index)
+    return done, claimed, open_tiles
+
+
+def find_tile_output(job_folder, index, channel):
+    """EXR the File Output node wrote for a tile pass (the node appends the frame number)"""
+    prefix = f"{get_tile_name(index)}_{channel}_"
+    for name in sorted(os.listdir(job_folder)):
+        if name.startswith(prefix) and name.lower().endswith(".exr"):
+            return os.path.join(job_folder, name)
+    return None
+
+
+def launch_workers(blender, job_folder, count, threads=0):
+    """Start local `blender -b` workers on a job, returns the processes"""
+    command = [blender, "-b", os.path.join(job_folder, JOB_BLEND_FILENAME)]
+    if threads:
+        command += ["-t", str(threads)]
+    command += ["--python", os.path.abspath(__file__), "--", "--job", os.path.join(job_folder, JOB_FILENAME)]
+    return [
+        subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(count)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Worker: runs inside `blender -b` on the job's .blend copy
+# ---------------------------------------------------------------------------
+
+def find_screen_space_effects(scene):
+    """Render engine effects that read pixels outside a tile and would leave seams between tiles"""
+    effects = []
+    engine = scene.render.engine
+    if engine in SCREEN_SPACE_ENGINES:
+        effects.append("EEVEE screen-space effects")
+    elif engine == 'BLENDER_WORKBENCH':
+        shading = scene.display.shading
+        if shading.show_cavity and shading.cavity_type in {'SCREEN', 'BOTH'}:
+            effects.append("Workbench screen-space cavity")
+        if shading.show_object_outline:
+            effects.append("Workbench outline")
+    return effects
+
+
+def uses_render_denoising(scene):
+    """True when Cycles denoises the render (per tile, with seams at the tile borders)"""
+    return scene.render.engine == 'CYCLES' and bool(getattr(getattr(scene, "cycles", None), "use_denoising", False))
+
+
+def uses_compositor(scene):
+    """True if a normal render of the scene saves the Composite output as Combined"""
+    return bool(scene.use_nodes and scene.render.use_compositing and scene.node_tree)
+
+
+def find_composite_input(tree):
+    """Socket linked to the Composite node's image input, None without one"""
+    for node in tree.nodes:
+        if node.type == 'COMPOSITE' and node.inputs["Image"].links:
+            return node.inputs["Image"].links[0].from_socket
+    return None
+
+
+def iter_upstream_nodes(node, visited):
+    """Yield a node and every node feeding it, including the nodes inside node groups"""
+    if node in visited:
+        return
+    visited.add(node)
+    yield node
+    if node.type == 'GROUP' and node.node_tree:
+        for group_node in node.node_tree.nodes:
+            yield from iter_upstream_nodes(group_node, visited)
+    for node_input in node.inputs:
+        for link in node_input.links:
+            if not link.is_muted:
+                yield from iter_upstream_nodes(link.from_node, visited)
+
+
+def find_non_pointwise_nodes(scene):
+    """Names of the compositor nodes feeding Combined that would leave seams between tiles"""
+    if not uses_compositor(scene):
+        return []
+    source = find_composite_input(scene.node_tree)
+    if source is None:
+        return []
+    return sorted(
+        node.name for node in iter_upstream_nodes(source.node, set())
+        if not node.mute and node.bl_idname in NON_POINTWISE_NODE_TYPES
+    )
+
+
+def setup_tile_outputs(scene, job):
+    """File Output node writing every pass of the job as float EXR, returns the node"""
+    use_composite = uses_compositor(scene)
+    # Render denoising only sees the cropped tile and leaves seams, tiles are rendered without it
+    if uses_render_denoising(scene):
+        scene.cycles.use_denoising = False
+    scene.use_nodes = True
+    scene.render.use_compositing = True
+    tree = scene.node_tree
+
+    render_layers = tree.nodes.new('CompositorNodeRLayers')
+    if job.get("view_layer") in scene.view_layers:
+        render_layers.layer = job["view_layer"]
+
+    # Combined is what the Composite node gets, as in a normal render (the raw render when
+    # the scene doesn't use the compositor)
+    composite_source = (find_composite_input(tree) if use_composite else None) or render_layers.outputs["Image"]
+
+    file_output = tree.nodes.new('CompositorNodeOutputFile')
+    file_output.format.file_format = 'OPEN_EXR'
+    file_output.format.color_depth = '32'
+    file_output.format.color_mode = 'RGBA'
+    file_output.file_slots.clear()
+    for channel, socket_name in job["passes"].items():
+        source = composite_source if socket_name == COMBINED_SOCKET else render_layers.outputs.get(socket_name)
+        if source is None:
+            print(f"⚠️  Pass {socket_name} not available, writing Combined for {channel}")
+            source = composite_source
+        file_output.file_slots.new(channel)
+        tree.links.new(source, file_output.inputs[-1])
+    return file_output
+
+
+def render_tile(scene, job_folder, job, tile, file_output):
+    """Render one tile with a cropped border and mark it done"""
+    width, height = job["width"], job["height"]
+    render = scene.render
+    render.use_border = True
+    render.use_crop_to_border = True
+    # A quarter pixel inside the tile: Blender rounds or truncates the border to whole pixels
+    render.border_min_x = (tile["x0"] + 0.25) / width
+    render.border_max_x = (tile["x1"] + 0.25) / width
+    render.border_min_y = (tile["y0"] + 0.25) / height
+    render.border_max_y = (tile["y1"] + 0.25) / height
+
+    tile_name = get_tile_name(tile["index"])
+    file_output.base_path = job_folder
+    for slot, channel in zip(file_output.file_slots, job["passes"]):
+        slot.path = f"{tile_name}_{channel}_"
+    bpy.ops.render.render(write_still=False)
+
+    with open(os.path.join(job_folder, tile_name + ".done"), 'w') as f:
+        f.write(socket.gethostname())
+
+
+def run_worker(job_path):
+    """Worker entry point: render open tiles until none are left"""
+    job_folder = os.path.dirname(os.path.abspath(job_path))
+    job = load_job(job_path)
+    scene = bpy.context.scene
+    scene.frame_set(job["frame"])
+    file_output = setup_tile_outputs(scene, job)
+
+    rendered = 0
+    for tile in job["tiles"]:
+        if is_tile_done(job_folder, tile["index"]) or not claim_tile(job_folder, tile["index"]):
+            continue
+        print(f"🧩 Rendering tile {tile['index'] + 1}/{len(job['tiles'])}")
+        render_tile(scene, job_folder, job, tile, file_output)
+        rendered += 1
+    print(f"✅ Worker done, rendered {rendered} tile(s)")
+
+
+# ---------------------------------------------------------------------------
+# Stitching: runs in the Blender session that started the job
+# ---------------------------------------------------------------------------
+
+def stitch_pass(job_folder, job, channel):
+    """Place every tile of a pass into one float RGBA array (rows from the bottom)"""
+    import numpy as np
+
+    width, height = job["width"], job["height"]
+    canvas = np.zeros((height, width, 4), dtype=np.float32)
+    for tile in job["tiles"]:
+        path = find_tile_output(job_folder, tile["index"], channel)
+        if not path:
+            raise FileNotFoundError(f"Tile {tile['index']} has no {channel} output")
+        image = bpy.data.images.load(path, check_existing=False)
+        try:
+            tile_width, tile_height = image.size
+            pixels = np.empty(tile_width * tile_height * image.channels, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            channels = image.channels
+        finally:
+            bpy.data.images.remove(image)
+        pixels = pixels.reshape(tile_height, tile_width, channels)
+        # Clip to the canvas in case the border was rounded to a larger tile
+        x0, y0 = tile["x0"], tile["y0"]
+        tile_height, tile_width = min(tile_height, height - y0), min(tile_width, width - x0)
+        canvas[y0:y0 + tile_height, x0:x0 + tile_width, :channels] = pixels[:tile_height, :tile_width, :4]
+        if channels < 4:
+            canvas[y0:y0 + tile_height, x0:x0 + tile_width, 3] = 1.0
+    return canvas
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Render or inspect a tiled frame job")
+    parser.add_argument("--job", required=True, help="Path to the job's job.json")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_arguments(argv)
+    if bpy is not None and bpy.app.background:
+        run_worker(args.job)
+        return 0
+
+    job = load_job(args.job)
+    done, claimed, open_tiles = get_job_status(os.path.dirname(os.path.abspath(args.job)), job)
+    print(f"Frame {job['frame']} ({job['width']}x{job['height']}): {len(done)}/{len(job['tiles'])} tiles done")
+    if claimed:
+        print(f"Rendering or failed: {claimed}")
+    if open_tiles:
+        print(f"Open: {open_tiles}")
+    return 0 if len(done) == len(job["tiles"]) else 1
+
+
+def get_cli_arguments():
+    """Arguments after "--" inside Blender, all arguments as a plain script"""
+    if bpy is None:
+        return sys.argv[1:]
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return []
+
+
+if __name__ == "__main__":
+    sys.exit(main(get_cli_arguments()))